@@ -1,6 +1,6 @@
 from django.contrib import admin
-from .models import Department, Employee, PerformanceReview, AttendanceRecord, Document, EmployeeReport, Leave, TransactionCategory, Transaction
+from .models import Department, Employee, PerformanceReview, AttendanceRecord, Document, EmployeeReport, Leave, TransactionCategory, Transaction, FinanceMonthlyRollup
 
 
-for model in (Department, Employee, AttendanceRecord, PerformanceReview, Document, EmployeeReport, Leave, TransactionCategory, Transaction):
+for model in (Department, Employee, AttendanceRecord, PerformanceReview, Document, EmployeeReport, Leave, TransactionCategory, Transaction, FinanceMonthlyRollup):
     admin.site.register(model)
@@ -0,0 +1,165 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .conditional import bump_table_version
+from .models import AttendanceRecord, Employee
+
+MAX_PUNCH_BATCH = 5000
+MAX_ANALYTICS_DAYS = 366
+
+# Skupiny analytiky docházky: klíč -> (sloupce, pojmenované výrazy) pro GROUP BY
+ANALYTICS_GROUPS = {
+    'employee': (('employee_id',), {'first_name': F('employee__first_name'), 'last_name': F('employee__last_name')}),
+    'department': ((), {'department_id': F('employee__department_id'), 'department_name': F('employee__department__name')}),
+    'week': ((), {'week': TruncWeek('date')}),
+    'month': ((), {'month': TruncMonth('date')}),
+}
+
+
+def _result(index, status, record_id=None, error=None):
+    result = {'index': index, 'status': status}
+    if record_id is not None:
+        result['record_id'] = record_id
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+def ingest_punches(events, serializer):
+    """
+    Replays a batch of offline punches (employee_id, timestamp, direction).
+
+    Events are validated one by one so that a bad event does not reject the
+    whole batch. Then employees and existing records of the affected
+    (employee, date) pairs are each loaded with one query, and the changes
+    are written with bulk_create/bulk_update in one transaction. The result
+    list has the same order as `events`. Possible statuses are created,
+    updated, duplicate and error.
+    """
+    results = [None] * len(events)
+    valid = []
+    for index, event in enumerate(events):
+        try:
+            valid.append((index, serializer.run_validation(event)))
+        except ValidationError as exc:
+            results[index] = _result(index, 'error', error=exc.detail)
+
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                return _apply_punches(valid, results)
+        except IntegrityError:
+            # Souběžný check-in mezitím vytvořil záznam pro stejný den; načíst znovu a zopakovat.
+            if attempt == 2:
+                raise
+
+
+def _apply_punches(valid, results):
+    employee_ids = {event['employee_id'] for _, event in valid}
+    known_employees = set(Employee.objects.filter(pk__in=employee_ids).values_list('pk', flat=True))
+
+    dates = {timezone.localdate(event['timestamp']) for _, event in valid}
+    records = {
+        (record.employee_id, record.date): record
+        for record in AttendanceRecord.objects.filter(employee_id__in=known_employees, date__in=dates)
+    }
+    stored_check_out = {key: record.check_out_time for key, record in records.items()}
+
+    # Výsledky se dopočítají až po zápisu, kdy už mají nové záznamy id.
+    outcomes = {}
+    created, updated = {}, {}
+    # Příchody před odchody ve stejném čase, jinak chronologicky
+    for index, event in sorted(valid, key=lambda item: (item[1]['timestamp'], item[1]['direction'] != 'in')):
+        employee_id, timestamp = event['employee_id'], event['timestamp']
+        if employee_id not in known_employees:
+            outcomes[index] = ('error', None, 'Zaměstnanec neexistuje.')
+            continue
+
+        key = (employee_id, timezone.localdate(timestamp))
+        record = records.get(key)
+
+        if event['direction'] == 'in':
+            if record is None:
+                record = records[key] = created[key] = AttendanceRecord(employee_id=employee_id, check_in_time=timestamp, date=key[1])
+                outcomes[index] = ('created', record, None)
+            elif record.check_in_time == timestamp:
+                outcomes[index] = ('duplicate', record, None)
+            else:
+                outcomes[index] = ('error', record, 'Check-in už byl tento den proveden.')
+        elif record is None:
+            outcomes[index] = ('error', None, 'Žádný příchod k odhlášení.')
+        elif record.check_out_time is not None:
+            if record.check_out_time == timestamp:
+                outcomes[index] = ('duplicate', record, None)
+            else:
+                outcomes[index] = ('error', record, 'Odchod už byl zaznamenán.')
+        elif timestamp < record.check_in_time:
+            outcomes[index] = ('error', record, 'Odchod nemůže být před příchodem.')
+        else:
+            record.check_out_time = timestamp
+            if key not in created:
+                updated[key] = record
+            outcomes[index] = ('updated', record, None)
+
+    # Zapisují se jen záznamy, jejichž odchod se proti DB opravdu změnil
+    changed = [record for key, record in updated.items() if record.check_out_time != stored_check_out[key]]
+    AttendanceRecord.objects.bulk_create(created.values(), batch_size=500)
+    if changed:
+        AttendanceRecord.objects.bulk_update(changed, ['check_out_time'], batch_size=500)
+    # bulk_create/bulk_update neposílají signály - verze tabulky (ETag, cache odpovědí) ručně
+    if created or changed:
+        bump_table_version(AttendanceRecord)
+
+    results = list(results)
+    for index, (status, record, error) in outcomes.items():
+        results[index] = _result(index, status, record.pk if record is not None else None, error)
+    return results
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else 0.0
+
+
+def attendance_analytics(queryset, group_by, workday_hours, late_after):
+    """
+    Worked hours per employee, department, week or month in one grouped
+    query: records, closed records, total and average hours, overtime over
+    `workday_hours` per record and arrivals after `late_after` (local time).
+    Open records (no check-out) count towards records and late arrivals only.
+    """
+    worked = ExpressionWrapper(F('check_out_time') - F('check_in_time'), output_field=DurationField())
+    workday = timedelta(hours=workday_hours)
+    closed = Q(check_out_time__isnull=False)
+    late = Q(check_in_time__time__gt=late_after)
+    fields, expressions = ANALYTICS_GROUPS[group_by]
+
+    rows = (
+        queryset.select_related(None).prefetch_related(None).order_by()
+        .values(*fields, **expressions)
+        .annotate(
+            records=Count('pk'),
+            closed_records=Count('pk', filter=closed),
+            total=Sum(worked, filter=closed),
+            overtime=Sum(
+                Case(When(closed, then=worked - Value(workday)), output_field=DurationField()),
+                filter=Q(closed, check_out_time__gt=F('check_in_time') + Value(workday)),
+            ),
+            late_arrivals=Count('pk', filter=late),
+        )
+        .order_by(*fields, *expressions)
+    )
+
+    results = []
+    for row in rows:
+        total = row.pop('total')
+        overtime = row.pop('overtime')
+        row['total_hours'] = _hours(total)
+        row['average_hours'] = _hours(total / row['closed_records']) if row['closed_records'] else 0.0
+        row['overtime_hours'] = _hours(overtime)
+        results.append(row)
+    return results
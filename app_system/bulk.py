@@ -0,0 +1,191 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .conditional import bump_table_version
+
+MAX_BULK_ITEMS = 1000
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    many=True serializer that writes with bulk_create / bulk_update instead of
+    one save() per item. For updates `instance` is a dict {pk: object} and
+    every item of the payload carries its "id".
+    """
+
+    def to_internal_value(self, data):
+        # Cizí klíče celé dávky se načtou jedním dotazem na pole místo get() u každé položky
+        preloaded = []
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                    field.to_internal_value = self._preloaded(field, data)
+                    preloaded.append(name)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            for name in preloaded:
+                del self.child.fields[name].to_internal_value
+
+    @staticmethod
+    def _preloaded(field, data):
+        pks = {item.get(field.field_name) for item in data if isinstance(item, dict)}
+        pks = {pk for pk in pks if isinstance(pk, int) and not isinstance(pk, bool)}
+        objects = field.get_queryset().in_bulk(pks) if pks else {}
+        fallback = field.to_internal_value
+
+        def to_internal_value(value):
+            if isinstance(value, int) and value in objects:
+                return objects[value]
+            return fallback(value)
+        return to_internal_value
+
+    def run_child_validation(self, data):
+        # Při hromadné úpravě se položka validuje proti své instanci (partial, unikátnost bez sebe sama)
+        if self.instance is not None:
+            self.child.instance = self.instance[data['id']]
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**attrs) for attrs in validated_data]
+        model.objects.bulk_create(objs, batch_size=500)
+        return objs
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        objs, fields = [], set()
+        for item, attrs in zip(self.initial_data, validated_data):
+            obj = instances[item['id']]
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            fields.update(attrs)
+            objs.append(obj)
+
+        if fields:
+            # bulk_update nevolá pre_save: auto_now (updated_at) a odvozená pole (SearchKeyField) se dopočítají zde
+            derived = [
+                f for f in model._meta.concrete_fields
+                if getattr(f, 'auto_now', False) or getattr(f, 'derived_from', None) in fields
+            ]
+            for obj in objs:
+                for field in derived:
+                    field.pre_save(obj, add=False)
+            model.objects.bulk_update(objs, sorted(fields | {f.name for f in derived}), batch_size=500)
+        return objs
+
+
+def _item_errors(detail):
+    if isinstance(detail, dict):
+        items = sorted(detail.items())
+    else:
+        items = [(index, errors) for index, errors in enumerate(detail) if errors]
+    return [{'index': index, 'errors': errors} for index, errors in items]
+
+
+class BulkModelMixin:
+    """
+    /bulk/ endpoint on a ModelViewSet whose serializer uses BulkListSerializer:
+    POST [objects] creates, PATCH [objects with "id"] updates, DELETE [ids]
+    deletes. The whole batch is validated first and applied in one
+    transaction; DjangoModelPermissions are checked once per request.
+    Errors come back per item as {"index", "errors"}.
+    """
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'Očekáván neprázdný seznam položek.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BULK_ITEMS:
+            return Response({'detail': f'Maximálně {MAX_BULK_ITEMS} položek v jedné dávce.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.method == 'DELETE':
+            return self.bulk_destroy(items)
+        if request.method == 'PATCH':
+            return self.bulk_update(items)
+        return self.bulk_create(items)
+
+    def get_bulk_instances(self, ids):
+        """Objects visible to the user (same scoping as get_queryset), or per-item errors for the rest."""
+        errors, valid_ids = [], []
+        for index, pk in enumerate(ids):
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                errors.append({'index': index, 'errors': {'id': ['Očekáváno celé číslo.']}})
+            elif pk in valid_ids:
+                errors.append({'index': index, 'errors': {'id': ['Duplicitní id v dávce.']}})
+            else:
+                valid_ids.append(pk)
+        instances = self.filter_queryset(self.get_queryset()).in_bulk(valid_ids)
+        for index, pk in enumerate(ids):
+            if pk in valid_ids and pk not in instances:
+                errors.append({'index': index, 'errors': {'id': ['Nenalezeno.']}})
+        return instances, sorted(errors, key=lambda error: error['index'])
+
+    def bulk_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except ValidationError as exc:
+            return Response({'errors': _item_errors(exc.detail)}, status=status.HTTP_400_BAD_REQUEST)
+        errors = self.validate_bulk(serializer)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                self.perform_bulk_create(serializer)
+        except IntegrityError:
+            return self._conflict()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        instances, errors = self.get_bulk_instances(ids)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(instances, data=items, many=True, partial=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except ValidationError as exc:
+            return Response({'errors': _item_errors(exc.detail)}, status=status.HTTP_400_BAD_REQUEST)
+        errors = self.validate_bulk(serializer)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                self.perform_bulk_update(serializer)
+        except IntegrityError:
+            return self._conflict()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def _conflict(self):
+        # Položky jsou validované každá zvlášť - kolize unikátních hodnot uvnitř dávky odhalí až databáze
+        return Response({'detail': 'Položky dávky porušují unikátnost (např. stejný e-mail).'}, status=status.HTTP_400_BAD_REQUEST)
+
+    def bulk_destroy(self, ids):
+        instances, errors = self.get_bulk_instances(ids)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            self.perform_bulk_destroy(list(instances.values()))
+        return Response({'deleted': len(instances)}, status=status.HTTP_200_OK)
+
+    def validate_bulk(self, serializer):
+        """Checks across items of a valid batch (e.g. collisions between them); returns per-item errors."""
+        return []
+
+    def perform_bulk_create(self, serializer):
+        serializer.save()
+        bump_table_version(self.queryset.model)
+
+    def perform_bulk_update(self, serializer):
+        serializer.save()
+        bump_table_version(self.queryset.model)
+
+    def perform_bulk_destroy(self, instances):
+        # Mazání jde přes queryset.delete(): kaskády i signály (souhrny, verze tabulek) zůstávají v platnosti
+        self.queryset.model.objects.filter(pk__in=[obj.pk for obj in instances]).delete()
@@ -0,0 +1,159 @@
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import APIException
+
+from .models import TableVersion
+from .response_cache import invalidate_responses
+from .roles import user_roles
+
+
+def table_name(model):
+    return model._meta.label_lower
+
+
+def bump_table_version(*models):
+    """
+    Zvýší verzi tabulek a zneplatní jejich cachované odpovědi; volat i po
+    bulk_create/update(), které signály neposílají. Zápis proběhne jednou
+    po commitu transakce, opakovaná volání pro stejnou tabulku se sloučí
+    (mimo transakci hned).
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'pending_table_versions', None)
+    if pending is None:
+        # Po rollbacku tu tabulky zůstanou a zvýší se s příští transakcí - zbytečně, ale bezpečně
+        pending = connection.pending_table_versions = {}
+    pending.update((table_name(model), model) for model in models)
+
+    def flush():
+        # První callback zapíše všechny čekající tabulky, další už najdou prázdno
+        if pending:
+            models = list(pending.values())
+            pending.clear()
+            _write_table_versions(models)
+
+    transaction.on_commit(flush)
+
+
+def _write_table_versions(models):
+    now = timezone.now()
+    for model in models:
+        versions = TableVersion.objects.filter(table=table_name(model))
+        if versions.update(version=F('version') + 1, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                TableVersion.objects.create(table=table_name(model), version=1, updated_at=now)
+        except IntegrityError:
+            versions.update(version=F('version') + 1, updated_at=now)
+    invalidate_responses(*models)
+
+
+def get_validators(request, models, daily=False):
+    """
+    Returns (etag, last_modified) for a response built from `models`, using a
+    single query over TableVersion - the body is never serialized. The ETag
+    also covers the URL, the renderer and the caller's roles, because the
+    same URL yields different data for differently privileged users. With
+    `daily` the response also depends on today's date (e.g. days left to
+    contract expiry): the ETag covers the local date and Last-Modified is
+    never before local midnight.
+    """
+    names = sorted({table_name(model) for model in models})
+    rows = {table: (version, updated_at) for table, version, updated_at in
+            TableVersion.objects.filter(table__in=names).values_list('table', 'version', 'updated_at')}
+
+    roles = user_roles(request)
+    renderer = getattr(request, 'accepted_renderer', None)
+    parts = [f'{name}:{rows[name][0] if name in rows else 0}' for name in names]
+    parts += [
+        request.get_full_path(),
+        renderer.format if renderer is not None else '',
+        str(roles.user_id), str(roles.is_staff), str(roles.is_superuser),
+        ','.join(roles.groups), ','.join(sorted(roles.permissions)),
+    ]
+    if daily:
+        parts.append(timezone.localdate().isoformat())
+    etag = quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest())
+
+    # Bez řádku u některé tabulky (zatím beze změny) nelze Last-Modified určit.
+    last_modified = None
+    if len(rows) == len(names):
+        last_modified = int(max(updated_at for _, updated_at in rows.values()).timestamp())
+        if daily:
+            midnight = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+            last_modified = max(last_modified, int(midnight.timestamp()))
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Prohlížeč si odpověď nechá, ale před použitím ji vždy ověří (If-None-Match)
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_view(*models):
+    """Podmíněný GET pro funkční view (pod @api_view), např. @conditional_view(Employee, Department)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag, last_modified = get_validators(request, models)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+        return wrapped
+    return decorator
+
+
+class NotModified(APIException):
+    status_code = 304
+
+
+class ConditionalGetMixin:
+    """
+    Answers If-None-Match / If-Modified-Since on list and retrieve with 304
+    before the queryset is evaluated. `conditional_models` lists the other
+    tables the serialized output reads from (e.g. department_name);
+    `conditional_daily` marks output that also changes with the date.
+    """
+    conditional_actions = ('list', 'retrieve')
+    conditional_models = ()
+    conditional_daily = False
+    validators = None
+
+    def get_conditional_models(self):
+        return (self.queryset.model, *self.conditional_models)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and self.action in self.conditional_actions:
+            self.validators = get_validators(request, self.get_conditional_models(), daily=self.conditional_daily)
+            etag, last_modified = self.validators
+            if get_conditional_response(request, etag=etag, last_modified=last_modified) is not None:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.validators is not None:
+            set_validators(response, *self.validators)
+        return response
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+
+from .models import AttendanceRecord, Department, Document, Employee, FinanceMonthlyRollup, Leave, Transaction
+
+DASHBOARD_CACHE_TIMEOUT = 30
+
+
+def department_headcount():
+    departments = list(
+        Department.objects.annotate(headcount=Count('employees'))
+        .order_by('name')
+        .values('id', 'name', 'headcount')
+    )
+    total = Employee.objects.count()
+    return {
+        'total_employees': total,
+        'total_departments': len(departments),
+        'unassigned_employees': total - sum(department['headcount'] for department in departments),
+        'departments': departments,
+    }
+
+
+def attendance_today(today):
+    return AttendanceRecord.objects.filter(date=today).aggregate(
+        checked_in=Count('id'),
+        open_check_ins=Count('id', filter=Q(check_out_time__isnull=True)),
+    )
+
+
+def pending_leaves(today):
+    return Leave.objects.filter(status='PENDING').aggregate(
+        pending=Count('id'),
+        starting_within_week=Count('id', filter=Q(start_date__lte=today + timedelta(days=7))),
+    )
+
+
+def expiring_contracts(today):
+    return Document.objects.expiring_within(Document.EXPIRY_WARNING_DAYS, today).count()
+
+
+def finance_month_to_date(today):
+    # Měsíční souhrn (FinanceMonthlyRollup) místo součtu přes všechny transakce měsíce;
+    # souhrn ale obsahuje i transakce s datem po dnešku, ty se odečtou (index na transaction_date)
+    month = today.replace(day=1)
+    totals = FinanceMonthlyRollup.objects.filter(month=month).aggregate(
+        income=Sum('total_amount', filter=Q(type='INCOME')),
+        expense=Sum('total_amount', filter=Q(type='EXPENSE')),
+        transaction_count=Sum('transaction_count'),
+    )
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    future = Transaction.objects.filter(transaction_date__gt=today, transaction_date__lt=next_month).order_by().aggregate(
+        income=Sum('amount', filter=Q(type='INCOME')),
+        expense=Sum('amount', filter=Q(type='EXPENSE')),
+        transaction_count=Count('id'),
+    )
+    income = (totals['income'] or 0) - (future['income'] or 0)
+    expense = (totals['expense'] or 0) - (future['expense'] or 0)
+    return {
+        'month': month,
+        'income': income,
+        'expense': expense,
+        'net_balance': income - expense,
+        'transaction_count': (totals['transaction_count'] or 0) - future['transaction_count'],
+    }
+
+
+def dashboard_snapshot(today, leaves=False, documents=False, finance=False):
+    """
+    Numbers for the home page, one grouped query per section. Sections the
+    caller may not see (leaves, documents, finance) are None and their
+    queries are skipped.
+    """
+    return {
+        'date': today,
+        **department_headcount(),
+        'attendance': attendance_today(today),
+        'leaves': pending_leaves(today) if leaves else None,
+        'expiring_contracts': expiring_contracts(today) if documents else None,
+        'finance': finance_month_to_date(today) if finance else None,
+    }
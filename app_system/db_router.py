@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+# Po zápisu čte klient ještě tuto dobu z primární databáze (read-your-writes),
+# replika mezitím dožene zpoždění replikace.
+PRIMARY_STICKY_SECONDS = 10
+STICKY_COOKIE = 'db_primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Session musí být vidět hned po přihlášení, i když replika ještě nedoběhla
+PRIMARY_APPS = ('sessions',)
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def primary_db(view):
+    """
+    Marks a view or ViewSet action whose GET reads must always see the
+    primary (e.g. user_info). Unsafe methods never read from the replica,
+    so POST-only actions need no marker. On an @api_view put it above
+    @api_view.
+    """
+    view.use_primary_db = True
+    return view
+
+
+@contextmanager
+def primary_reads():
+    """Reads inside the block go to the primary, e.g. while computing a shared cached response."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def _wants_primary(view_func, method):
+    if getattr(view_func, 'use_primary_db', False):
+        return True
+    cls = getattr(view_func, 'cls', None)  # DRF: APIView.as_view() / ViewSet.as_view(actions)
+    if cls is None:
+        return False
+    if getattr(cls, 'use_primary_db', False):
+        return True
+    handler = getattr(view_func, 'actions', {}).get(method.lower(), method.lower())
+    return getattr(getattr(cls, handler, None), 'use_primary_db', False)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sends the reads of safe requests (GET/HEAD/OPTIONS) to the replica.
+    Unsafe requests stay on the primary and, when they succeed, pin the
+    client to the primary for PRIMARY_STICKY_SECONDS through a cookie, so
+    it reads its own writes. Views marked with @primary_db never use the
+    replica.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            # Streamované odpovědi (exporty) se dočítají až po návratu - už z primární databáze
+            if request._replica_token is not None:
+                _read_from_replica.reset(request._replica_token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(STICKY_COOKIE, str(time.time() + PRIMARY_STICKY_SECONDS),
+                                max_age=PRIMARY_STICKY_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or self._is_sticky(request) or _wants_primary(view_func, request.method):
+            return None
+        request._replica_token = _read_from_replica.set(True)
+        return None
+
+    def _is_sticky(self, request):
+        try:
+            return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads go to REPLICA_ALIAS only inside a request that
+    ReplicaRoutingMiddleware allowed, and never inside a transaction (the
+    transaction must see its own writes). Writes and migrations always go
+    to the primary ('default').
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _read_from_replica.get() or REPLICA_ALIAS not in settings.DATABASES:
+            return 'default'
+        if model._meta.app_label in PRIMARY_APPS or connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika je kopie primární databáze - objekty z obou smí být ve vztahu
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,169 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .metrics import measure
+from .pagination import get_keyset_ordering
+from .query_plan import get_query_plan
+
+
+# Pole, jejichž to_representation() vrací hodnotu z .values() beze změny.
+_IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+
+def _identity(value):
+    return value
+
+
+class Computed:
+    """
+    Output field computed from several `.values()` lookups, e.g. a model
+    __str__ that the generic mapping cannot derive.
+    """
+
+    def __init__(self, lookups, function):
+        self.lookups = tuple(lookups)
+        self.function = function
+
+
+class Related:
+    """
+    Output field rendered by a nested serializer. The related objects of a
+    whole page are loaded in one query and each distinct object is
+    serialized only once.
+    """
+
+    def __init__(self, lookup, serializer_class):
+        self.lookup = lookup
+        self.serializer_class = serializer_class
+
+    def build(self, ids, context):
+        serializer = self.serializer_class(context=context)
+        model = self.serializer_class.Meta.model
+        select, prefetch = get_query_plan(self.serializer_class)
+        objects = model._default_manager.filter(pk__in=ids).select_related(*select).prefetch_related(*prefetch)
+        return {obj.pk: serializer.to_representation(obj) for obj in objects}
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path that renders rows straight from `.values()` dicts,
+    skipping model instantiation and per-field get_attribute() dispatch.
+    The output is identical to `serializer_class` - same keys, same order,
+    same field representations. Every field that cannot be mapped onto a
+    column (model __str__, nested serializers, method fields) has to be
+    declared in `fields` as Computed or Related.
+    """
+    serializer_class = None
+    fields = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.serializer = self.serializer_class(context=self.context)
+        self.model = self.serializer_class.Meta.model
+        self.columns = []
+        self.specs = [self._build_spec(name, field) for name, field in self.serializer.fields.items() if not field.write_only]
+
+    def _column(self, lookup):
+        if lookup not in self.columns:
+            self.columns.append(lookup)
+        return lookup
+
+    def _converter(self, field):
+        if type(field) in _IDENTITY_FIELDS:
+            return _identity
+        if isinstance(field, serializers.ChoiceField) and all(isinstance(k, str) for k in field.choices):
+            return _identity
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            return _identity
+        return field.to_representation
+
+    def _build_spec(self, name, field):
+        declared = self.fields.get(name)
+        if isinstance(declared, Computed):
+            return name, 'computed', tuple(self._column(lookup) for lookup in declared.lookups), declared.function
+        if isinstance(declared, Related):
+            return name, 'related', self._column(declared.lookup), declared
+
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField, serializers.ManyRelatedField)) or field.source == '*' or \
+           (isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField)):
+            raise ImproperlyConfigured(f'{type(self).__name__}: pole "{name}" je potřeba deklarovat jako Computed nebo Related.')
+
+        # Nullable vazby po cestě: DRF pole vynechá (SkipField), pokud je vazba None.
+        guards = []
+        model = self.model
+        attrs = field.source_attrs
+        try:
+            for index, attr in enumerate(attrs):
+                model_field = model._meta.get_field(attr)
+                if index < len(attrs) - 1:
+                    if not model_field.is_relation or model_field.many_to_many or model_field.one_to_many:
+                        raise FieldDoesNotExist
+                    if model_field.null:
+                        guards.append(self._column('__'.join(attrs[:index + 1])))
+                    model = model_field.related_model
+                elif model_field.many_to_many or model_field.one_to_many:
+                    raise FieldDoesNotExist
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f'{type(self).__name__}: zdroj "{field.source}" pole "{name}" není sloupec modelu.')
+
+        return name, 'column', self._column('__'.join(attrs)), self._converter(field), tuple(guards)
+
+    def values(self, queryset):
+        extra = [o.lstrip('-') for o in get_keyset_ordering(queryset)]
+        columns = list(dict.fromkeys(self.columns + extra))
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        resolved = {}
+        for spec in self.specs:
+            if spec[1] == 'related':
+                name, _, lookup, related = spec
+                ids = {row[lookup] for row in rows if row[lookup] is not None}
+                resolved[name] = related.build(ids, self.context) if ids else {}
+
+        data = []
+        for row in rows:
+            item = {}
+            for spec in self.specs:
+                name, kind = spec[0], spec[1]
+                if kind == 'column':
+                    _, _, lookup, convert, guards = spec
+                    if guards and any(row[guard] is None for guard in guards):
+                        continue
+                    value = row[lookup]
+                    item[name] = None if value is None else convert(value)
+                elif kind == 'computed':
+                    _, _, lookups, function = spec
+                    item[name] = function(*(row[lookup] for lookup in lookups))
+                else:
+                    value = row[spec[2]]
+                    item[name] = None if value is None else resolved[name][value]
+            data.append(item)
+        return data
+
+
+class FastReadMixin:
+    """
+    Opt-in fast list() for high-volume read endpoints: set
+    `fast_read_serializer_class` to a ValuesSerializer of the ViewSet's
+    serializer. Responses are identical to the regular list().
+    """
+    fast_read_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_read_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        fast = self.fast_read_serializer_class(context=self.get_serializer_context())
+        queryset = fast.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with measure('serialize'):
+                data = fast.to_representation(page)
+            return self.get_paginated_response(data)
+        with measure('serialize'):
+            data = fast.to_representation(queryset)
+        return Response(data)
@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+from django.db import transaction
+
+from .conditional import bump_table_version
+from .models import Leave
+
+MAX_AVAILABILITY_DAYS = 366
+
+# Přechody stavu, které smí provést schvalovatel: akce -> nový stav
+LEAVE_DECISIONS = {
+    'approve': 'APPROVED',
+    'reject': 'REJECTED',
+}
+
+
+def _result(leave_id, status, current_status=None):
+    result = {'id': leave_id, 'status': status}
+    if current_status is not None:
+        result['current_status'] = current_status
+    return result
+
+
+def decide_leaves(queryset, ids, new_status, decided_by):
+    """
+    Moves the PENDING leaves among `ids` to `new_status` with one conditional
+    UPDATE ... WHERE status = 'PENDING'. `queryset` limits which leaves the
+    caller may see. A pure status change does not go through Leave.save(),
+    so full_clean() is skipped (a leave that already started can still be
+    approved). Returns one outcome per id, in input order: approved/rejected,
+    not_pending (with current_status), not_found, invalid (not an integer)
+    or duplicate (repeated id; only its first occurrence is decided).
+    """
+    # Typ se kontroluje dřív než členství - True ani 1.0 nejsou id 1
+    kinds, valid_ids = [], []
+    for pk in ids:
+        if not isinstance(pk, int) or isinstance(pk, bool):
+            kinds.append('invalid')
+        elif pk in valid_ids:
+            kinds.append('duplicate')
+        else:
+            kinds.append('valid')
+            valid_ids.append(pk)
+
+    with transaction.atomic():
+        # Řádky jsou do konce transakce zamčené; WHERE status = 'PENDING' navíc chrání tam, kde zámky řádků nejsou
+        rows = queryset.filter(pk__in=valid_ids).order_by().select_for_update().values_list('pk', 'status')
+        current = dict(rows)
+        pending = {pk for pk, status in current.items() if status == 'PENDING'}
+        if pending:
+            Leave.objects.filter(pk__in=pending, status='PENDING').update(status=new_status, approved_by=decided_by)
+            bump_table_version(Leave)
+
+    outcome = new_status.lower()
+    results = []
+    for pk, kind in zip(ids, kinds):
+        if kind != 'valid':
+            results.append(_result(pk, kind))
+        elif pk in pending:
+            results.append(_result(pk, outcome))
+        elif pk in current:
+            results.append(_result(pk, 'not_pending', current[pk]))
+        else:
+            results.append(_result(pk, 'not_found'))
+    return results
+
+
+def leave_availability(queryset, date_from, date_to, statuses=('APPROVED',)):
+    """
+    Who is absent on each day of [date_from, date_to], per department. The
+    leaves touching the range are read with one range query
+    (end_date >= date_from AND start_date <= date_to, index leave_end_start_idx)
+    and spread over the days in Python. Every day of the range is present,
+    departments only when someone from them is absent.
+    """
+    rows = (
+        queryset.filter(start_date__lte=date_to, end_date__gte=date_from, status__in=statuses)
+        .order_by('employee__department__name', 'employee__last_name', 'employee_id')
+        .values_list(
+            'id', 'employee_id', 'employee__first_name', 'employee__last_name',
+            'employee__department_id', 'employee__department__name',
+            'leave_type', 'status', 'start_date', 'end_date',
+        )
+    )
+
+    days = {}
+    for leave_id, employee_id, first_name, last_name, department_id, department_name, leave_type, status, start, end in rows:
+        absence = {
+            'leave_id': leave_id,
+            'employee_id': employee_id,
+            'employee_name': f'{first_name} {last_name}',
+            'leave_type': leave_type,
+            'status': status,
+        }
+        day = max(start, date_from)
+        while day <= min(end, date_to):
+            departments = days.setdefault(day, {})
+            department = departments.setdefault(department_id, {
+                'department_id': department_id,
+                'department_name': department_name,
+                'absences': [],
+            })
+            department['absences'].append(absence)
+            day += timedelta(days=1)
+
+    result = []
+    day = date_from
+    while day <= date_to:
+        departments = list(days.get(day, {}).values())
+        result.append({
+            'date': day,
+            'absent_count': sum(len(department['absences']) for department in departments),
+            'departments': departments,
+        })
+        day += timedelta(days=1)
+    return result
+
+
+def batch_overlaps(ranges, batch_ids=()):
+    """
+    Overlaps of a bulk batch: `ranges` are (index, employee_id, start_date,
+    end_date) with the values after the change. Every item is checked
+    against the other items and, in one query, against the blocking leaves
+    in the database - except the rows edited by this batch (`batch_ids`),
+    whose stored ranges are being replaced. Returns per-item errors in the
+    bulk format.
+    """
+    errors = {}
+    last_end = {}
+    for index, employee_id, start_date, end_date in sorted(ranges, key=lambda item: (item[1], item[2])):
+        if employee_id in last_end and start_date <= last_end[employee_id]:
+            errors[index] = {'start_date': ['Překrývá se s jinou žádostí v dávce.']}
+        last_end[employee_id] = max(end_date, last_end.get(employee_id, end_date))
+
+    if ranges:
+        stored = {}
+        rows = (
+            Leave.objects.filter(
+                employee_id__in={item[1] for item in ranges}, status__in=Leave.BLOCKING_STATUSES,
+                start_date__lte=max(item[3] for item in ranges), end_date__gte=min(item[2] for item in ranges),
+            )
+            .exclude(pk__in=batch_ids)
+            .values_list('employee_id', 'start_date', 'end_date')
+        )
+        for employee_id, start_date, end_date in rows:
+            stored.setdefault(employee_id, []).append((start_date, end_date))
+        for index, employee_id, start_date, end_date in ranges:
+            if index not in errors and any(start <= end_date and end >= start_date for start, end in stored.get(employee_id, ())):
+                errors[index] = {'start_date': ['Zaměstnanec už má v tomto termínu jinou žádost o volno.']}
+
+    return [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
@@ -0,0 +1,56 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app_system.models import AttendanceRecord, Employee
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Porovná propustnost jednotlivých check-in/check-out požadavků a dávkového /bulk-punch/. Testovací data na konci smaže.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=100)
+        parser.add_argument('--days', type=int, default=10)
+
+    def handle(self, *args, **options):
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        user = User.objects.create_user('__benchmark_punches__')
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(user)
+        employees = Employee.objects.bulk_create(
+            Employee(first_name='Zátěž', last_name=str(i), position='Test', email=f'benchmark-punch{i}@example.com')
+            for i in range(options['employees'])
+        )
+        try:
+            # Jednotlivě lze zaznamenat jen dnešek, takže se měří jeden den pro všechny zaměstnance.
+            start = time.perf_counter()
+            for employee in employees:
+                client.post(f'/api/employees/{employee.pk}/check_in/')
+                client.post(f'/api/employees/{employee.pk}/check_out/')
+            single = 2 * len(employees) / (time.perf_counter() - start)
+
+            first_day = timezone.now().replace(hour=8, minute=0, second=0, microsecond=0) - timedelta(days=options['days'] + 1)
+            events = []
+            for day in range(options['days']):
+                check_in = first_day + timedelta(days=day)
+                for employee in employees:
+                    events.append({'employee_id': employee.pk, 'timestamp': check_in.isoformat(), 'direction': 'in'})
+                    events.append({'employee_id': employee.pk, 'timestamp': (check_in + timedelta(hours=8)).isoformat(), 'direction': 'out'})
+
+            start = time.perf_counter()
+            response = client.post('/api/attendance-history/bulk-punch/', events, format='json')
+            bulk = len(events) / (time.perf_counter() - start)
+
+            self.stdout.write(f'jednotlivě: {single:>10,.0f} událostí/s')
+            self.stdout.write(f'dávkově:    {bulk:>10,.0f} událostí/s ({bulk / single:.1f}x), {response.data["counts"]}')
+        finally:
+            AttendanceRecord.objects.filter(employee__in=employees).delete()
+            Employee.objects.filter(pk__in=[e.pk for e in employees]).delete()
+            user.delete()
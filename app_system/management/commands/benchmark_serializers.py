@@ -0,0 +1,82 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from app_system.models import AttendanceRecord, Department, Employee, Transaction, TransactionCategory
+from app_system.query_plan import get_query_plan
+from app_system.serializers import (
+    AttendanceRecordSerializer, AttendanceRecordValuesSerializer, TransactionSerializer, TransactionValuesSerializer,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Porovná rychlost (řádky/s) ModelSerializerů a rychlé cesty z .values() na vygenerovaných datech. Data se na konci zahodí.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            self.create_data(rows)
+            for label, model, slow, fast in (
+                ('attendance', AttendanceRecord, AttendanceRecordSerializer, AttendanceRecordValuesSerializer),
+                ('transactions', Transaction, TransactionSerializer, TransactionValuesSerializer),
+            ):
+                self.compare(label, model, slow, fast, repeat)
+            transaction.set_rollback(True)
+
+    def create_data(self, rows):
+        department = Department.objects.create(name='__benchmark__')
+        employees = Employee.objects.bulk_create(
+            Employee(first_name='Jan', last_name=f'Novák {i}', position='Tester', email=f'benchmark{i}@example.com', department=department)
+            for i in range(max(1, rows // 50))
+        )
+        now = timezone.now()
+        AttendanceRecord.objects.bulk_create(
+            AttendanceRecord(employee=employees[i % len(employees)], check_in_time=now - timedelta(hours=i),
+                             check_out_time=now - timedelta(hours=i - 8) if i % 3 else None,
+                             date=(now - timedelta(hours=i)).date())
+            for i in range(rows)
+        )
+        users = [User.objects.create_user(f'__benchmark_{i}__') for i in range(5)]
+        category = TransactionCategory.objects.create(name='__benchmark__', type='EXPENSE')
+        Transaction.objects.bulk_create(
+            Transaction(title=f'Platba {i}', amount=Decimal(i) / 100, type='EXPENSE', transaction_date=date.today() - timedelta(days=i % 365),
+                        category=category if i % 2 else None, recorded_by=users[i % len(users)] if i % 7 else None, party_name='Dodavatel')
+            for i in range(rows)
+        )
+
+    def compare(self, label, model, slow_class, fast_class, repeat):
+        renderer = JSONRenderer()
+        select, prefetch = get_query_plan(slow_class)
+        queryset = model.objects.all()
+
+        def slow():
+            return slow_class(queryset.select_related(*select).prefetch_related(*prefetch), many=True).data
+
+        def fast():
+            serializer = fast_class()
+            return serializer.to_representation(serializer.values(queryset))
+
+        if renderer.render(slow()) != renderer.render(fast()):
+            raise CommandError(f'{label}: výstup rychlé cesty se liší od {slow_class.__name__}.')
+
+        count = queryset.count()
+        for name, function in (('ModelSerializer', slow), ('values()', fast)):
+            best = min(self.measure(function) for _ in range(repeat))
+            self.stdout.write(f'{label:<13} {name:<16} {count / best:>12,.0f} řádků/s')
+
+    def measure(self, function):
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
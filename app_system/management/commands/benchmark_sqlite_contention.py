@@ -0,0 +1,126 @@
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+ALIAS = 'sqlite_contention_benchmark'
+SEED_ROWS = 20000
+EMPLOYEES = 500
+
+
+def _profiles():
+    from backend.settings_production import DATABASES
+
+    production = DATABASES['default']
+    return {
+        # Výchozí nastavení Djanga: rollback journal, DEFERRED transakce, timeout 5 s
+        'default': {'OPTIONS': {}, 'CONN_MAX_AGE': 0},
+        'production': {'OPTIONS': production['OPTIONS'], 'CONN_MAX_AGE': production['CONN_MAX_AGE']},
+    }
+
+
+def _use_database(path, profile):
+    connections.close_all()
+    settings = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), **profile}
+    configured = connections.configure_settings({'default': dict(connections.settings['default']), ALIAS: settings})
+    connections.settings[ALIAS] = configured[ALIAS]
+    try:
+        del connections[ALIAS]  # spojení s nastavením předchozího profilu
+    except AttributeError:
+        pass
+
+
+def _create_schema():
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute('CREATE TABLE punch (id INTEGER PRIMARY KEY, employee_id INTEGER NOT NULL, ts REAL NOT NULL)')
+        cursor.execute('CREATE INDEX punch_employee_idx ON punch (employee_id, ts)')
+        cursor.execute('CREATE TABLE rollup (employee_id INTEGER PRIMARY KEY, punches INTEGER NOT NULL)')
+        cursor.executemany('INSERT INTO punch (employee_id, ts) VALUES (%s, %s)', [(i % EMPLOYEES, i) for i in range(SEED_ROWS)])
+        cursor.executemany('INSERT INTO rollup (employee_id, punches) VALUES (%s, %s)', [(i, SEED_ROWS // EMPLOYEES) for i in range(EMPLOYEES)])
+
+
+def _write(cursor, employee_id):
+    # Stejný vzor jako ingest_punches / record_transactions: čtení a zápis v jedné transakci
+    with transaction.atomic(using=ALIAS):
+        cursor.execute('SELECT punches FROM rollup WHERE employee_id = %s', [employee_id])
+        punches = cursor.fetchone()[0]
+        cursor.execute('INSERT INTO punch (employee_id, ts) VALUES (%s, %s)', [employee_id, time.time()])
+        cursor.execute('UPDATE rollup SET punches = %s WHERE employee_id = %s', [punches + 1, employee_id])
+
+
+def _read(cursor, employee_id):
+    cursor.execute('SELECT COUNT(*), MAX(ts) FROM punch WHERE employee_id = %s', [employee_id])
+    cursor.fetchone()
+
+
+def _worker(duration, write_ratio, seed, results):
+    rnd = random.Random(seed)
+    stats = {'writes': 0, 'reads': 0, 'errors': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        is_write = rnd.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            with connections[ALIAS].cursor() as cursor:
+                (_write if is_write else _read)(cursor, rnd.randrange(EMPLOYEES))
+        except OperationalError:
+            stats['errors'] += 1
+            continue
+        finally:
+            if connections[ALIAS].settings_dict['CONN_MAX_AGE'] == 0:
+                connections[ALIAS].close()
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['writes' if is_write else 'reads'] += 1
+    connections.close_all()
+    results.put(stats)
+
+
+class Command(BaseCommand):
+    help = (
+        'Porovná propustnost SQLite při souběžném čtení a zápisu z více procesů: výchozí nastavení '
+        'Djanga proti profilu backend/settings_production.py (WAL, busy_timeout, BEGIN IMMEDIATE, '
+        'trvalá spojení). Běží nad dočasnou databází, skutečná data nemění.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help='Délka měření jednoho profilu v sekundách.')
+        parser.add_argument('--write-ratio', type=float, default=0.3, help='Podíl zápisů mezi operacemi (0-1).')
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('Benchmark potřebuje multiprocessing se start metodou "fork".')
+        context = multiprocessing.get_context('fork')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name, profile in _profiles().items():
+                _use_database(Path(directory) / f'{name}.sqlite3', profile)
+                _create_schema()
+                connections.close_all()  # potomci si otevřou vlastní spojení
+
+                results = context.Queue()
+                workers = [
+                    context.Process(target=_worker, args=(options['duration'], options['write_ratio'], seed, results))
+                    for seed in range(options['processes'])
+                ]
+                for worker in workers:
+                    worker.start()
+                stats = [results.get() for _ in workers]
+                for worker in workers:
+                    worker.join()
+                self.report(name, stats, options['duration'])
+
+    def report(self, name, stats, duration):
+        writes = sum(s['writes'] for s in stats)
+        reads = sum(s['reads'] for s in stats)
+        errors = sum(s['errors'] for s in stats)
+        latencies = sorted(latency for s in stats for latency in s['latencies'])
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+        self.stdout.write(
+            f'{name:<11} zápisy {writes / duration:>8,.0f}/s  čtení {reads / duration:>8,.0f}/s  '
+            f'"database is locked" {errors:>6}  p95 {p95:>7.1f} ms'
+        )
@@ -0,0 +1,44 @@
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from app_system.finance_import import IMPORT_BATCH_SIZE, ImportFormatError, import_transactions, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Importuje transakce z bankovního exportu (CSV nebo JSON) a vypíše report importu.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Soubor s exportem z banky.')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Formát souboru (výchozí podle přípony).')
+        parser.add_argument('--user', help='Uživatelské jméno, které se uloží jako "zaznamenal(a)".')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Jen ověří soubor a spočítá duplicity, nic neuloží.')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'Soubor {path} neexistuje.')
+        user = None
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Uživatel {options["user"]} neexistuje.')
+
+        started = time.perf_counter()
+        try:
+            rows = read_rows(path.read_bytes(), options['format'] or path.suffix.lstrip('.').lower())
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+        report = import_transactions(rows, recorded_by=user, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} vytvořeno, {report['duplicates']} duplicit, {report['error_count']} chyb "
+            f"z {report['total']} řádků za {elapsed:.1f} s" + (' (dry run)' if options['dry_run'] else '')
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_system.rollups import rebuild_rollup, verify_rollup
+
+
+class Command(BaseCommand):
+    help = 'Přepočítá tabulku FinanceMonthlyRollup z transakcí a ověří, že odpovídá.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify-only', action='store_true', help='Jen porovná uložené souhrny s transakcemi, nic nemění.')
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            count = rebuild_rollup()
+            self.stdout.write(f'Přepočítáno {count} řádků souhrnu.')
+
+        mismatches = verify_rollup()
+        for key, stored, expected in mismatches:
+            self.stderr.write(f'Nesouhlasí {key}: uloženo {stored}, má být {expected}')
+        if mismatches:
+            raise CommandError(f'Souhrn nesouhlasí s transakcemi ({len(mismatches)} řádků).')
+        self.stdout.write(self.style.SUCCESS('Souhrn odpovídá transakcím.'))
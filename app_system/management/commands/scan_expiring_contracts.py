@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from app_system.models import Document
+
+
+class Command(BaseCommand):
+    help = (
+        'Najde smlouvy, které skončí v následujících N dnech (jedním dotazem přes index '
+        'document_type_end_date_idx), a zapíše jejich přehled. Určeno ke spouštění jednou denně (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=Document.EXPIRY_WARNING_DAYS, help='Kolik dní dopředu hledat.')
+        parser.add_argument('--format', choices=['text', 'json'], default='text')
+        parser.add_argument('--output', help='Soubor pro přehled; bez něj se vypíše na standardní výstup.')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        rows = (
+            Document.objects.expiring_within(options['days'], today)
+            .order_by('contract_end_date', 'id')
+            .values_list('id', 'title', 'contract_end_date', 'employee__username', 'employee__first_name', 'employee__last_name')
+        )
+        contracts = [
+            {
+                'id': document_id,
+                'title': title,
+                'contract_end_date': end_date,
+                'days_left': (end_date - today).days,
+                'employee': ' '.join(filter(None, [first_name, last_name])) or username,
+            }
+            for document_id, title, end_date, username, first_name, last_name in rows
+        ]
+
+        if options['format'] == 'json':
+            digest = json.dumps({'date': today, 'days': options['days'], 'contracts': contracts}, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2)
+        else:
+            lines = [f'Smlouvy končící do {options["days"]} dní (stav k {today:%d.%m.%Y}): {len(contracts)}']
+            for contract in contracts:
+                lines.append(
+                    f'{contract["contract_end_date"]:%d.%m.%Y} (za {contract["days_left"]} dní)  '
+                    f'{contract["title"]}  {contract["employee"] or "-"}'
+                )
+            digest = '\n'.join(lines)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(digest + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Přehled {len(contracts)} smluv zapsán do {options["output"]}.'))
+        else:
+            self.stdout.write(digest)
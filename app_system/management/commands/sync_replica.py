@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from app_system.db_router import REPLICA_ALIAS
+
+
+def copy_database(source, target):
+    """Online backup primary -> replica; the primary stays writable while pages are copied."""
+    with sqlite3.connect(source) as primary, sqlite3.connect(target) as replica:
+        primary.backup(replica)
+    primary.close()
+    replica.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Zkopíruje primární SQLite databázi do repliky (DJANGO_SQLITE_REPLICA) přes online backup API. '
+        'Lokální náhrada replikace: s --interval běží ve smyčce a interval odpovídá zpoždění repliky.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Opakovat každých N sekund, dokud se nepřeruší.')
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.settings:
+            raise CommandError('Replika není nastavená - spusťte s DJANGO_SQLITE_REPLICA=<cesta>.')
+        source = str(connections['default'].settings_dict['NAME'])
+        target = str(connections[REPLICA_ALIAS].settings_dict['NAME'])
+        if source == target:
+            raise CommandError('Replika musí být jiný soubor než primární databáze.')
+
+        while True:
+            start = time.perf_counter()
+            copy_database(source, target)
+            self.stdout.write(f'Replika {target} synchronizována ({(time.perf_counter() - start) * 1000:.0f} ms).')
+            if not options['interval']:
+                return
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                return
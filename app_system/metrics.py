@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+
+# Horní meze košů histogramů; percentil se hlásí jako horní mez koše, do kterého padne.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf'))
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000, float('inf'))
+PERCENTILES = (50, 95, 99)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Measurements of one request, filled by the SQL execute wrapper and measure()."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.timings = {}
+        self._active = set()
+
+    @property
+    def duplicates(self):
+        # Stejné SQL se stejnými parametry víckrát v jednom požadavku (typicky N+1 nebo opakované get())
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            if not many:
+                try:
+                    self.statements[sql, tuple(params) if params is not None else None] += 1
+                except TypeError:
+                    pass  # nehashovatelné parametry se do duplicit nepočítají
+
+
+@contextmanager
+def measure(name):
+    """Adds the time spent in the block to the current request under `name`; nested blocks count once."""
+    metrics = _current.get()
+    if metrics is None or name in metrics._active:
+        yield
+        return
+    metrics._active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._active.discard(name)
+        metrics.timings[name] = metrics.timings.get(name, 0.0) + time.perf_counter() - start
+
+
+class _Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        rank = self.total * p / 100
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return None
+
+    def summary(self, digits=1):
+        percentiles = {f'p{p}': self.percentile(p) for p in PERCENTILES}
+        return {
+            **{name: round(value, digits) if value is not None else None for name, value in percentiles.items()},
+            'avg': round(self.sum / self.total, digits) if self.total else None,
+            'max': round(self.max, digits),
+        }
+
+
+class _RouteStats:
+    def __init__(self):
+        self.latency = _Histogram(LATENCY_BUCKETS_MS)
+        self.queries = _Histogram(QUERY_BUCKETS)
+        self.sums = Counter()
+        self.errors = 0
+
+    def add(self, metrics, duration_ms, status_code):
+        self.latency.add(duration_ms)
+        self.queries.add(metrics.queries)
+        self.sums['sql_ms'] += metrics.sql_time * 1000
+        self.sums['duplicates'] += metrics.duplicates
+        for name, seconds in metrics.timings.items():
+            self.sums[f'{name}_ms'] += seconds * 1000
+        self.errors += status_code >= 500
+
+    def summary(self):
+        requests = self.latency.total
+        return {
+            'requests': requests,
+            'errors': self.errors,
+            'latency_ms': self.latency.summary(),
+            'queries': self.queries.summary(),
+            **{f'avg_{name}': round(value / requests, 2) for name, value in sorted(self.sums.items())},
+        }
+
+
+class MetricsRegistry:
+    """
+    Per-route histograms aggregated in this process. Every worker process
+    keeps its own numbers; they reset on restart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self.since = timezone.now()
+
+    def record(self, route, method, metrics, duration_ms, status_code):
+        with self._lock:
+            stats = self._routes.get((route, method))
+            if stats is None:
+                stats = self._routes[route, method] = _RouteStats()
+            stats.add(metrics, duration_ms, status_code)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: stats.summary() for key, stats in self._routes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self.since = timezone.now()
+
+
+registry = MetricsRegistry()
+
+
+def _walk(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern) and pattern.name and hasattr(pattern.callback, 'cls'):
+            yield pattern.name, prefix + str(pattern.pattern)
+
+
+def api_routes():
+    """Named DRF routes (router ViewSets and @api_view functions) -> their first URL pattern."""
+    routes = {}
+    for name, route in _walk(get_resolver().url_patterns):
+        routes.setdefault(name, route)  # první vzor, ne varianta s příponou formátu
+    return routes
+
+
+def metrics_report():
+    stats = registry.snapshot()
+    routes = api_routes()
+    known = set(routes)
+    report = [
+        {'route': name, 'pattern': pattern, 'methods': {m: s for (r, m), s in sorted(stats.items()) if r == name}}
+        for name, pattern in sorted(routes.items())
+    ]
+    # Požadavky na trasy mimo DRF (admin apod.)
+    report += [
+        {'route': name, 'pattern': None, 'methods': {m: s for (r, m), s in sorted(stats.items()) if r == name}}
+        for name in sorted({route for route, _ in stats} - known)
+    ]
+    return {'pid': os.getpid(), 'since': registry.since, 'routes': report}
+
+
+def _server_timing(metrics, total):
+    entries = [
+        f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'dup;desc="{metrics.duplicates} duplicate queries"',
+    ]
+    entries += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in metrics.timings.items()]
+    entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures every request: number and total time of SQL queries (all
+    database aliases), duplicate queries, serializer time (measure()) and
+    the render time of DRF responses. Sends them as a Server-Timing header and adds
+    them to the route's histograms in `registry` (see /api/_metrics).
+    Streamed response bodies run after the middleware and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total = time.perf_counter() - metrics.start
+        response['Server-Timing'] = _server_timing(metrics, total)
+        match = request.resolver_match
+        if match is not None and match.view_name:
+            registry.record(match.view_name, request.method, metrics, total * 1000, response.status_code)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response se vykreslí až po view - měří se od tohoto bodu po dokončení render()
+        metrics = _current.get()
+        start = time.perf_counter()
+
+        def rendered(response):
+            metrics.timings['render'] = metrics.timings.get('render', 0.0) + time.perf_counter() - start
+
+        if metrics is not None:
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class SerializerTimingMixin:
+    """Counts the serializer's to_representation() as 'serialize' time of the request."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        def timed(instance):
+            with measure('serialize'):
+                return to_representation(instance)
+
+        serializer.to_representation = timed
+        return serializer
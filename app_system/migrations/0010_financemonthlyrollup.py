@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def build_rollup(apps, schema_editor):
+    Transaction = apps.get_model('app_system', 'Transaction')
+    FinanceMonthlyRollup = apps.get_model('app_system', 'FinanceMonthlyRollup')
+    rows = (
+        Transaction.objects.order_by()
+        .annotate(month=TruncMonth('transaction_date'))
+        .values('month', 'category_id', 'type', 'payment_method')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    FinanceMonthlyRollup.objects.bulk_create(
+        FinanceMonthlyRollup(month=row['month'], category_id=row['category_id'], type=row['type'],
+                             payment_method=row['payment_method'], total_amount=row['total'], transaction_count=row['count'])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0009_performancereview'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='performancereview',
+            name='reviewer',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_review', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='FinanceMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='Měsíc (první den)')),
+                ('type', models.CharField(choices=[('INCOME', 'Příjem'), ('EXPENSE', 'Výdaj')], max_length=10, verbose_name='Typ transakce')),
+                ('payment_method', models.CharField(choices=[('CASH', 'Hotovost'), ('BANK_TRANSFER', 'Bankovní převod'), ('CARD', 'Platební karta'), ('OTHER', 'Jiné')], max_length=20, verbose_name='Způsob platby')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Součet')),
+                ('transaction_count', models.PositiveIntegerField(default=0, verbose_name='Počet transakcí')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='monthly_rollups', to='app_system.transactioncategory', verbose_name='Kategorie')),
+            ],
+            options={
+                'verbose_name': 'Měsíční souhrn transakcí',
+                'verbose_name_plural': 'Měsíční souhrny transakcí',
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('month', 'category', 'type', 'payment_method'), name='uniq_finance_rollup_key'), models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('month', 'type', 'payment_method'), name='uniq_finance_rollup_key_no_category')],
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
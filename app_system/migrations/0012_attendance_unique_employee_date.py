@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:54
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def merge_duplicate_check_ins(apps, schema_editor):
+    """Před přidáním unikátního omezení sloučí duplicitní příchody ze souběžných check-inů."""
+    AttendanceRecord = apps.get_model('app_system', 'AttendanceRecord')
+    duplicates = (
+        AttendanceRecord.objects.order_by()
+        .values('employee_id', 'date')
+        .annotate(count=Count('id'), last_check_out=Max('check_out_time'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        records = AttendanceRecord.objects.filter(employee_id=duplicate['employee_id'], date=duplicate['date']).order_by('check_in_time', 'id')
+        kept = records.first()
+        records.exclude(pk=kept.pk).delete()
+        if duplicate['last_check_out'] and kept.check_out_time != duplicate['last_check_out']:
+            AttendanceRecord.objects.filter(pk=kept.pk).update(check_out_time=duplicate['last_check_out'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0011_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_check_ins, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='attendancerecord',
+            name='attendance_employee_date_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='attendancerecord',
+            constraint=models.UniqueConstraint(fields=('employee', 'date'), name='uniq_attendance_employee_date'),
+        ),
+    ]
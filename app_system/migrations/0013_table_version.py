@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0012_attendance_unique_employee_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100, unique=True, verbose_name='Tabulka')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Verze')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Poslední změna')),
+            ],
+            options={
+                'verbose_name': 'Verze tabulky',
+                'verbose_name_plural': 'Verze tabulek',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0016_leave_range_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['document_type', 'contract_end_date'], name='document_type_end_date_idx'),
+        ),
+    ]
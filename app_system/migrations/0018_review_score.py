@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:24
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0017_document_expiry_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performancereview',
+            name='score',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('quality_of_work'), '+', models.F('attendance')), '+', models.F('communication')), '+', models.F('teamwork')), '+', models.F('initiative')), '/', models.Value(5.0)), output_field=models.FloatField(), verbose_name='Průměrné hodnocení'),
+        ),
+        migrations.AddIndex(
+            model_name='performancereview',
+            index=models.Index(fields=['score'], name='review_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performancereview',
+            index=models.Index(fields=['period', 'score'], name='review_period_score_idx'),
+        ),
+    ]
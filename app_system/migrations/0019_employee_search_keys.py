@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:44
+
+import app_system.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_search_keys(apps, schema_editor):
+    Employee = apps.get_model('app_system', 'Employee')
+    employees = list(Employee.objects.only('first_name', 'last_name'))
+    for employee in employees:
+        employee.first_name_search = app_system.models.search_key(employee.first_name)
+        employee.last_name_search = app_system.models.search_key(employee.last_name)
+    Employee.objects.bulk_update(employees, ['first_name_search', 'last_name_search'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_system', '0018_review_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_last_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_first_name_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='first_name_search',
+            field=app_system.models.SearchKeyField(default='', derived_from='first_name', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='last_name_search',
+            field=app_system.models.SearchKeyField(default='', derived_from='last_name', max_length=100),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['last_name_search'], name='employee_last_name_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['first_name_search'], name='employee_first_name_search_idx'),
+        ),
+    ]
@@ -1,10 +1,44 @@
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Lower
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError 
 from django.utils import timezone 
+from datetime import timedelta
+import unicodedata
 
 User = get_user_model()
 
+def search_key(value):
+    """Casefolded text without diacritics ('Žák' -> 'zak'); SQLite LOWER() folds only ASCII."""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class SearchKeyField(models.CharField):
+    """
+    search_key() of the `derived_from` field, computed in pre_save - so it is
+    filled by save() and bulk_create alike (bulk_update: BulkListSerializer).
+    """
+
+    def __init__(self, *args, derived_from=None, **kwargs):
+        self.derived_from = derived_from
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['derived_from'] = self.derived_from
+        kwargs.pop('editable', None)
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = search_key(getattr(model_instance, self.derived_from))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class Department(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
@@ -22,6 +56,20 @@ class Employee(models.Model):
     date_of_birth = models.DateField(blank=True, null=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True, help_text="Název budovy nebo pracoviště")
+    # Jména pro hledání bez ohledu na velikost písmen a diakritiku (search_key)
+    first_name_search = SearchKeyField(max_length=100, derived_from='first_name')
+    last_name_search = SearchKeyField(max_length=100, derived_from='last_name')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['position'], name='employee_position_idx'),
+            models.Index(fields=['location'], name='employee_location_idx'),
+            models.Index(fields=['last_name', 'id'], name='employee_last_name_idx'),
+            # Hledání podle prefixu jména/e-mailu (rozsah nad search_key jmen a LOWER(email))
+            models.Index(fields=['last_name_search'], name='employee_last_name_search_idx'),
+            models.Index(fields=['first_name_search'], name='employee_first_name_search_idx'),
+            models.Index(Lower('email'), name='employee_email_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -33,6 +81,10 @@ class EmployeeReport(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='report_timestamp_idx'),
+            models.Index(fields=['employee', 'timestamp'], name='report_employee_timestamp_idx'),
+        ]
 
     def __str__(self):
         return f"Report for {self.employee.first_name} {self.employee.last_name} at {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
@@ -46,6 +98,17 @@ class AttendanceRecord(models.Model):
 
     class Meta:
         ordering = ['-check_in_time']
+        # Vzestupné indexy: SQLite i PostgreSQL je umí číst pozpátku pro ORDER BY ... DESC, id DESC
+        indexes = [
+            models.Index(fields=['check_in_time'], name='attendance_check_in_idx'),
+            models.Index(fields=['employee', 'check_in_time'], name='attendance_employee_in_idx'),
+            models.Index(fields=['date', 'check_in_time'], name='attendance_date_in_idx'),
+            models.Index(fields=['employee', 'check_in_time'], condition=models.Q(check_out_time__isnull=True), name='attendance_open_idx'),
+        ]
+        constraints = [
+            # Jeden příchod na zaměstnance a den; slouží zároveň jako index pro check-in/check-out.
+            models.UniqueConstraint(fields=['employee', 'date'], name='uniq_attendance_employee_date'),
+        ]
 
     def save(self, *args, **kwargs):
         if self.check_in_time and not self.date:
@@ -83,6 +146,18 @@ class Leave(models.Model):
     reason = models.TextField(blank=True, null=True)
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 
+    # Stavy, ve kterých žádost blokuje termín (překryv, kalendář nepřítomností)
+    BLOCKING_STATUSES = ('PENDING', 'APPROVED')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_date'], name='leave_start_idx'),
+            # Překryv u zaměstnance: employee = ? AND start_date <= ? AND end_date >= ? jen z indexu
+            models.Index(fields=['employee', 'start_date', 'end_date'], name='leave_employee_range_idx'),
+            # Nepřítomnosti v období: end_date >= od odřízne historii, start_date <= do budoucnost
+            models.Index(fields=['end_date', 'start_date'], name='leave_end_start_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.first_name} {self.employee.last_name} - {self.leave_type} ({self.status})"
 
@@ -99,8 +174,23 @@ class Leave(models.Model):
             
             if self.start_date < timezone.now().date():
                  raise ValidationError({'start_date': 'Žádost o dovolenou nemůže začínat v minulosti.'})
+
+            overlaps = Leave.overlapping(self.employee_id, self.start_date, self.end_date, self.pk)
+            if self.status in self.BLOCKING_STATUSES and overlaps.exists():
+                raise ValidationError({'start_date': 'Zaměstnanec už má v tomto termínu jinou žádost o volno.'})
                  
 
+    @classmethod
+    def overlapping(cls, employee_id, start_date, end_date, exclude_pk=None):
+        """Blocking leaves of the employee that share at least one day with [start_date, end_date]."""
+        leaves = cls.objects.filter(
+            employee_id=employee_id, start_date__lte=end_date, end_date__gte=start_date,
+            status__in=cls.BLOCKING_STATUSES,
+        )
+        if exclude_pk is not None:
+            leaves = leaves.exclude(pk=exclude_pk)
+        return leaves
+
     def save(self, *args, **kwargs):
         self.full_clean() 
         super().save(*args, **kwargs)
@@ -161,8 +251,88 @@ class Transaction(models.Model):
         verbose_name = "Transakce"
         verbose_name_plural = "Transakce"
         ordering = ['-transaction_date', '-created_at']
+        indexes = [
+            models.Index(fields=['transaction_date', 'created_at'], name='transaction_date_idx'),
+            models.Index(fields=['recorded_by', 'transaction_date', 'created_at'], name='transaction_recorder_date_idx'),
+            models.Index(fields=['type', 'transaction_date'], name='transaction_type_date_idx'),
+            # Kontrola duplicit při importu z banky (title, datum, částka, protistrana)
+            models.Index(fields=['title', 'transaction_date'], name='transaction_import_key_idx'),
+        ]
+
+class FinanceMonthlyRollup(models.Model):
+    """
+    Předpočítané měsíční součty transakcí, udržované inkrementálně signály
+    (viz app_system/rollups.py). Přepočet: manage.py rebuild_finance_rollup.
+    """
+    month = models.DateField(verbose_name="Měsíc (první den)")
+    # DO_NOTHING: při smazání kategorie se řádky sloučí do "bez kategorie" v pre_delete signálu
+    category = models.ForeignKey(TransactionCategory, on_delete=models.DO_NOTHING, null=True, blank=True, related_name='monthly_rollups', verbose_name="Kategorie")
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES, verbose_name="Typ transakce")
+    payment_method = models.CharField(max_length=20, choices=Transaction.PAYMENT_METHODS, verbose_name="Způsob platby")
+    total_amount = models.DecimalField(max_digits=17, decimal_places=2, default=0, verbose_name="Součet")
+    transaction_count = models.PositiveIntegerField(default=0, verbose_name="Počet transakcí")
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.type} {self.payment_method}: {self.total_amount} ({self.transaction_count})"
+
+    class Meta:
+        verbose_name = "Měsíční souhrn transakcí"
+        verbose_name_plural = "Měsíční souhrny transakcí"
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'category', 'type', 'payment_method'], condition=models.Q(category__isnull=False), name='uniq_finance_rollup_key'),
+            models.UniqueConstraint(fields=['month', 'type', 'payment_method'], condition=models.Q(category__isnull=True), name='uniq_finance_rollup_key_no_category'),
+        ]
+
+class TableVersion(models.Model):
+    """
+    Čítač změn tabulky pro validátory podmíněných GET (ETag / Last-Modified),
+    zvyšovaný signály při uložení a smazání (viz app_system/conditional.py).
+    """
+    table = models.CharField(max_length=100, unique=True, verbose_name="Tabulka")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Verze")
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name="Poslední změna")
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+    class Meta:
+        verbose_name = "Verze tabulky"
+        verbose_name_plural = "Verze tabulek"
+
+class DocumentQuerySet(models.QuerySet):
+    """Contract expiry computed in SQL (index document_type_end_date_idx) instead of per-row properties."""
+
+    def contracts(self):
+        return self.filter(document_type='contract', contract_end_date__isnull=False)
+
+    def expiring_within(self, days, today=None):
+        today = today or timezone.localdate()
+        return self.contracts().filter(contract_end_date__gte=today, contract_end_date__lte=today + timedelta(days=days))
+
+    def expired(self, today=None):
+        return self.contracts().filter(contract_end_date__lt=today or timezone.localdate())
+
+    def with_expiry(self, today=None):
+        """Annotates expiring_soon / expired, read by Document.is_expiring_soon / has_expired."""
+        today = today or timezone.localdate()
+        contract = models.Q(document_type='contract', contract_end_date__isnull=False)
+        soon = today + timedelta(days=Document.EXPIRY_WARNING_DAYS)
+        return self.annotate(
+            expiring_soon=models.ExpressionWrapper(
+                contract & models.Q(contract_end_date__gte=today, contract_end_date__lte=soon),
+                output_field=models.BooleanField(),
+            ),
+            expired=models.ExpressionWrapper(
+                contract & models.Q(contract_end_date__lt=today),
+                output_field=models.BooleanField(),
+            ),
+        )
+
 
 class Document(models.Model):
+    EXPIRY_WARNING_DAYS = 30
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='uploaded_documents')
@@ -174,22 +344,35 @@ class Document(models.Model):
 
     effective_date = models.DateField(null=True, blank=True, verbose_name="Datum platnosti od")
     contract_end_date = models.DateField(null=True,blank=True,verbose_name="Datum ukončení smlouvy")
+
+    objects = DocumentQuerySet.as_manager()
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['uploaded_at'], name='document_uploaded_idx'),
+            models.Index(fields=['employee', 'uploaded_at'], name='document_employee_uploaded_idx'),
+            models.Index(fields=['document_type', 'contract_end_date'], name='document_type_end_date_idx'),
+        ]
+
     def __str__(self):
         return self.title
     
+    # U objektů z DocumentQuerySet.with_expiry() se použije hodnota spočítaná v SQL
     @property
     def is_expiring_soon(self):
+        if 'expiring_soon' in self.__dict__:
+            return bool(self.expiring_soon)
         if self.document_type == 'contract' and self.contract_end_date:
-            from datetime import date, timedelta
-            return self.contract_end_date <= date.today() + timedelta(days=30) and self.contract_end_date >= date.today()
+            today = timezone.localdate()
+            return today <= self.contract_end_date <= today + timedelta(days=self.EXPIRY_WARNING_DAYS)
         return False
 
     @property
     def has_expired(self):
+        if 'expired' in self.__dict__:
+            return bool(self.expired)
         if self.document_type == 'contract' and self.contract_end_date:
-            from datetime import date
-            return self.contract_end_date < date.today()
+            return self.contract_end_date < timezone.localdate()
         return False
     
 class PerformanceReview(models.Model):
@@ -207,7 +390,27 @@ class PerformanceReview(models.Model):
     comments = models.TextField(blank=True)
     recommended_training = models.TextField(blank=True)
 
+    SCORE_FIELDS = ('quality_of_work', 'attendance', 'communication', 'teamwork', 'initiative')
+
+    # Průměr hodnocení počítaný databází při zápisu - lze podle něj řadit, filtrovat a agregovat přes index
+    score = models.GeneratedField(
+        expression=(F('quality_of_work') + F('attendance') + F('communication') + F('teamwork') + F('initiative')) / Value(5.0),
+        output_field=models.FloatField(),
+        db_persist=True,
+        verbose_name="Průměrné hodnocení",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='review_date_idx'),
+            models.Index(fields=['employee', 'date'], name='review_employee_date_idx'),
+            models.Index(fields=['score'], name='review_score_idx'),
+            models.Index(fields=['period', 'score'], name='review_period_score_idx'),
+        ]
+
     def average_score(self):
+        if 'score' in self.__dict__:
+            return round(self.score, 2)
         fields = [
             self.quality_of_work,
             self.attendance,
@@ -0,0 +1,214 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def get_keyset_ordering(queryset):
+    """
+    Ordering used for the keyset: explicit order_by() of the queryset, or the
+    model's Meta.ordering, always terminated by the primary key so that every
+    row has a unique position.
+    """
+    ordering = [o for o in (queryset.query.order_by or queryset.model._meta.ordering) if isinstance(o, str)]
+    if any(o == '?' for o in ordering):
+        raise ValueError('Náhodné řazení nelze stránkovat kurzorem.')
+
+    names = [o.lstrip('-') for o in ordering]
+    pk_name = queryset.model._meta.pk.name
+    if 'pk' not in names and pk_name not in names:
+        descending = bool(ordering) and ordering[0].startswith('-')
+        ordering.append('-pk' if descending else 'pk')
+    return tuple(ordering)
+
+
+def _resolve_field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    parts = name.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+def _row_value(row, name):
+    if isinstance(row, dict):
+        return row[name]
+    value = row
+    for part in name.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _keyset_filter(ordering, position, reverse=False):
+    """
+    Lexicographic "row comes after position" condition, e.g. for
+    (-transaction_date, -created_at, -pk):
+        date < d OR (date = d AND created < c) OR (date = d AND created = c AND pk < p)
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        descending = field.startswith('-') != reverse
+        condition |= equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _flip(ordering):
+    return tuple(o[1:] if o.startswith('-') else f'-{o}' for o in ordering)
+
+
+def iter_pages(queryset, page_size=500):
+    """
+    Opt-in "stream all pages" iterator for exports. Walks the whole queryset
+    page by page using the same keyset as the API, so every chunk costs
+    O(page_size) no matter how deep the export is.
+    """
+    ordering = get_keyset_ordering(queryset)
+    queryset = queryset.order_by(*ordering)
+    position = None
+    while True:
+        page_queryset = queryset
+        if position is not None:
+            page_queryset = page_queryset.filter(_keyset_filter(ordering, position))
+        page = list(page_queryset[:page_size])
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        position = [_row_value(page[-1], o.lstrip('-')) for o in ordering]
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination over the model's Meta.ordering (or the queryset's
+    explicit order_by()) with the primary key as tie-breaker.
+
+    Unlike DRF's CursorPagination the cursor stores the full key of the
+    boundary row, so duplicate dates never degrade into OFFSET scans.
+    The page size can be set per ViewSet via a `page_size` attribute.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 1000
+    invalid_cursor_message = 'Neplatný kurzor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request, view)
+        self.ordering = get_keyset_ordering(queryset)
+        self.model = queryset.model
+
+        position, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*(_flip(self.ordering) if reverse else self.ordering))
+        if position is not None:
+            queryset = queryset.filter(_keyset_filter(self.ordering, position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request, view=None):
+        page_size = getattr(view, 'page_size', None) or self.page_size
+        max_page_size = getattr(view, 'max_page_size', None) or self.max_page_size
+        requested = request.query_params.get(self.page_size_query_param)
+        if requested:
+            try:
+                page_size = int(requested)
+            except ValueError:
+                pass
+        return max(1, min(page_size, max_page_size))
+
+    def get_position(self, row):
+        return [_row_value(row, o.lstrip('-')) for o in self.ordering]
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [_encode_value(v) for v in position]}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                _resolve_field(self.model, o.lstrip('-')).to_python(v)
+                for o, v in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, FieldDoesNotExist, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _relation_path(model, attrs):
+    """
+    Splits a dotted serializer source into the part that traverses relations.
+    Returns (path, needs_prefetch) where path is a list of relation names and
+    needs_prefetch is True once a to-many relation is crossed.
+    """
+    path = []
+    needs_prefetch = False
+    for attr in attrs:
+        if model is None:
+            break
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        path.append(attr)
+        if field.many_to_many or field.one_to_many:
+            needs_prefetch = True
+        model = field.related_model
+    return path, needs_prefetch, model
+
+
+def _field_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, serializers.BaseSerializer):
+        return field, False
+    return None, False
+
+
+def _plan_for(serializer, model):
+    select, prefetch = set(), set()
+    meta = getattr(serializer, 'Meta', None)
+    select.update(getattr(meta, 'select_related', ()))
+    prefetch.update(getattr(meta, 'prefetch_related', ()))
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        if isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization():
+            continue
+        if isinstance(field, serializers.ManyRelatedField) and field.child_relation.use_pk_only_optimization():
+            continue
+
+        path, to_many, related_model = _relation_path(model, field.source.split('.'))
+        nested, many = _field_serializer(field)
+
+        if nested is not None and path and related_model is not None:
+            nested_select, nested_prefetch = _plan_for(nested, related_model)
+            prefix = '__'.join(path)
+            if to_many or many:
+                prefetch.add(prefix)
+                prefetch.update(f'{prefix}__{p}' for p in nested_select | nested_prefetch)
+            else:
+                select.add(prefix)
+                select.update(f'{prefix}__{p}' for p in nested_select)
+                prefetch.update(f'{prefix}__{p}' for p in nested_prefetch)
+            continue
+
+        if path:
+            (prefetch if to_many else select).add('__'.join(path))
+
+    return select, prefetch
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    """
+    Derives the select_related/prefetch_related plan needed to serialize a
+    list without per-row queries: every dotted source crossing a relation
+    (e.g. 'department.name', 'employee.__str__') and every nested serializer.
+    Relations read only inside SerializerMethodFields can be declared as
+    Meta.select_related / Meta.prefetch_related on the serializer.
+    """
+    serializer = serializer_class()
+    select, prefetch = _plan_for(serializer, serializer.Meta.model)
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+class QueryPlanMixin:
+    """
+    Applies the serializer's query plan (plus any `select_related` /
+    `prefetch_related` declared on the ViewSet) to get_queryset().
+    """
+    select_related = ()
+    prefetch_related = ()
+
+    def get_query_plan(self):
+        select, prefetch = get_query_plan(self.get_serializer_class())
+        return (
+            tuple(dict.fromkeys(select + tuple(self.select_related))),
+            tuple(dict.fromkeys(prefetch + tuple(self.prefetch_related))),
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select, prefetch = self.get_query_plan()
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,126 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .db_router import primary_reads
+from .roles import user_roles
+
+LOCK_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+
+
+def _version_key(model):
+    return f'response_cache:version:{model._meta.label_lower}'
+
+
+def invalidate_responses(*models):
+    """Zneplatní odpovědi závislé na modelech - až po commitu, aby se znovu nenačetla stará data."""
+    def bump():
+        for model in models:
+            try:
+                cache.incr(_version_key(model))
+            except ValueError:
+                cache.set(_version_key(model), 1, None)
+    transaction.on_commit(bump)
+
+
+def _vary_part(request, vary):
+    if vary is None:
+        return ''
+    roles = user_roles(request)
+    if vary == 'user':
+        return f'user:{roles.user_id}'
+    fingerprint = '|'.join([
+        str(roles.is_staff), str(roles.is_superuser),
+        ','.join(roles.groups), ','.join(sorted(roles.permissions)),
+    ])
+    return 'roles:' + hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+def response_cache_key(request, name, models, vary):
+    """
+    Key of a cached response: endpoint name, URL, the versions of every
+    table the response reads and the vary part ('user', 'roles' or None).
+    """
+    version_keys = [_version_key(model) for model in models]
+    versions = cache.get_many(version_keys)
+    parts = [name, request.build_absolute_uri(), _vary_part(request, vary)]
+    parts += [f'{key}={versions.get(key, 0)}' for key in version_keys]
+    return 'response_cache:' + hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def cached_response(key, timeout, compute):
+    """
+    Returns a Response for `key`, calling compute() on a miss. Only one
+    caller recomputes a missing key (lock via cache.add); the others wait for
+    its result instead of all hitting the database at once (best effort
+    with FileBasedCache, whose add() is not atomic). Only 200 responses are
+    cached. compute() reads from the primary: the entry is
+    shared under the current table versions and must not hold data from a
+    lagging replica.
+    """
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            if cache.get(lock_key) is None:
+                # Zámek mohl zmizet mezi oběma čteními až po uložení výsledku
+                data = cache.get(key)
+                if data is not None:
+                    return Response(data)
+                break  # přepočet selhal nebo neskončil 200 - spočítáme sami
+        with primary_reads():
+            return compute()
+
+    try:
+        with primary_reads():
+            response = compute()
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout)
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+def cache_response(timeout, *models, vary=None):
+    """Cache odpovědi funkčního view (pod @api_view), např. @cache_response(60, Employee, Department)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            key = response_cache_key(request, view.__name__, models, vary)
+            return cached_response(key, timeout, lambda: view(request, *args, **kwargs))
+        return wrapped
+    return decorator
+
+
+class CachedListMixin:
+    """
+    Caches list() responses for `list_cache_timeout` seconds. The cache is
+    invalidated whenever the ViewSet's model or one of `list_cache_models`
+    changes; `list_cache_vary` is 'roles', 'user' (scoped querysets) or None.
+    """
+    list_cache_timeout = None
+    list_cache_models = ()
+    list_cache_vary = 'roles'
+
+    def list(self, request, *args, **kwargs):
+        compute = super().list
+        if not self.list_cache_timeout or request.method != 'GET':
+            return compute(request, *args, **kwargs)
+        models = (self.queryset.model, *self.list_cache_models)
+        key = response_cache_key(request, f'{type(self).__name__}.list', models, self.list_cache_vary)
+        return cached_response(key, self.list_cache_timeout, lambda: compute(request, *args, **kwargs))
@@ -0,0 +1,60 @@
+from django.db.models import Avg, Count, F, Max, Min
+from django.db.models.functions import Floor, TruncMonth
+
+from .models import PerformanceReview
+
+# Skupiny analytiky hodnocení: klíč -> (sloupce, pojmenované výrazy) pro GROUP BY
+REVIEW_ANALYTICS_GROUPS = {
+    'employee': (('employee_id',), {'first_name': F('employee__first_name'), 'last_name': F('employee__last_name')}),
+    'department': ((), {'department_id': F('employee__department_id'), 'department_name': F('employee__department__name')}),
+    'period': (('period',), {}),
+    'month': ((), {'month': TruncMonth('date')}),
+}
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def review_analytics(queryset, group_by):
+    """
+    Review statistics from three grouped queries over the stored `score`
+    column: averages (overall and per criterion), min and max per group,
+    the distribution of scores rounded down to whole points, and the
+    monthly trend. Groups are ordered from the best average down.
+    """
+    queryset = queryset.select_related(None).prefetch_related(None).order_by()
+    fields, expressions = REVIEW_ANALYTICS_GROUPS[group_by]
+    criteria = {f'average_{name}': Avg(name) for name in PerformanceReview.SCORE_FIELDS}
+
+    groups = list(
+        queryset.values(*fields, **expressions)
+        .annotate(reviews=Count('pk'), average_score=Avg('score'), min_score=Min('score'), max_score=Max('score'), **criteria)
+        .order_by(F('average_score').desc(nulls_last=True), *fields, *expressions)
+    )
+    total = sum(row['reviews'] for row in groups)
+    # Vážený průměr skupin = průměr všech hodnocení, bez dalšího dotazu
+    average = sum(row['average_score'] * row['reviews'] for row in groups) / total if total else None
+    for row in groups:
+        for name in ('average_score', *criteria):
+            row[name] = _round(row[name])
+
+    distribution = list(
+        queryset.annotate(points=Floor('score')).values('points')
+        .annotate(reviews=Count('pk'))
+        .order_by('points')
+    )
+    trend = [
+        {**row, 'average_score': _round(row['average_score'])}
+        for row in queryset.values(month=TruncMonth('date'))
+        .annotate(reviews=Count('pk'), average_score=Avg('score'))
+        .order_by('month')
+    ]
+
+    return {
+        'reviews': total,
+        'average_score': _round(average),
+        'results': groups,
+        'distribution': [{'points': int(row['points']), 'reviews': row['reviews']} for row in distribution],
+        'trend': trend,
+    }
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .models import TableVersion
+
+CACHE_TIMEOUT = 60 * 60
+
+User = get_user_model()
+
+
+class UserRoles:
+    """
+    Snapshot of a user's flags, groups and permissions. Computed once and
+    then served from the cache until the users table version changes (any
+    change of a user, group membership or permissions).
+    """
+
+    def __init__(self, user_id, is_active, is_staff, is_superuser, groups, user_permissions, group_permissions):
+        self.user_id = user_id
+        self.is_active = is_active
+        self.is_staff = is_staff
+        self.is_superuser = is_superuser
+        self.groups = tuple(groups)
+        self.user_permissions = frozenset(user_permissions)
+        self.group_permissions = frozenset(group_permissions)
+        self._group_set = frozenset(self.groups)
+
+    @classmethod
+    def for_user(cls, user):
+        if not user.is_authenticated:
+            return cls(None, False, False, False, (), (), ())
+        return cls(
+            user.pk, user.is_active, user.is_staff, user.is_superuser,
+            user.groups.values_list('name', flat=True),
+            user.get_user_permissions(), user.get_group_permissions(),
+        )
+
+    @property
+    def permissions(self):
+        return self.user_permissions | self.group_permissions
+
+    def in_group(self, *names):
+        return any(name in self._group_set for name in names)
+
+    def has_perm(self, perm):
+        # Stejná logika jako User.has_perm s ModelBackendem
+        if self.is_active and self.is_superuser:
+            return True
+        return perm in self.user_permissions or perm in self.group_permissions
+
+
+def _roles_version():
+    # Verze tabulky uživatelů v DB (TableVersion), zvyšují ji signály při každé změně uživatele,
+    # skupin i oprávnění - platí pro všechny procesy bez ohledu na backend cache
+    return TableVersion.objects.filter(table=User._meta.label_lower).values_list('version', flat=True).first() or 0
+
+
+def _cache_key(user_id, version):
+    return f'user_roles:{version}:{user_id}'
+
+
+def get_user_roles(user):
+    if not user.is_authenticated:
+        return UserRoles.for_user(user)
+
+    key = _cache_key(user.pk, _roles_version())
+    roles = cache.get(key)
+    if roles is None:
+        roles = UserRoles.for_user(user)
+        cache.set(key, roles, CACHE_TIMEOUT)
+    return roles
+
+
+def user_roles(request):
+    """Role a oprávnění přihlášeného uživatele; v rámci požadavku se počítají jen jednou."""
+    roles = getattr(request, '_user_roles', None)
+    if roles is None or roles.user_id != request.user.pk:
+        roles = request._user_roles = get_user_roles(request.user)
+    return roles
+
@@ -0,0 +1,136 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import FinanceMonthlyRollup, Transaction
+
+ROLLUP_FIELDS = ('month', 'category_id', 'type', 'payment_method')
+
+
+_date_field = Transaction._meta.get_field('transaction_date')
+_amount_field = Transaction._meta.get_field('amount')
+
+
+def rollup_key(txn):
+    # to_python: instance může mít ještě hodnoty tak, jak byly předány do create() (např. řetězce)
+    return (_date_field.to_python(txn.transaction_date).replace(day=1), txn.category_id, txn.type, txn.payment_method)
+
+
+def rollup_amount(txn):
+    return _amount_field.to_python(txn.amount)
+
+
+def apply_delta(key, amount, count):
+    """
+    Adds amount/count to one rollup row (creating it if needed) with an
+    atomic UPDATE ... SET total = total + x. Rows that drop to zero
+    transactions are removed so they do not show up in summaries.
+    """
+    if not amount and not count:
+        return
+    lookup = dict(zip(ROLLUP_FIELDS, key))
+    changes = {'total_amount': F('total_amount') + amount, 'transaction_count': F('transaction_count') + count}
+
+    with transaction.atomic():
+        rows = FinanceMonthlyRollup.objects.filter(**lookup)
+        if not rows.update(**changes):
+            try:
+                with transaction.atomic():
+                    FinanceMonthlyRollup.objects.create(**lookup, total_amount=amount, transaction_count=count)
+            except IntegrityError:
+                rows.update(**changes)
+        if count < 0:
+            rows.filter(transaction_count__lte=0).delete()
+
+
+def record_transactions(transactions, sign=1):
+    """
+    Bulk variant for code paths that bypass signals (bulk_create,
+    bulk_update). QuerySet.delete() still sends pre/post_delete per row and
+    needs no call. The affected rollup rows are loaded (and locked) with one
+    query and written back with bulk_update/bulk_create instead of one
+    UPDATE per key.
+    """
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for txn in transactions:
+        delta = deltas[rollup_key(txn)]
+        delta[0] += rollup_amount(txn)
+        delta[1] += 1
+    if len(deltas) <= 1:
+        for key, (amount, count) in deltas.items():
+            apply_delta(key, sign * amount, sign * count)
+        return
+
+    with transaction.atomic():
+        months = {key[0] for key in deltas}
+        rows = {
+            tuple(getattr(row, field) for field in ROLLUP_FIELDS): row
+            for row in FinanceMonthlyRollup.objects.select_for_update().filter(month__in=months)
+        }
+        changed, new = [], []
+        for key, (amount, count) in deltas.items():
+            row = rows.get(key)
+            if row is None:
+                new.append(FinanceMonthlyRollup(**dict(zip(ROLLUP_FIELDS, key)), total_amount=sign * amount, transaction_count=sign * count))
+            else:
+                row.total_amount += sign * amount
+                row.transaction_count += sign * count
+                changed.append(row)
+
+        FinanceMonthlyRollup.objects.bulk_update(changed, ['total_amount', 'transaction_count'], batch_size=500)
+        try:
+            with transaction.atomic():
+                FinanceMonthlyRollup.objects.bulk_create(new, batch_size=500)
+        except IntegrityError:
+            # Souběžně vznikl některý z nových řádků - ty projdou po jednom přes UPDATE
+            for row in new:
+                apply_delta(tuple(getattr(row, field) for field in ROLLUP_FIELDS), row.total_amount, row.transaction_count)
+        if sign < 0:
+            FinanceMonthlyRollup.objects.filter(pk__in=[row.pk for row in changed if row.transaction_count <= 0]).delete()
+
+
+def merge_category_into_uncategorized(category):
+    """Transactions of a deleted category become uncategorized (SET_NULL); move their rollup rows too."""
+    with transaction.atomic():
+        for row in FinanceMonthlyRollup.objects.filter(category=category):
+            row.delete()
+            apply_delta((row.month, None, row.type, row.payment_method), row.total_amount, row.transaction_count)
+
+
+def expected_rollup():
+    rows = (
+        Transaction.objects.order_by()
+        .annotate(month=TruncMonth('transaction_date'))
+        .values(*ROLLUP_FIELDS)
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    return {tuple(row[f] for f in ROLLUP_FIELDS): (row['total'], row['count']) for row in rows}
+
+
+def stored_rollup():
+    rows = FinanceMonthlyRollup.objects.values_list(*ROLLUP_FIELDS, 'total_amount', 'transaction_count')
+    return {tuple(row[:4]): (row[4], row[5]) for row in rows}
+
+
+def rebuild_rollup():
+    expected = expected_rollup()
+    with transaction.atomic():
+        FinanceMonthlyRollup.objects.all().delete()
+        FinanceMonthlyRollup.objects.bulk_create(
+            FinanceMonthlyRollup(**dict(zip(ROLLUP_FIELDS, key)), total_amount=total, transaction_count=count)
+            for key, (total, count) in expected.items()
+        )
+    return len(expected)
+
+
+def verify_rollup():
+    """Returns a list of (key, stored, expected) for every row that differs."""
+    expected, stored = expected_rollup(), stored_rollup()
+    return [
+        (key, stored.get(key), expected.get(key))
+        for key in sorted(set(expected) | set(stored), key=str)
+        if stored.get(key) != expected.get(key)
+    ]
@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from .models import Employee, Department, PerformanceReview, EmployeeReport, AttendanceRecord, Document, Leave, Transaction, TransactionCategory
 from django.utils import timezone
+from datetime import time
 from django.contrib.auth import get_user_model
+from .fast_read import ValuesSerializer, Computed, Related
+from .bulk import BulkListSerializer
+from .roles import user_roles
+from .attendance import MAX_ANALYTICS_DAYS
+from .leaves import MAX_AVAILABILITY_DAYS
 
 
 User = get_user_model()
@@ -11,14 +17,16 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Employee
-        fields = '__all__'
+        exclude = ['first_name_search', 'last_name_search']
+        list_serializer_class = BulkListSerializer
 
 class DepartmentSerializer(serializers.ModelSerializer):
-    employees = EmployeeSerializer(many=True, read_only=True) 
+    # Anotováno v DepartmentViewSet.get_queryset; zaměstnanci jsou jen v detailu (stránkovaně).
+    employee_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Department
-        fields = ['id', 'name', 'description', 'employees']
+        fields = ['id', 'name', 'description', 'employee_count']
 
 class EmployeeReportSerializer(serializers.ModelSerializer):
     employee_full_name = serializers.CharField(source='employee.__str__', read_only=True) 
@@ -34,6 +42,101 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         model = AttendanceRecord
         fields = '__all__'
 
+    def validate(self, data):
+        # date je jen pro čtení a dopočítává se, proto DRF unikátnost (employee, date) samo nehlídá
+        if self.instance is None:
+            data['date'] = timezone.localdate(data['check_in_time'])
+            if AttendanceRecord.objects.filter(employee=data['employee'], date=data['date']).exists():
+                raise serializers.ValidationError({'check_in_time': 'Zaměstnanec už má pro tento den záznam docházky.'})
+        return data
+
+class PunchEventSerializer(serializers.Serializer):
+    DIRECTION_CHOICES = [('in', 'Příchod'), ('out', 'Odchod')]
+
+    employee_id = serializers.IntegerField(min_value=1)
+    timestamp = serializers.DateTimeField()
+    direction = serializers.ChoiceField(choices=DIRECTION_CHOICES)
+
+class AttendanceFilterSerializer(serializers.Serializer):
+    ORDERING_CHOICES = ['check_in_time', '-check_in_time', 'date', '-date']
+
+    employee_id = serializers.IntegerField(min_value=1, required=False)
+    department = serializers.IntegerField(min_value=1, required=False)
+    date = serializers.DateField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    open = serializers.BooleanField(required=False, allow_null=True, default=None)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, required=False)
+
+    def validate(self, data):
+        if 'date_from' in data and 'date_to' in data and data['date_from'] > data['date_to']:
+            raise serializers.ValidationError({'date_to': 'Datum "do" nesmí být před datem "od".'})
+        return data
+
+class AttendanceAnalyticsSerializer(AttendanceFilterSerializer):
+    GROUP_BY_CHOICES = ['employee', 'department', 'week', 'month']
+
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, default='employee')
+    workday_hours = serializers.DecimalField(max_digits=4, decimal_places=2, min_value=1, max_value=24, default=8)
+    late_after = serializers.TimeField(default=time(9, 0))
+
+    def validate(self, data):
+        data = super().validate(data)
+        if (data['date_to'] - data['date_from']).days >= MAX_ANALYTICS_DAYS:
+            raise serializers.ValidationError({'date_to': f'Rozsah může mít nejvýše {MAX_ANALYTICS_DAYS} dní.'})
+        return data
+
+class EmployeeFilterSerializer(serializers.Serializer):
+    ORDERING_CHOICES = ['id', '-id', 'last_name', '-last_name', 'position', '-position']
+
+    search = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    department = serializers.IntegerField(min_value=1, required=False)
+    position = serializers.CharField(required=False, max_length=100)
+    location = serializers.CharField(required=False, max_length=255)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, required=False)
+
+class DocumentFilterSerializer(serializers.Serializer):
+    document_type = serializers.ChoiceField(choices=['contract', 'policy', 'training'], required=False)
+    expiring_within = serializers.IntegerField(min_value=0, max_value=3650, required=False)
+    expired = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+class ReviewFilterSerializer(serializers.Serializer):
+    ORDERING_CHOICES = ['date', '-date', 'score', '-score']
+
+    employee_id = serializers.IntegerField(min_value=1, required=False)
+    department = serializers.IntegerField(min_value=1, required=False)
+    period = serializers.CharField(required=False, max_length=20)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    min_score = serializers.FloatField(min_value=0, required=False)
+    max_score = serializers.FloatField(min_value=0, required=False)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, required=False)
+
+    def validate(self, data):
+        if 'date_from' in data and 'date_to' in data and data['date_from'] > data['date_to']:
+            raise serializers.ValidationError({'date_to': 'Datum "do" nesmí být před datem "od".'})
+        if 'min_score' in data and 'max_score' in data and data['min_score'] > data['max_score']:
+            raise serializers.ValidationError({'max_score': 'Maximum nesmí být menší než minimum.'})
+        return data
+
+class ReviewAnalyticsSerializer(ReviewFilterSerializer):
+    group_by = serializers.ChoiceField(choices=['employee', 'department', 'period', 'month'], default='employee')
+
+class LeaveAvailabilitySerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    department = serializers.IntegerField(min_value=1, required=False)
+    include_pending = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if data['date_from'] > data['date_to']:
+            raise serializers.ValidationError({'date_to': 'Datum "do" nesmí být před datem "od".'})
+        if (data['date_to'] - data['date_from']).days >= MAX_AVAILABILITY_DAYS:
+            raise serializers.ValidationError({'date_to': f'Rozsah může mít nejvýše {MAX_AVAILABILITY_DAYS} dní.'})
+        return data
+
 class LeaveSerializer(serializers.ModelSerializer):
     employee_full_name = serializers.CharField(source='employee.__str__', read_only=True)
     approved_by_username = serializers.CharField(source='approved_by.username', read_only=True)
@@ -42,6 +145,7 @@ class LeaveSerializer(serializers.ModelSerializer):
         model = Leave
         fields = ['id', 'employee', 'employee_full_name', 'leave_type', 'start_date', 'end_date', 'status', 'reason', 'approved_by', 'approved_by_username']
         read_only_fields = ['status', 'approved_by', 'approved_by_detail']
+        list_serializer_class = BulkListSerializer
 
 
     def validate_reason(self, value):
@@ -51,15 +155,24 @@ class LeaveSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, data):
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
+        # U částečné úpravy se chybějící hodnoty doplní z ukládané žádosti
+        instance = self.instance
+        employee = data.get('employee', instance.employee if instance else None)
+        start_date = data.get('start_date', instance.start_date if instance else None)
+        end_date = data.get('end_date', instance.end_date if instance else None)
+
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError("Datum 'Od' nemůže být po datu 'Do'.")
+        if 'start_date' in data and data['start_date'] < timezone.now().date():
+            raise serializers.ValidationError({'start_date': 'Žádost o dovolenou nemůže začínat v minulosti.'})
 
-        if start_date and end_date:
-            if start_date > end_date:
-                raise serializers.ValidationError("Datum 'Od' nemůže být po datu 'Do'.")
-            
-            if start_date < timezone.now().date():
-                raise serializers.ValidationError({'start_date': 'Žádost o dovolenou nemůže začínat v minulosti.'})
+        # Hromadná úprava kontroluje překryvy za celou dávku najednou (LeaveViewSet.validate_bulk)
+        if isinstance(self.parent, BulkListSerializer):
+            return data
+        blocking = instance is None or instance.status in Leave.BLOCKING_STATUSES
+        if employee and start_date and end_date and blocking:
+            if Leave.overlapping(employee.pk, start_date, end_date, instance.pk if instance else None).exists():
+                raise serializers.ValidationError({'start_date': 'Zaměstnanec už má v tomto termínu jinou žádost o volno.'})
 
         return data
     
@@ -70,12 +183,41 @@ class UserAuthSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'permissions', 'groups']
+        prefetch_related = ['groups__permissions__content_type', 'user_permissions__content_type']
 
     def get_permissions(self, obj):
-        return list(obj.get_user_permissions()) + list(obj.get_group_permissions())
+        # Při serializaci seznamu (např. recorded_by_details u transakcí) se opakují stejní uživatelé.
+        # Seřazeno, aby výstup nezávisel na zdroji (snímek rolí, prefetch, ModelBackend).
+        cache = self.__dict__.setdefault('_permissions_by_user', {})
+        if obj.pk in cache:
+            return cache[obj.pk]
+
+        roles = self._request_roles(obj)
+        prefetched = getattr(obj, '_prefetched_objects_cache', {})
+        if roles is not None:
+            permissions = sorted(roles.user_permissions) + sorted(roles.group_permissions)
+        elif 'user_permissions' in prefetched and 'groups' in prefetched and obj.is_active and not obj.is_superuser:
+            # Stejný výsledek jako ModelBackend, ale z přednačtených dat bez dotazu na každý řádek.
+            user_perms = {f"{p.content_type.app_label}.{p.codename}" for p in obj.user_permissions.all()}
+            group_perms = {f"{p.content_type.app_label}.{p.codename}" for g in obj.groups.all() for p in g.permissions.all()}
+            permissions = sorted(user_perms) + sorted(group_perms)
+        else:
+            permissions = sorted(obj.get_user_permissions()) + sorted(obj.get_group_permissions())
+        cache[obj.pk] = permissions
+        return permissions
 
     def get_groups(self, obj):
+        roles = self._request_roles(obj)
+        if roles is not None:
+            return list(roles.groups)
         return [group.name for group in obj.groups.all()]
+
+    def _request_roles(self, obj):
+        # Pro přihlášeného uživatele (např. /api/auth/user/) se použije snímek rolí z cache.
+        request = self.context.get('request')
+        if request is not None and obj.pk is not None and request.user.pk == obj.pk:
+            return user_roles(request)
+        return None
     
 class TransactionCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -91,6 +233,7 @@ class TransactionSerializer(serializers.ModelSerializer):
         model = Transaction
         fields = '__all__' 
         read_only_fields = ['created_at', 'updated_at', 'recorded_by'] 
+        list_serializer_class = BulkListSerializer
 
     def create(self, validated_data):
         if 'request' in self.context and hasattr(self.context['request'], 'user'):
@@ -104,6 +247,8 @@ class TransactionSerializer(serializers.ModelSerializer):
 
 class DocumentSerializer(serializers.ModelSerializer):
     uploaded_by = serializers.CharField(source='uploaded_by.username', read_only=True)
+    is_expiring_soon = serializers.BooleanField(read_only=True)
+    has_expired = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Document
@@ -121,4 +266,26 @@ class PerformanceReviewSerializer(serializers.ModelSerializer):
     def get_average_score(self, obj):
         return obj.average_score()
 
-    
\ No newline at end of file
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}"
+
+
+# Rychlé čtení z .values() pro objemné seznamy - výstup shodný s ModelSerializery výše.
+class EmployeeReportValuesSerializer(ValuesSerializer):
+    serializer_class = EmployeeReportSerializer
+    fields = {
+        'employee_full_name': Computed(['employee__first_name', 'employee__last_name'], _full_name),
+    }
+
+class AttendanceRecordValuesSerializer(ValuesSerializer):
+    serializer_class = AttendanceRecordSerializer
+    fields = {
+        'employee_full_name': Computed(['employee__first_name', 'employee__last_name'], _full_name),
+    }
+
+class TransactionValuesSerializer(ValuesSerializer):
+    serializer_class = TransactionSerializer
+    fields = {
+        'recorded_by_details': Related('recorded_by', UserAuthSerializer),
+    }
@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .conditional import bump_table_version
+from .models import (
+    AttendanceRecord, Department, Document, Employee, EmployeeReport, Leave, PerformanceReview, Transaction,
+    TransactionCategory,
+)
+from .rollups import apply_delta, merge_category_into_uncategorized, rollup_amount, rollup_key
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk:
+        previous = Transaction.objects.filter(pk=instance.pk).only('transaction_date', 'category', 'type', 'payment_method', 'amount').first()
+        if previous is not None:
+            instance._rollup_previous = (rollup_key(previous), rollup_amount(previous))
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_save(sender, instance, **kwargs):
+    current = (rollup_key(instance), rollup_amount(instance))
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous == current:
+        return
+    if previous is not None:
+        apply_delta(previous[0], -previous[1], -1)
+    apply_delta(current[0], current[1], 1)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    apply_delta(rollup_key(instance), -rollup_amount(instance), -1)
+
+
+@receiver(pre_delete, sender=TransactionCategory)
+def merge_rollup_of_deleted_category(sender, instance, **kwargs):
+    merge_category_into_uncategorized(instance)
+
+
+# Změny uživatelů, skupin a oprávnění zvyšují verzi tabulky uživatelů; na ní
+# závisí i cache snímků rolí (app_system/roles.py).
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def roles_m2m_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_table_version(User)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_table_version(User)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def groups_or_permissions_changed(sender, **kwargs):
+    bump_table_version(User)
+
+
+# Verze tabulek pro ETag / Last-Modified (app_system/conditional.py)
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=EmployeeReport)
+@receiver([post_save, post_delete], sender=AttendanceRecord)
+@receiver([post_save, post_delete], sender=Leave)
+@receiver([post_save, post_delete], sender=TransactionCategory)
+@receiver([post_save, post_delete], sender=Transaction)
+@receiver([post_save, post_delete], sender=Document)
+@receiver([post_save, post_delete], sender=PerformanceReview)
+def bump_version_on_change(sender, **kwargs):
+    bump_table_version(sender)
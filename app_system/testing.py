@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountAssertionsMixin:
+    """
+    TestCase mixin for catching N+1 regressions on list endpoints.
+
+        class TransactionApiTests(QueryCountAssertionsMixin, APITestCase):
+            def test_list_is_constant(self):
+                self.assertConstantQueries('/api/transactions/', lambda n: make_transactions(n))
+    """
+
+    def count_queries(self, url, client=None):
+        client = client or self.client
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', response.content))
+        return len(context.captured_queries), context.captured_queries
+
+    def assertConstantQueries(self, url, create_rows, sizes=(1, 10), client=None):
+        """
+        Calls create_rows(n) for every size (cumulatively), requests `url` after
+        each batch and fails if the number of queries changes with row count.
+        """
+        counts = []
+        for index, size in enumerate(sizes):
+            create_rows(size)
+            if index == 0:
+                # Zahřívací požadavek - naplní cache oprávnění na objektu uživatele.
+                self.count_queries(url, client)
+            # Bez cache (snímky rolí, cache odpovědí) - jinak by se měřil zásah do cache, ne dotazy seznamu.
+            cache.clear()
+            count, queries = self.count_queries(url, client)
+            counts.append(count)
+            if count != counts[0]:
+                sql = '\n'.join(q['sql'] for q in queries)
+                self.fail(f'{url}: počet dotazů roste s počtem řádků {counts} pro {list(sizes)}\n{sql}')
+        return counts[0]
@@ -1,3 +1,1186 @@
-from django.test import TestCase
+import json
+import logging
+import re
+import tempfile
+import threading
+import time
+import warnings
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache, caches
+from django.db import connection, connections, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from backend.urls import router
+
+from . import db_router
+from .dashboard import finance_month_to_date
+from .db_router import REPLICA_ALIAS, STICKY_COOKIE
+from .metrics import registry
+from .models import (
+    AttendanceRecord, Department, Document, Employee, Leave, PerformanceReview, TableVersion, Transaction, TransactionCategory,
+)
+from .pagination import get_keyset_ordering, iter_pages
+from .response_cache import cached_response, response_cache_key
+from .roles import get_user_roles
+from .rollups import expected_rollup, stored_rollup, verify_rollup
+from .testing import QueryCountAssertionsMixin
+from .views import AttendanceRecordViewSet, TransactionViewSet, prefix_range
+
+
+def make_employee(department=None, **fields):
+    number = Employee.objects.count()
+    defaults = {'first_name': f'Jan{number}', 'last_name': 'Novák', 'email': f'jan{number}@example.cz', 'position': 'Analytik'}
+    return Employee.objects.create(department=department, **{**defaults, **fields})
+
+
+class ApiTestCase(APITestCase):
+    def setUp(self):
+        # Snímky rolí jsou klíčované verzí z DB, která se po každém testu vrátí zpět
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.cz', 'heslo')
+        self.client.force_authenticate(self.admin)
+        self.department = Department.objects.create(name='Vývoj')
+
+
+# "SCAN tabulka" bez indexu = full scan; "USE TEMP B-TREE" = řazení mimo index.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)(?!\w| USING)')
+TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+
+# Filtry seznamů, jejichž plán se kontroluje navíc k seznamu bez parametrů.
+FILTERED_QUERIES = {
+    'employees': ['search=nov', 'department=1', 'position=Developer', 'location=Praha', 'ordering=last_name'],
+    'attendance-history': [
+        'employee_id=1', 'date_from=2024-01-01&date_to=2024-01-31', 'open=true',
+        'employee_id=1&date_from=2024-01-01&date_to=2024-01-31',
+    ],
+    'performance-reviews': ['ordering=-score', 'period=2024-Q1&ordering=-score', 'min_score=4'],
+}
+
+
+class QueryPlanTests(APITestCase):
+    """EXPLAIN of the first list page of every router ViewSet must not scan a whole table."""
+
+    def setUp(self):
+        self.personas = {
+            'staff': User.objects.create_superuser('plan_staff', 'staff@example.cz', 'heslo'),
+            'user': User.objects.create_user('plan_user', 'user@example.cz', 'heslo'),
+        }
+
+    def plan_problems(self, viewset, prefix, query, user):
+        request = Request(APIRequestFactory().get(f'/api/{prefix}/?{query}'))
+        request.user = user
+        view = viewset(request=request, format_kwarg=None, action='list', kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        if queryset.query.is_empty():
+            return [], ''
+
+        ordering = get_keyset_ordering(queryset)
+        page_size = getattr(view, 'page_size', None) or 50
+        plan = queryset.order_by(*ordering)[:page_size + 1].explain()
+
+        problems = []
+        for table in FULL_SCAN.findall(plan):
+            # Průchod podle rowid je u řazení jen podle pk v pořádku (stránka = LIMIT nad primárním klíčem).
+            if table == queryset.model._meta.db_table and ordering in (('pk',), ('-pk',)):
+                continue
+            problems.append(f'full scan {table}')
+        # U filtrů stačí, že se řadí jen vyhledané řádky (rozsah přes index), ne celá tabulka.
+        if TEMP_SORT.search(plan) and not query:
+            problems.append('řazení mimo index')
+        return problems, plan
+
+    def test_list_queries_use_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Kontrola plánů zatím umí jen výstup EXPLAIN QUERY PLAN ze SQLite.')
+        for prefix, viewset, basename in router.registry:
+            for query in ['', *FILTERED_QUERIES.get(prefix, [])]:
+                for persona, user in self.personas.items():
+                    with self.subTest(list=f'{prefix}?{query}', persona=persona):
+                        problems, plan = self.plan_problems(viewset, prefix, query, user)
+                        self.assertEqual(problems, [], plan)
+
+
+class ListQueryCountTests(QueryCountAssertionsMixin, ApiTestCase):
+    """List endpoints run the same number of queries for 1 and 11 rows (no N+1)."""
+
+    def make_employees(self, n):
+        # Každý řádek s jiným zaměstnancem i oddělením - N+1 by se projevilo na každé vazbě
+        return [make_employee(Department.objects.create(name=f'Oddělení {Department.objects.count()}')) for _ in range(n)]
+
+    def make_users(self, n):
+        start = User.objects.count()
+        return [User.objects.create_user(f'user{start + i}') for i in range(n)]
+
+    def test_employees(self):
+        self.assertConstantQueries('/api/employees/', self.make_employees)
+
+    def test_attendance(self):
+        def create_rows(n):
+            for employee in self.make_employees(n):
+                AttendanceRecord.objects.create(employee=employee, date=timezone.localdate(), check_in_time=timezone.now())
+        self.assertConstantQueries('/api/attendance-history/', create_rows)
+
+    def test_leaves(self):
+        def create_rows(n):
+            start = timezone.localdate() + timedelta(days=10)
+            for employee, user in zip(self.make_employees(n), self.make_users(n)):
+                Leave.objects.create(employee=employee, leave_type='VACATION', start_date=start, end_date=start, status='APPROVED', approved_by=user)
+        self.assertConstantQueries('/api/leaves/', create_rows)
+
+    def test_transactions(self):
+        def create_rows(n):
+            for user in self.make_users(n):
+                category = TransactionCategory.objects.create(name=f'Kategorie {user.pk}', type='EXPENSE')
+                Transaction.objects.create(title='Nákup', amount='100.00', type='EXPENSE', category=category,
+                                           transaction_date=timezone.localdate(), recorded_by=user)
+        self.assertConstantQueries('/api/transactions/', create_rows)
+
+    def test_performance_reviews(self):
+        def create_rows(n):
+            for employee, user in zip(self.make_employees(n), self.make_users(n)):
+                PerformanceReview.objects.create(employee=employee, reviewer=user, period='2026-Q1', **{name: 3 for name in PerformanceReview.SCORE_FIELDS})
+        self.assertConstantQueries('/api/performance-reviews/', create_rows)
+
+
+class FastReadTests(ApiTestCase):
+    """The .values() fast path renders byte-for-byte what the ModelSerializer renders."""
+
+    def assertSameAsModelSerializer(self, url, viewset):
+        fast_class = viewset.fast_read_serializer_class
+        with mock.patch.object(fast_class, 'to_representation', autospec=True, side_effect=fast_class.to_representation) as fast:
+            fast_response = self.client.get(url)
+        self.assertTrue(fast.called)
+        cache.clear()
+        with mock.patch.object(viewset, 'fast_read_serializer_class', None):
+            model_response = self.client.get(url)
+        self.assertEqual(fast_response.status_code, 200)
+        self.assertEqual(len(json.loads(fast_response.content)['results']), 3)
+        # Porovnání bajtů hlídá i pořadí klíčů a reprezentaci hodnot (Decimal, datumy, None)
+        self.assertEqual(fast_response.content, model_response.content)
+
+    def test_attendance(self):
+        now = timezone.now()
+        AttendanceRecord.objects.create(employee=make_employee(self.department, first_name='Šárka', last_name='Dvořáková'), date=timezone.localdate(), check_in_time=now)
+        AttendanceRecord.objects.create(employee=make_employee(), date=timezone.localdate(), check_in_time=now - timedelta(hours=8), check_out_time=now)
+        AttendanceRecord.objects.create(employee=make_employee(), date=timezone.localdate() - timedelta(days=1), check_in_time=now - timedelta(days=1))
+        self.assertSameAsModelSerializer('/api/attendance-history/', AttendanceRecordViewSet)
+
+    def test_transactions(self):
+        category = TransactionCategory.objects.create(name='Nájem', type='EXPENSE')
+        clerk = User.objects.create_user('ucetni', first_name='Eva')
+        clerk.groups.add(Group.objects.create(name='Účetní'))
+        Transaction.objects.create(title='Nájem', amount=Decimal('12500.50'), type='EXPENSE', category=category, transaction_date='2026-01-10', recorded_by=clerk)
+        Transaction.objects.create(title='Faktura', amount=Decimal('3000'), type='INCOME', transaction_date='2026-01-11', description='Záloha', recorded_by=self.admin)
+        Transaction.objects.create(title='Import', amount=Decimal('-1.99'), type='EXPENSE', transaction_date='2026-01-11')
+        self.assertSameAsModelSerializer('/api/transactions/', TransactionViewSet)
+
+
+class DepartmentTests(ApiTestCase):
+    """The list carries only counts; members come paginated on the detail route."""
+
+    def setUp(self):
+        super().setUp()
+        self.sales = Department.objects.create(name='Obchod', description='Prodej')
+        self.members = [make_employee(self.sales) for _ in range(5)]
+        make_employee(self.department)
+        make_employee()
+
+    def test_list_has_counts_without_members(self):
+        response = self.client.get('/api/departments/')
+        self.assertEqual(response.status_code, 200)
+        rows = {row['name']: row for row in response.data['results']}
+        self.assertEqual(rows['Obchod'], {'id': self.sales.pk, 'name': 'Obchod', 'description': 'Prodej', 'employee_count': 5})
+        self.assertEqual(rows['Vývoj']['employee_count'], 1)
+
+        Department.objects.create(name='Prázdné')
+        cache.clear()
+        rows = {row['name']: row for row in self.client.get('/api/departments/').data['results']}
+        self.assertEqual(rows['Prázdné']['employee_count'], 0)
+
+    def test_detail_paginates_members(self):
+        ids, url = [], '/api/departments/Obchod/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual((response.data['name'], response.data['employee_count']), ('Obchod', 5))
+            employees = response.data['employees']
+            self.assertLessEqual(len(employees['results']), 2)
+            self.assertTrue(all(row['department'] == self.sales.pk for row in employees['results']))
+            ids += [row['id'] for row in employees['results']]
+            url = employees['next']
+        self.assertCountEqual(ids, [employee.pk for employee in self.members])
+        self.assertEqual(len(ids), len(set(ids)))
+
+        self.assertEqual(self.client.get('/api/departments/Neexistuje/').status_code, 404)
+
+
+class KeysetPaginationTests(ApiTestCase):
+    """Cursor pages over rows that share their sort keys (only the pk tells them apart)."""
+
+    def setUp(self):
+        super().setUp()
+        category = TransactionCategory.objects.create(name='Nájem', type='EXPENSE')
+        for number in range(7):
+            Transaction.objects.create(title=f'Platba {number}', amount=10, type='EXPENSE', transaction_date='2026-01-10', category=category)
+        # Stejné datum i čas vytvoření - pořadí určuje jen pk
+        Transaction.objects.update(created_at=timezone.now())
+        self.expected = list(Transaction.objects.order_by('-transaction_date', '-created_at', '-pk').values_list('pk', flat=True))
+
+    def page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_next_and_previous_round_trip(self):
+        pages, url = [], '/api/transactions/?page_size=3'
+        while url:
+            data = self.page(url)
+            pages.append([row['id'] for row in data['results']])
+            url = data['next']
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        # Zpět přes odkazy previous od poslední stránky
+        back, url = [], data['previous']
+        while url:
+            data = self.page(url)
+            back.append([row['id'] for row in data['results']])
+            url = data['previous']
+        self.assertEqual(back, pages[-2::-1])
+
+    def test_reverse_ordering(self):
+        ids, url = [], '/api/employees/?ordering=-last_name&page_size=2'
+        for _ in range(5):
+            make_employee(self.department)
+        while url:
+            data = self.page(url)
+            ids += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(ids, list(Employee.objects.order_by('-last_name', '-pk').values_list('pk', flat=True)))
+
+    def test_invalid_cursor_is_404(self):
+        for cursor in ('nesmysl', 'eyJwIjpbMV19', 'eyJwIjpbIngiLCJ5IiwieiJdfQ=='):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/transactions/', {'cursor': cursor}).status_code, 404)
+
+    def test_iter_pages_and_export_walk_every_row_once(self):
+        chunks = list(iter_pages(Transaction.objects.all(), page_size=3))
+        self.assertEqual([[txn.pk for txn in chunk] for chunk in chunks], [self.expected[:3], self.expected[3:6], self.expected[6:]])
+
+        with mock.patch('app_system.exports.EXPORT_CHUNK_SIZE', 2):
+            response = self.client.get('/api/transactions/export/', {'export_format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], self.expected)
+
+
+class LeaveBulkUpdateTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee(self.department)
+        self.day = timezone.localdate() + timedelta(days=30)
+
+    def leave(self, start, end):
+        return Leave.objects.create(
+            employee=self.employee, leave_type='VACATION', status='PENDING',
+            start_date=self.day + timedelta(days=start), end_date=self.day + timedelta(days=end),
+        )
+
+    def test_partial_update_cannot_move_start_after_end(self):
+        leave = self.leave(0, 2)
+        start = (self.day + timedelta(days=8)).isoformat()
+
+        response = self.client.patch('/api/leaves/bulk/', [{'id': leave.pk, 'start_date': start}], format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(f'/api/leaves/{leave.pk}/', {'start_date': start}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        leave.refresh_from_db()
+        self.assertEqual(leave.start_date, self.day)
+
+    def test_partial_update_cannot_move_start_into_past(self):
+        leave = self.leave(0, 2)
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        response = self.client.patch('/api/leaves/bulk/', [{'id': leave.pk, 'start_date': yesterday}], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_can_shift_leaves_into_each_others_old_ranges(self):
+        first, second = self.leave(0, 4), self.leave(5, 9)
+        response = self.client.patch('/api/leaves/bulk/', [
+            {'id': first.pk, 'start_date': (self.day + timedelta(days=6)).isoformat(), 'end_date': (self.day + timedelta(days=10)).isoformat()},
+            {'id': second.pk, 'start_date': (self.day + timedelta(days=11)).isoformat(), 'end_date': (self.day + timedelta(days=12)).isoformat()},
+        ], format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_batch_rejects_overlap_of_new_ranges(self):
+        first, second = self.leave(0, 4), self.leave(5, 9)
+        response = self.client.patch('/api/leaves/bulk/', [
+            {'id': first.pk, 'end_date': (self.day + timedelta(days=6)).isoformat()},
+            {'id': second.pk, 'start_date': (self.day + timedelta(days=6)).isoformat()},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+
+    def test_batch_rejects_overlap_with_leave_outside_batch(self):
+        first = self.leave(0, 4)
+        self.leave(10, 12)
+        response = self.client.patch('/api/leaves/bulk/', [{'id': first.pk, 'end_date': (self.day + timedelta(days=11)).isoformat()}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['index'], 0)
+
+
+class LeaveDecisionTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        day = timezone.localdate() + timedelta(days=30)
+        self.leaves = [
+            Leave.objects.create(
+                employee=make_employee(self.department), leave_type='VACATION', status=leave_status,
+                start_date=day, end_date=day,
+            )
+            for leave_status in ('PENDING', 'PENDING', 'APPROVED')
+        ]
+
+    def test_bulk_approve_outcomes(self):
+        pending, other, approved = self.leaves
+        ids = [pending.pk, pending.pk, approved.pk, 9999, 'x', True, float(pending.pk)]
+        response = self.client.post('/api/leaves/bulk-approve/', ids, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['approved', 'duplicate', 'not_pending', 'not_found', 'invalid', 'invalid', 'invalid'],
+        )
+        self.assertEqual(response.data['results'][2]['current_status'], 'APPROVED')
+        self.assertEqual(response.data['counts'], {'approved': 1, 'duplicate': 1, 'not_pending': 1, 'not_found': 1, 'invalid': 3})
+
+        statuses = dict(Leave.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {pending.pk: 'APPROVED', other.pk: 'PENDING', approved.pk: 'APPROVED'})
+        self.assertEqual(Leave.objects.get(pk=pending.pk).approved_by, self.admin)
+
+    def test_bulk_reject_only_pending(self):
+        pending, other, approved = self.leaves
+        response = self.client.post('/api/leaves/bulk-reject/', [other.pk, approved.pk, pending.pk], format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['counts'], {'rejected': 2, 'not_pending': 1})
+        self.assertEqual(Leave.objects.filter(status='REJECTED').count(), 2)
+
+        # Podruhé už nic nečeká na rozhodnutí
+        response = self.client.post('/api/leaves/bulk-reject/', [other.pk], format='json')
+        self.assertEqual(response.data['results'], [{'id': other.pk, 'status': 'not_pending', 'current_status': 'REJECTED'}])
+
+    def test_bulk_decide_requires_list_and_permission(self):
+        self.assertEqual(self.client.post('/api/leaves/bulk-approve/', [], format='json').status_code, 400)
+        self.assertEqual(self.client.post('/api/leaves/bulk-approve/', {'id': 1}, format='json').status_code, 400)
+
+        user = User.objects.create_user('bez_prav')
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/leaves/bulk-approve/', [self.leaves[0].pk], format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Leave.objects.get(pk=self.leaves[0].pk).status, 'PENDING')
+
+
+class LeaveAvailabilityTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        # Žádosti nesmí začínat v minulosti - dny rozsahu jsou day(0)..day(4)
+        self.start = timezone.localdate() + timedelta(days=30)
+        self.sales = Department.objects.create(name='Obchod')
+        self.developer, self.seller = make_employee(self.department), make_employee(self.sales)
+        self.vacation = Leave.objects.create(employee=self.developer, leave_type='VACATION', status='APPROVED', start_date=self.day(1), end_date=self.day(3))
+        Leave.objects.create(employee=self.seller, leave_type='SICK', status='PENDING', start_date=self.day(2), end_date=self.day(9))
+        Leave.objects.create(employee=make_employee(self.sales), leave_type='VACATION', status='REJECTED', start_date=self.day(0), end_date=self.day(4))
+
+    def day(self, offset):
+        return self.start + timedelta(days=offset)
+
+    def availability(self, query=''):
+        response = self.client.get(f'/api/leaves/availability/?date_from={self.day(0)}&date_to={self.day(4)}{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['days']
+
+    def test_absences_per_day(self):
+        days = self.availability()
+        self.assertEqual([day['date'] for day in days], [self.day(offset) for offset in range(5)])
+        self.assertEqual([day['absent_count'] for day in days], [0, 1, 1, 1, 0])
+        self.assertEqual(days[1]['departments'], [{
+            'department_id': self.department.pk, 'department_name': 'Vývoj',
+            'absences': [{'leave_id': self.vacation.pk, 'employee_id': self.developer.pk,
+                          'employee_name': str(self.developer), 'leave_type': 'VACATION', 'status': 'APPROVED'}],
+        }])
+
+        self.assertEqual([day['absent_count'] for day in self.availability('&include_pending=true')], [0, 1, 2, 2, 1])
+        days = self.availability(f'&include_pending=true&department={self.sales.pk}')
+        self.assertEqual([day['absent_count'] for day in days], [0, 0, 1, 1, 1])
+        self.assertEqual({absence['employee_id'] for day in days for department in day['departments'] for absence in department['absences']}, {self.seller.pk})
+
+    def test_invalid_ranges(self):
+        for query in (
+            f'date_from={self.day(4)}&date_to={self.day(0)}', f'date_from={self.day(0)}&date_to={self.day(366)}',
+            f'date_from={self.day(0)}', f'date_from=x&date_to={self.day(0)}',
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/leaves/availability/?{query}')
+                self.assertEqual(response.status_code, 400)
+
+
+class ReviewAnalyticsTests(ApiTestCase):
+    """Review analytics honour the list filters and group over the stored score."""
+
+    def setUp(self):
+        super().setUp()
+        self.sales = Department.objects.create(name='Obchod')
+        self.developer, self.seller = make_employee(self.department), make_employee(self.sales)
+        for employee, period, day, points in [
+            (self.developer, '2026-Q1', date(2026, 1, 20), (4, 4, 4, 4, 4)),
+            (self.developer, '2026-Q2', date(2026, 4, 20), (2, 2, 2, 2, 2)),
+            (self.seller, '2026-Q1', date(2026, 2, 10), (5, 5, 5, 5, 5)),
+            (self.seller, '2026-Q1', date(2026, 3, 10), (3, 3, 3, 3, 4)),
+        ]:
+            review = PerformanceReview.objects.create(employee=employee, reviewer=self.admin, period=period, **dict(zip(PerformanceReview.SCORE_FIELDS, points)))
+            PerformanceReview.objects.filter(pk=review.pk).update(date=day)  # date je auto_now_add
+
+    def analytics(self, query):
+        response = self.client.get(f'/api/performance-reviews/analytics/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_period_filter_grouped_by_department(self):
+        data = self.analytics('group_by=department&period=2026-Q1')
+        self.assertEqual((data['group_by'], data['reviews'], data['average_score']), ('department', 3, 4.07))
+        self.assertEqual(
+            [(row['department_name'], row['reviews'], row['average_score'], row['min_score'], row['max_score']) for row in data['results']],
+            [('Obchod', 2, 4.1, 3.2, 5.0), ('Vývoj', 1, 4.0, 4.0, 4.0)],
+        )
+        self.assertEqual(data['results'][0]['average_initiative'], 4.5)
+        self.assertEqual(data['distribution'], [{'points': 3, 'reviews': 1}, {'points': 4, 'reviews': 1}, {'points': 5, 'reviews': 1}])
+        self.assertEqual([(row['month'].month, row['reviews']) for row in data['trend']], [(1, 1), (2, 1), (3, 1)])
+
+    def test_score_date_and_department_filters(self):
+        data = self.analytics('min_score=4')
+        self.assertEqual([(row['employee_id'], row['reviews']) for row in data['results']], [(self.seller.pk, 1), (self.developer.pk, 1)])
+
+        data = self.analytics(f'group_by=period&department={self.department.pk}&date_from=2026-04-01')
+        self.assertEqual([(row['period'], row['average_score']) for row in data['results']], [('2026-Q2', 2.0)])
+
+        data = self.analytics(f'employee_id={self.seller.pk}&max_score=4')
+        self.assertEqual((data['reviews'], data['average_score']), (1, 3.2))
+
+    def test_invalid_parameters(self):
+        for query in ('group_by=reviewer', 'min_score=5&max_score=4', 'date_from=2026-05-01&date_to=2026-01-01', 'ordering=employee'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/performance-reviews/analytics/?{query}').status_code, 400)
+
+
+class TransactionImportTests(ApiTestCase):
+    def test_json_body_must_be_non_empty_list_of_objects(self):
+        for body in ([1, 2], ['a'], [{'datum': '2026-01-05', 'částka': '-120'}, 'x'], []):
+            with self.subTest(body=body):
+                response = self.client.post('/api/transactions/import/', body, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('detail', response.data)
+
+    def test_json_body_is_imported(self):
+        response = self.client.post('/api/transactions/import/', [{'datum': '05.01.2026', 'částka': '-120,50', 'protistrana': 'Shop'}], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 1)
+
+    def test_reimport_is_deduplicated_within_batch_date_range(self):
+        Transaction.objects.create(title='Nájem', amount=Decimal('-120.50'), type='EXPENSE', payment_method='BANK_TRANSFER', transaction_date=date(2020, 1, 5))
+        rows = [
+            {'datum': '05.01.2026', 'částka': '-120,50', 'název': 'Nájem'},
+            {'datum': '05.02.2026', 'částka': '-120,50', 'název': 'Nájem'},
+        ]
+        self.assertEqual(self.client.post('/api/transactions/import/', rows, format='json').data['created'], 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/transactions/import/', rows, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data['created'], response.data['duplicates']), (0, 2))
+        # Dotaz na existující klíče nenačítá historii stejného názvu mimo rozsah dávky
+        lookup = next(q['sql'] for q in queries if 'BETWEEN' in q['sql'] and '"title" IN' in q['sql'])
+        self.assertIn("'2026-01-05' AND '2026-02-05'", lookup)
+        self.assertNotIn('ORDER BY', lookup)
+
+
+class FinanceRollupTests(ApiTestCase):
+    """FinanceMonthlyRollup stays equal to a fresh recompute after every write path."""
+
+    def setUp(self):
+        super().setUp()
+        self.rent = TransactionCategory.objects.create(name='Nájem', type='EXPENSE')
+        self.office = TransactionCategory.objects.create(name='Kancelář', type='EXPENSE')
+
+    def assertRollupConsistent(self):
+        self.assertEqual(verify_rollup(), [])
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+    def transaction_data(self, **fields):
+        return {
+            'title': 'Platba', 'amount': '100.00', 'type': 'EXPENSE', 'payment_method': 'BANK_TRANSFER',
+            'transaction_date': '2026-01-10', 'category': self.rent.pk, **fields,
+        }
+
+    def test_single_writes(self):
+        response = self.client.post('/api/transactions/', self.transaction_data(), format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        pk = response.data['id']
+        self.assertRollupConsistent()
+
+        # Přesun do jiného měsíce i kategorie a změna částky
+        response = self.client.patch(f'/api/transactions/{pk}/', {'transaction_date': '2026-02-03', 'category': self.office.pk, 'amount': '80.00'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertRollupConsistent()
+
+        self.assertEqual(self.client.delete(f'/api/transactions/{pk}/').status_code, 204)
+        self.assertRollupConsistent()
+        self.assertEqual(stored_rollup(), {})
+
+    def test_bulk_writes(self):
+        response = self.client.post('/api/transactions/bulk/', [
+            self.transaction_data(amount='10.00'),
+            self.transaction_data(amount='20.00', category=self.office.pk),
+            self.transaction_data(amount='30.00', transaction_date='2026-03-01', type='INCOME', category=None),
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        ids = [row['id'] for row in response.data]
+        self.assertRollupConsistent()
+
+        response = self.client.patch('/api/transactions/bulk/', [
+            {'id': ids[0], 'transaction_date': '2026-03-15'},
+            {'id': ids[1], 'category': self.rent.pk, 'amount': '25.00'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertRollupConsistent()
+
+        response = self.client.delete('/api/transactions/bulk/', ids[:2], format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertRollupConsistent()
+
+    def test_bank_import(self):
+        self.client.post('/api/transactions/', self.transaction_data(), format='json')
+        response = self.client.post('/api/transactions/import/', [
+            {'datum': '05.01.2026', 'částka': '-120,50', 'protistrana': 'Obchod', 'kategorie': 'Nájem'},
+            {'datum': '06.02.2026', 'částka': '5000', 'protistrana': 'Klient', 'kategorie': 'Tržby'},
+            {'datum': '07.02.2026', 'částka': '-10', 'protistrana': 'Kavárna'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 3)
+        self.assertRollupConsistent()
+
+    def test_category_deletion(self):
+        self.client.post('/api/transactions/bulk/', [
+            self.transaction_data(amount='10.00', category=None),
+            self.transaction_data(amount='20.00'),
+            self.transaction_data(amount='30.00', category=self.office.pk),
+        ], format='json')
+        self.assertEqual(self.client.delete(f'/api/transaction-categories/{self.rent.pk}/').status_code, 204)
+        self.assertRollupConsistent()
+
+    def test_dashboard_month_to_date_excludes_future_dates(self):
+        self.client.post('/api/transactions/bulk/', [
+            self.transaction_data(amount='100.00', type='INCOME', transaction_date='2026-01-01'),
+            self.transaction_data(amount='30.00', transaction_date='2026-01-15'),
+            self.transaction_data(amount='500.00', type='INCOME', transaction_date='2026-01-16'),
+            self.transaction_data(amount='70.00', transaction_date='2026-01-31'),
+            self.transaction_data(amount='900.00', type='INCOME', transaction_date='2026-02-01'),
+        ], format='json')
+        finance = finance_month_to_date(date(2026, 1, 15))
+        self.assertEqual(finance['month'], date(2026, 1, 1))
+        self.assertEqual((finance['income'], finance['expense'], finance['net_balance']), (100, 30, 70))
+        self.assertEqual(finance['transaction_count'], 2)
+        self.assertEqual(finance_month_to_date(date(2026, 1, 31))['transaction_count'], 4)
+
+
+class RangeSummaryTests(ApiTestCase):
+    """range-summary aligns 'from' to the period start and rejects bad ranges with 400."""
+
+    def setUp(self):
+        super().setUp()
+        self.clerk = User.objects.create_user('ucetni')
+        for amount, type_, day in [
+            ('100.00', 'INCOME', '2026-01-05'), ('40.00', 'EXPENSE', '2026-02-20'),
+            ('10.00', 'INCOME', '2026-06-30'), ('999.00', 'INCOME', '2026-07-01'), ('5.00', 'EXPENSE', '2025-12-31'),
+        ]:
+            Transaction.objects.create(title='Platba', amount=amount, type=type_, transaction_date=day, recorded_by=self.clerk)
+
+    def summary(self, query, user=None):
+        self.client.force_authenticate(user or self.admin)
+        response = self.client.get(f'/api/transactions/range-summary/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_quarters_start_at_period_boundary(self):
+        data = self.summary('period=quarter&from=2026-02&to=2026-05')
+        self.assertEqual((data['from'], data['to']), (date(2026, 1, 1), date(2026, 6, 30)))
+        self.assertEqual(
+            [(row['period_start'], row['income'], row['expense'], row['net_balance']) for row in data['results']],
+            [(date(2026, 1, 1), 100, 40, 60), (date(2026, 4, 1), 10, 0, 10)],
+        )
+        # Kdo nevidí všechny transakce, počítá se z vlastních řádků - výsledek musí sedět se souhrnem
+        self.assertEqual(self.summary('period=quarter&from=2026-02&to=2026-05', self.clerk)['results'], data['results'])
+
+    def test_months_without_transactions_are_zero(self):
+        data = self.summary('from=2026-01&to=2026-03')
+        self.assertEqual(data['period'], 'month')
+        self.assertEqual([(row['month'], row['net_balance']) for row in data['results']], [(1, 100), (2, -40), (3, 0)])
+        self.assertEqual([row['year'] for row in self.summary('period=year&from=2025-06&to=2026-01')['results']], [2025, 2026])
+
+    def test_invalid_parameters(self):
+        for query in ('period=week&from=2026-01', 'to=2026-03', 'from=2026-13', 'from=2026-1x', 'from=2026-03&to=2026-01', 'from=2000-01&to=2030-12'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/transactions/range-summary/?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('detail', response.data)
+
+
+class ExportTests(ApiTestCase):
+    """Exports stream the caller's own filtered rows in every chunk, in a validated format."""
+
+    def setUp(self):
+        super().setUp()
+        self.clerk = User.objects.create_user('ucetni')
+        for number in range(5):
+            Transaction.objects.create(title=f'Platba {number}', amount='10.00', type='EXPENSE', transaction_date='2026-01-10', recorded_by=self.clerk)
+        Transaction.objects.create(title='=HYPERLINK("x")', amount='20.00', type='INCOME', transaction_date='2026-01-11', recorded_by=self.admin)
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    @mock.patch('app_system.exports.EXPORT_CHUNK_SIZE', 2)
+    def test_csv_is_scoped_to_visible_rows(self):
+        content = self.export('/api/transactions/export/')
+        self.assertTrue(content.startswith('\ufeffid,transaction_date,title,'))
+        rows = content.lstrip('\ufeff').splitlines()[1:]
+        self.assertEqual([row.split(',')[0] for row in rows], [str(pk) for pk in Transaction.objects.order_by('-transaction_date', '-created_at', '-pk').values_list('pk', flat=True)])
+        # Vzorce se v CSV neutralizují
+        self.assertIn('"\'=HYPERLINK(""x"")"', rows[0])
+
+        self.client.force_authenticate(self.clerk)
+        rows = [json.loads(line) for line in self.export('/api/transactions/export/?export_format=ndjson').splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual({row['recorded_by'] for row in rows}, {'ucetni'})
+        self.assertEqual(list(rows[0]), ['id', 'transaction_date', 'title', 'description', 'amount', 'party_name', 'type', 'payment_method', 'category', 'recorded_by', 'created_at'])
+
+    def test_attendance_export_applies_filters(self):
+        employee, other = make_employee(), make_employee()
+        day = timezone.localdate()
+        for person in (employee, other):
+            AttendanceRecord.objects.create(employee=person, date=day, check_in_time=timezone.now())
+        rows = [json.loads(line) for line in self.export(f'/api/attendance-history/export/?export_format=ndjson&employee_id={employee.pk}').splitlines()]
+        self.assertEqual([(row['employee_id'], row['date']) for row in rows], [(employee.pk, day.isoformat())])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/transactions/export/?export_format=xlsx')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('export_format', response.data)
+
+
+class RequestMetricsTests(ApiTestCase):
+    """Server-Timing on every response; per-route histograms at /api/_metrics for staff only."""
+
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        make_employee(self.department)
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/employees/')
+        self.assertEqual(response.status_code, 200)
+        entries = {entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')}
+        self.assertLessEqual({'db', 'dup', 'serialize', 'render', 'total'}, set(entries))
+        queries = int(re.search(r'desc="(\d+) queries"', entries['db']).group(1))
+        self.assertGreater(queries, 0)
+        self.assertRegex(entries['total'], r'^total;dur=\d+\.\d$')
+
+    def test_metrics_report_per_route(self):
+        for _ in range(2):
+            self.client.get('/api/employees/')
+        self.client.post('/api/employees/', {}, format='json')
+
+        response = self.client.get('/api/_metrics')
+        self.assertEqual(response.status_code, 200)
+        routes = {route['route']: route for route in response.data['routes']}
+        employees = routes['employee-list']
+        self.assertEqual(employees['pattern'], 'api/^employees/$')
+        self.assertEqual(set(employees['methods']), {'GET', 'POST'})
+        self.assertEqual((employees['methods']['GET']['requests'], employees['methods']['GET']['errors']), (2, 0))
+        self.assertGreater(employees['methods']['GET']['queries']['max'], 0)
+        self.assertEqual(routes['employee-detail']['methods'], {})
+
+    def test_metrics_require_staff(self):
+        self.client.force_authenticate(User.objects.create_user('bezny'))
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 403)
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get('/api/_metrics').status_code, (401, 403))
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
+FILE_CACHE = {'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': f'{tempfile.gettempdir()}/companysite_test_cache',
+}}
+
+
+class ResponseCacheTestsMixin:
+    """Response cache behaviour; run against LocMemCache and FileBasedCache by the classes below."""
+
+    def request(self, user):
+        request = RequestFactory().get('/api/dashboard/')
+        request.user = user
+        return request
+
+    def test_miss_then_hit(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return Response({'value': len(calls)})
+
+        self.assertEqual(cached_response('klic', 60, compute).data, {'value': 1})
+        self.assertEqual(cached_response('klic', 60, compute).data, {'value': 1})
+        self.assertEqual(len(calls), 1)
+
+        # Chybové odpovědi se necachují
+        for _ in range(2):
+            cached_response('chyba', 60, lambda: calls.append(1) or Response({}, status=400))
+        self.assertEqual(len(calls), 3)
+
+    def test_keys_vary_by_roles_or_user(self):
+        group = Group.objects.create(name='IT')
+        first, second = User.objects.create_user('prvni'), User.objects.create_user('druhy')
+        first.groups.add(group)
+        second.groups.add(group)
+        outsider = User.objects.create_user('treti')
+
+        key = lambda user, vary: response_cache_key(self.request(user), 'dashboard', (Employee,), vary)
+        self.assertEqual(key(first, 'roles'), key(second, 'roles'))
+        self.assertNotEqual(key(first, 'roles'), key(outsider, 'roles'))
+        self.assertNotEqual(key(first, 'user'), key(second, 'user'))
+        self.assertEqual(key(first, None), key(outsider, None))
+
+    def test_endpoint_timeouts(self):
+        backend = caches['default']
+        with mock.patch.object(backend, 'set', wraps=backend.set) as cache_set:
+            self.assertEqual(self.client.get('/api/departments/').status_code, 200)
+            self.assertEqual(self.client.get('/api/company-stats/').status_code, 200)
+        # Jen uložené odpovědi (ne snímky rolí ani zámky)
+        timeouts = [
+            call.args[2] for call in cache_set.call_args_list
+            if call.args[0].startswith('response_cache:') and not call.args[0].endswith(':lock')
+        ]
+        self.assertEqual(timeouts, [300, 60])
+
+    def test_write_invalidates_cached_list(self):
+        names = lambda: [row['name'] for row in self.client.get('/api/departments/').data['results']]
+        self.assertEqual(names(), ['Vývoj'])
+        Department.objects.create(name='Nezapsané')  # bez commitu se cache nezneplatní
+        self.assertEqual(names(), ['Vývoj'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/departments/', {'name': 'Obchod'}, format='json')
+        self.assertEqual(sorted(names()), ['Nezapsané', 'Obchod', 'Vývoj'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LocMemResponseCacheTests(ResponseCacheTestsMixin, ApiTestCase):
+    def test_single_flight(self):
+        """Concurrent misses of one key compute the response once; the others wait for it."""
+        calls = []
+        barrier = threading.Barrier(8)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.3)
+            return Response({'value': 'hotovo'})
+
+        def worker():
+            barrier.wait()
+            results.append(cached_response('spolecny', 60, compute).data)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'value': 'hotovo'}] * 8)
+
+    def test_waiter_rereads_value_when_lock_disappears(self):
+        """The holder stores the result and releases the lock between the waiter's two reads."""
+        backend = caches['default']
+        backend.add('klic:lock', 1)
+        get = backend.get
+
+        def get_after_holder_finished(key, *args, **kwargs):
+            if key == 'klic:lock':
+                backend.set('klic', {'value': 'od drzitele'})
+                backend.delete('klic:lock')
+            return get(key, *args, **kwargs)
+
+        with mock.patch.object(backend, 'get', side_effect=get_after_holder_finished), \
+                mock.patch('app_system.response_cache.time.sleep'):
+            response = cached_response('klic', 60, lambda: self.fail('přepočet navíc'))
+        self.assertEqual(response.data, {'value': 'od drzitele'})
+
+
+@override_settings(CACHES=FILE_CACHE)
+class FileResponseCacheTests(ResponseCacheTestsMixin, ApiTestCase):
+    pass
+
+
+class TableVersionTests(TestCase):
+    def version(self, model):
+        return TableVersion.objects.filter(table=model._meta.label_lower).values_list('version', flat=True).first()
+
+    def test_one_bump_per_table_and_transaction(self):
+        department = Department.objects.create(name='Vývoj')
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for number in range(5):
+                    make_employee(department)
+                department.save()
+                self.assertIsNone(self.version(Employee))
+        self.assertEqual(self.version(Employee), 1)
+        self.assertEqual(self.version(Department), 1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                for employee in Employee.objects.all():
+                    employee.save()
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        updates = [q['sql'] for q in queries if 'UPDATE' in q['sql'] and 'tableversion' in q['sql']]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.version(Employee), 2)
+
+
+class UserRolesCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_role_changes_invalidate_the_snapshot(self):
+        user = User.objects.create_user('eva')
+        self.assertEqual(get_user_roles(user).groups, ())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.groups.add(Group.objects.create(name='IT'))
+        self.assertEqual(get_user_roles(user).groups, ('IT',))
+
+    def test_change_from_another_process_is_seen(self):
+        user = User.objects.create_user('eva')
+        group = Group.objects.create(name='CEO')
+        self.assertEqual(get_user_roles(user).groups, ())
+
+        # Jiný proces: zapíše do DB a zvýší verzi tabulky, lokální cache tohoto procesu nezná
+        User.groups.through.objects.bulk_create([User.groups.through(user=user, group=group)])
+        TableVersion.objects.update_or_create(table='auth.user', defaults={'version': 99, 'updated_at': timezone.now()})
+        self.assertEqual(get_user_roles(user).groups, ('CEO',))
+
+
+class DocumentConditionalGetTests(ApiTestCase):
+    def test_etag_changes_with_the_date(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Document.objects.create(title='Smlouva', document_type='contract', contract_end_date=timezone.localdate() + timedelta(days=2))
+        response = self.client.get('/api/documents/?expired=false')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/documents/?expired=false', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        later = timezone.now() + timedelta(days=3)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            response = self.client.get('/api/documents/?expired=false', HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'], [])
+
+
+class AttendanceCreateTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee(self.department)
+        self.check_in = timezone.now().replace(hour=8, minute=0, second=0, microsecond=0)
+
+    def post(self, check_in):
+        return self.client.post('/api/attendance-history/', {'employee': self.employee.pk, 'check_in_time': check_in.isoformat()}, format='json')
+
+    def test_second_record_for_the_same_day_is_rejected(self):
+        response = self.post(self.check_in)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['date'], timezone.localdate(self.check_in).isoformat())
+
+        response = self.post(self.check_in + timedelta(hours=2))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('check_in_time', response.data)
+        self.assertEqual(self.post(self.check_in + timedelta(days=1)).status_code, 201)
+
+    def test_concurrent_insert_is_a_validation_error(self):
+        self.assertEqual(self.post(self.check_in).status_code, 201)
+        # Souběžný požadavek: validace ještě záznam neviděla, INSERT narazí na unikátní omezení
+        day = timezone.localdate(self.check_in)
+        with mock.patch('app_system.serializers.AttendanceRecordSerializer.validate', lambda serializer, data: {**data, 'date': day}):
+            response = self.post(self.check_in + timedelta(hours=1))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('check_in_time', response.data)
+        self.assertEqual(AttendanceRecord.objects.count(), 1)
+
+
+class AttendanceConditionalGetTests(ApiTestCase):
+    def test_department_rename_changes_analytics_etag(self):
+        employee = make_employee(self.department)
+        today = timezone.localdate()
+        with self.captureOnCommitCallbacks(execute=True):
+            AttendanceRecord.objects.create(employee=employee, date=today, check_in_time=timezone.now())
+        url = f'/api/attendance-history/analytics/?group_by=department&date_from={today}&date_to={today}'
+        etag = self.client.get(url)['ETag']
+
+        self.department.name = 'Výzkum'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['department_name'], 'Výzkum')
+
+
+class EmployeeSearchTests(ApiTestCase):
+    def search(self, term):
+        response = self.client.get('/api/employees/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['last_name'] for row in response.data['results'])
+
+    def test_search_ignores_case_and_diacritics(self):
+        make_employee(first_name='Jiří', last_name='Žák', email='jz@example.cz')
+        make_employee(first_name='Eva', last_name='Řehořová', email='er@example.cz')
+        make_employee(first_name='Petr', last_name='Zelený', email='pz@example.cz')
+
+        for term in ('Žák', 'žák', 'ŽÁK', 'zak'):
+            self.assertEqual(self.search(term), ['Žák'], term)
+        for term in ('Řeh', 'ŘEH', 'reh'):
+            self.assertEqual(self.search(term), ['Řehořová'], term)
+        self.assertEqual(self.search('jiř'), ['Žák'])
+        self.assertEqual(self.search('z'), ['Zelený', 'Žák'])
+
+    def test_prefix_ending_with_the_highest_code_point(self):
+        make_employee(first_name='Jan', last_name='Novák', email='jn@example.cz')
+        for term in ('a\U0010ffff', '\U0010ffff', 'no\U0010ffff\U0010ffff', '\ud7ff'):
+            with self.subTest(term=term):
+                self.assertEqual(self.search(term), [])
+        self.assertEqual(prefix_range('a\U0010ffff'), ('a\U0010ffff', 'b'))
+        self.assertEqual(prefix_range('\U0010ffff'), ('\U0010ffff', None))
+        self.assertEqual(prefix_range('x\ud7ff'), ('x\ud7ff', 'x\ue000'))
+
+    def test_bulk_writes_keep_search_keys(self):
+        response = self.client.post('/api/employees/bulk/', [
+            {'first_name': 'Šárka', 'last_name': 'Černá', 'email': 'sc@example.cz', 'position': 'Analytik'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(self.search('cer'), ['Černá'])
+
+        employee_id = response.data[0]['id']
+        # Cache seznamu se zneplatní až po commitu
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/employees/bulk/', [{'id': employee_id, 'last_name': 'Dvořáková'}], format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.search('dvorak'), ['Dvořáková'])
+        self.assertEqual(self.search('cer'), [])
+        self.assertNotIn('last_name_search', response.data[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/employees/{employee_id}/', {'first_name': 'Ľubica'}, format='json')
+        self.assertEqual(self.search('lub'), ['Dvořáková'])
+
+
+class PunchBatchTests(ApiTestCase):
+    url = '/api/attendance-history/bulk-punch/'
+
+    def punch(self, events):
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, events, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        writes = [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE')) and 'attendancerecord' in q['sql']]
+        return response.data, writes
+
+    def test_replayed_batch_writes_nothing(self):
+        employee = make_employee(self.department)
+        check_in = timezone.now().replace(hour=8, minute=0, second=0, microsecond=0)
+        events = [
+            {'employee_id': employee.pk, 'timestamp': check_in.isoformat(), 'direction': 'in'},
+            {'employee_id': employee.pk, 'timestamp': (check_in + timedelta(hours=8)).isoformat(), 'direction': 'out'},
+        ]
+        data, writes = self.punch(events)
+        self.assertEqual(data['counts'], {'created': 1, 'updated': 1})
+        etag = self.client.get('/api/attendance-history/')['ETag']
+
+        data, writes = self.punch(events)
+        self.assertEqual(data['counts'], {'duplicate': 2})
+        self.assertEqual(writes, [])
+        self.assertEqual(self.client.get('/api/attendance-history/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_only_changed_check_outs_are_written(self):
+        check_in = timezone.now().replace(hour=8, minute=0, second=0, microsecond=0)
+        check_out = check_in + timedelta(hours=8)
+        today = timezone.localdate(check_in)
+        open_record = AttendanceRecord.objects.create(employee=make_employee(self.department), date=today, check_in_time=check_in)
+        closed_record = AttendanceRecord.objects.create(employee=make_employee(self.department), date=today, check_in_time=check_in, check_out_time=check_out)
+        etag = self.client.get('/api/attendance-history/')['ETag']
+
+        data, writes = self.punch([
+            {'employee_id': open_record.employee_id, 'timestamp': check_out.isoformat(), 'direction': 'out'},
+            {'employee_id': closed_record.employee_id, 'timestamp': check_out.isoformat(), 'direction': 'out'},
+        ])
+        self.assertEqual(data['counts'], {'updated': 1, 'duplicate': 1})
+        self.assertEqual(len(writes), 1)
+        open_record.refresh_from_db()
+        self.assertEqual(open_record.check_out_time, check_out)
+        # bulk_update neposílá signály - verze tabulky se zvyšuje ručně
+        self.assertEqual(self.client.get('/api/attendance-history/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ConcurrentPunchTests(TransactionTestCase):
+    """Many simultaneous check-ins/check-outs of the same employees: exactly one succeeds per employee."""
+    THREADS = 8
+    EMPLOYEES = 5
+
+    def setUp(self):
+        self.user = User.objects.create_user('punch')
+        self.employees = [make_employee() for _ in range(self.EMPLOYEES)]
+        # Očekávané 400 odpovědi by jinak zahltily výstup varováními
+        logger = logging.getLogger('django.request')
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.ERROR)
+
+    def punch_concurrently(self, direction):
+        results = Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                for employee in self.employees:
+                    status_code = client.post(f'/api/employees/{employee.pk}/{direction}/').status_code
+                    with lock:
+                        results[status_code] += 1
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return results
+
+    def test_one_record_per_employee(self):
+        for direction in ('check_in', 'check_out'):
+            results = self.punch_concurrently(direction)
+            self.assertEqual(results[200], self.EMPLOYEES, f'{direction}: {dict(results)}')
+            self.assertEqual(results[400], self.EMPLOYEES * (self.THREADS - 1), f'{direction}: {dict(results)}')
+
+        records = Counter(AttendanceRecord.objects.values_list('employee_id', flat=True))
+        self.assertEqual(records, Counter({employee.pk: 1 for employee in self.employees}))
+        self.assertFalse(AttendanceRecord.objects.filter(check_out_time__isnull=True).exists())
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Routing against a real second SQLite alias. The replica is a copy of the
+    primary taken in setUp, so rows written afterwards exist only on the
+    primary - a lagging replica.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Alias se přidá až po nastavení testu - runner testovací databázi repliky nezakládá
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        replica = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': f'{cls.replica_dir.name}/replica.sqlite3'}
+        # configure_settings() doplní výchozí klíče (TIME_ZONE, OPTIONS...), vyžaduje ale alias 'default'
+        connections.settings[REPLICA_ALIAS] = connections.configure_settings({'default': dict(replica)})['default']
+        cls.replica_settings = override_settings(DATABASES={**settings.DATABASES, REPLICA_ALIAS: replica})
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # "Overriding setting DATABASES" - spojení jsme nastavili sami
+            cls.replica_settings.enable()
+        cls.databases = cls.databases | {REPLICA_ALIAS}
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        cls.databases = cls.databases - {REPLICA_ALIAS}
+        cls.replica_settings.disable()
+        cls.replica_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser('admin', 'admin@example.cz', 'heslo')
+        self.employee = make_employee()
+        self.sync_replica()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync_replica(self):
+        for alias in ('default', REPLICA_ALIAS):
+            connections[alias].ensure_connection()
+        connections['default'].connection.backup(connections[REPLICA_ALIAS].connection)
+
+    def create_record(self):
+        return AttendanceRecord.objects.create(employee=self.employee, date=timezone.localdate(), check_in_time=timezone.now())
+
+    def listed_ids(self):
+        response = self.client.get('/api/attendance-history/')
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_safe_reads_use_replica(self):
+        self.create_record()
+        self.assertEqual(self.listed_ids(), [])
+        self.sync_replica()
+        self.assertEqual(len(self.listed_ids()), 1)
+
+    def test_client_reads_own_writes_after_write(self):
+        response = self.client.post(f'/api/employees/{self.employee.pk}/check_in/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.listed_ids(), [response.data['record_id']])
+
+        # Po vypršení lhůty čte klient opět z repliky
+        self.client.cookies[STICKY_COOKIE] = '0'
+        self.assertEqual(self.listed_ids(), [])
+
+    def test_failed_write_does_not_pin_to_primary(self):
+        response = self.client.post('/api/employees/999999/check_in/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_primary_db_view_reads_primary(self):
+        self.user.groups.add(Group.objects.create(name='Účetní'))
+        response = self.client.get('/api/auth/user/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['groups'], ['Účetní'])
+
+    def test_atomic_block_reads_primary(self):
+        self.create_record()
+        token = db_router._read_from_replica.set(True)
+        self.addCleanup(db_router._read_from_replica.reset, token)
+        self.assertFalse(AttendanceRecord.objects.exists())
+        with transaction.atomic():
+            self.assertTrue(AttendanceRecord.objects.exists())
@@ -1,78 +1,269 @@
 from rest_framework import viewsets, status
-from .models import Department, Employee, EmployeeReport, PerformanceReview, AttendanceRecord, Leave, Transaction, Document, TransactionCategory
+from .models import Department, Employee, EmployeeReport, PerformanceReview, AttendanceRecord, Leave, Transaction, Document, TransactionCategory, FinanceMonthlyRollup, search_key
 from .serializers import DepartmentSerializer, EmployeeSerializer, PerformanceReviewSerializer, LeaveSerializer, DocumentSerializer, UserAuthSerializer,EmployeeReportSerializer, AttendanceRecordSerializer, TransactionSerializer, TransactionCategorySerializer
+from .serializers import AttendanceRecordValuesSerializer, EmployeeReportValuesSerializer, TransactionValuesSerializer, PunchEventSerializer
+from .serializers import AttendanceFilterSerializer, AttendanceAnalyticsSerializer, EmployeeFilterSerializer, LeaveAvailabilitySerializer, DocumentFilterSerializer
+from .serializers import ReviewFilterSerializer, ReviewAnalyticsSerializer
+from .attendance import MAX_PUNCH_BATCH, attendance_analytics, ingest_punches
+from .exports import export_response
+from .finance_import import MAX_IMPORT_ROWS, ImportFormatError, check_rows, import_transactions, read_rows
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated, DjangoModelPermissions
-from django.contrib.auth import authenticate, login, logout
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated, DjangoModelPermissions
+from django.contrib.auth import authenticate, get_user_model, login, logout
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from django.db.models import Sum 
-
-class DepartmentViewSet(viewsets.ModelViewSet):
+from django.db.models import Sum, Count, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Lower, TruncMonth, TruncQuarter, TruncYear
+import copy
+import sys
+from datetime import date, timedelta
+from .query_plan import QueryPlanMixin
+from .conditional import ConditionalGetMixin, bump_table_version, conditional_view
+from .response_cache import CachedListMixin, cache_response
+from .roles import user_roles
+from .fast_read import FastReadMixin
+from .dashboard import DASHBOARD_CACHE_TIMEOUT, dashboard_snapshot
+from .bulk import MAX_BULK_ITEMS, BulkModelMixin
+from .leaves import LEAVE_DECISIONS, batch_overlaps, decide_leaves, leave_availability
+from .rollups import record_transactions
+from .reviews import review_analytics
+from .db_router import primary_db
+from .metrics import SerializerTimingMixin, metrics_report
+
+User = get_user_model()
+
+# Sloupce exportů (název ve výstupu -> lookup pro values_list)
+ATTENDANCE_EXPORT_COLUMNS = {
+    'id': 'id',
+    'employee_id': 'employee_id',
+    'first_name': 'employee__first_name',
+    'last_name': 'employee__last_name',
+    'date': 'date',
+    'check_in_time': 'check_in_time',
+    'check_out_time': 'check_out_time',
+}
+TRANSACTION_EXPORT_COLUMNS = {
+    'id': 'id',
+    'transaction_date': 'transaction_date',
+    'title': 'title',
+    'description': 'description',
+    'amount': 'amount',
+    'party_name': 'party_name',
+    'type': 'type',
+    'payment_method': 'payment_method',
+    'category': 'category__name',
+    'recorded_by': 'recorded_by__username',
+    'created_at': 'created_at',
+}
+
+
+def can_view_all_leaves(request):
+    roles = user_roles(request)
+    return roles.in_group('HR Specialist', 'CEO') or roles.has_perm('api.view_all_leaves')
+
+
+def can_view_all_transactions(request):
+    roles = user_roles(request)
+    return roles.is_staff or roles.in_group('Finance Manager') or roles.has_perm('api.can_view_all_transactions')
+
+
+def can_view_all_documents(request):
+    roles = user_roles(request)
+    return roles.is_staff or roles.in_group('Manager') or roles.has_perm('api.can_view_all_documents')
+
+
+def validated_query_params(serializer_class, request):
+    """Ověří query parametry filtru; neplatná hodnota vrací 400 místo tichého ignorování."""
+    serializer = serializer_class(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def prefix_range(prefix):
+    # Hledání prefixu jako rozsah [prefix, prefix s posledním znakem +1) - na rozdíl od LIKE využije index.
+    # Znaky U+10FFFF na konci nejde zvýšit, přenáší se na předchozí znak; prefix jen z nich horní mez nemá.
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return prefix, None
+    following = ord(stem[-1]) + 1
+    if 0xD800 <= following <= 0xDFFF:
+        following = 0xE000  # náhradní znaky (surrogates) nejdou zakódovat do UTF-8
+    return prefix, stem[:-1] + chr(following)
+
+
+def prefix_filter(field, prefix):
+    low, high = prefix_range(prefix)
+    if high is None:
+        return Q(**{f'{field}__gte': low})
+    return Q(**{f'{field}__gte': low, f'{field}__lt': high})
+
+
+class DepartmentViewSet(ConditionalGetMixin, CachedListMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
+    conditional_models = (Employee,)
+    list_cache_timeout = 300
+    list_cache_models = (Employee,)
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions] 
 
     lookup_field = 'name'
 
+    def get_queryset(self):
+        # Korelovaný poddotaz místo JOIN + GROUP BY: počítá se jen pro oddělení na stránce (index department_id).
+        employee_count = Employee.objects.filter(department=OuterRef('pk')).order_by().values('department').annotate(count=Count('pk')).values('count')
+        return super().get_queryset().annotate(employee_count=Coalesce(Subquery(employee_count), 0))
+
+    def retrieve(self, request, *args, **kwargs):
+        department = self.get_object()
+        data = self.get_serializer(department).data
+
+        # department.employees už má department v cache, department_name tedy nevyvolá dotaz
+        page = self.paginator.paginate_queryset(department.employees.all(), request, view=self)
+        employee_serializer = EmployeeSerializer(page, many=True, context=self.get_serializer_context())
+        data['employees'] = self.paginator.get_paginated_response(employee_serializer.data).data
+        return Response(data)
+
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, CachedListMixin, BulkModelMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
+    conditional_models = (Department,)
+    list_cache_timeout = 300
+    list_cache_models = (Department,)
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions]
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = validated_query_params(EmployeeFilterSerializer, self.request)
+
+        if 'department' in params:
+            queryset = queryset.filter(department_id=params['department'])
+        if 'position' in params:
+            queryset = queryset.filter(position=params['position'])
+        if 'location' in params:
+            queryset = queryset.filter(location=params['location'])
+        # Jména se porovnávají přes search_key (velikost písmen i diakritika), e-mail přes LOWER()
+        search = search_key(params.get('search', '').strip())
+        if search:
+            queryset = queryset.alias(email_lower=Lower('email')).filter(
+                prefix_filter('last_name_search', search) |
+                prefix_filter('first_name_search', search) |
+                prefix_filter('email_lower', search)
+            )
+        if 'ordering' in params:
+            queryset = queryset.order_by(params['ordering'])
+        return queryset
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def check_in(self, request, pk=None):
         employee = self.get_object()
-        date = timezone.now()
-
-        attendance_record_date = AttendanceRecord.objects.filter(employee=employee, date=date).first()
-  
-        if not attendance_record_date:
-            attendance_record = AttendanceRecord.objects.create(
-                employee=employee,
-                check_in_time=timezone.now()
-            )
-            return Response({'message': 'Check-in úspěšný!', 'record_id': attendance_record.id}, status=status.HTTP_200_OK)
-        else:
+        now = timezone.now()
+
+        # Unikátní (employee, date) hlídá databáze: při souběžných požadavcích projde jen jeden INSERT.
+        try:
+            with transaction.atomic():
+                attendance_record = AttendanceRecord.objects.create(
+                    employee=employee,
+                    check_in_time=now,
+                    date=timezone.localdate(now),
+                )
+        except IntegrityError:
             return Response({'message': 'Check-in už jste dnes provedl!'}, status=status.HTTP_400_BAD_REQUEST )
+        return Response({'message': 'Check-in úspěšný!', 'record_id': attendance_record.id}, status=status.HTTP_200_OK)
         
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def check_out(self, request, pk=None):
-        employee = self.get_object()
-        date = timezone.now()
-        attendance_record = AttendanceRecord.objects.filter(employee=employee,check_out_time__isnull=True).order_by('-check_in_time').first() 
-        
-        attendance_record_date = AttendanceRecord.objects.filter(employee=employee, date=date).first() 
-        if  attendance_record_date:
-            attendance_record.check_out_time = date
-            attendance_record.save()    
-            return Response({'message': 'Check-out úspěšný!', 'record_id': attendance_record.id}, status=status.HTTP_200_OK)
-        else:
-            return Response({'error': 'Žádný aktivní záznam příchodu k odhlášení pro tohoto zaměstnance.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            employee_id = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound()
+        now = timezone.now()
+        open_record = AttendanceRecord.objects.filter(employee_id=employee_id, date=timezone.localdate(now), check_out_time__isnull=True)
+
+        record_id = open_record.values_list('pk', flat=True).first()
+        # Podmíněný UPDATE: souběžný check-out stejného záznamu uspěje jen jednou.
+        if record_id is not None and open_record.filter(pk=record_id).update(check_out_time=now):
+            bump_table_version(AttendanceRecord)
+            return Response({'message': 'Check-out úspěšný!', 'record_id': record_id}, status=status.HTTP_200_OK)
+
+        self.get_object()  # 404 pro neexistujícího zaměstnance
+        return Response({'error': 'Žádný aktivní záznam příchodu k odhlášení pro tohoto zaměstnance.'}, status=status.HTTP_400_BAD_REQUEST)
         
-class AttendanceRecordViewSet(viewsets.ModelViewSet):
+class AttendanceRecordViewSet(ConditionalGetMixin, FastReadMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = AttendanceRecord.objects.all()
+    conditional_models = (Employee, Department)  # Department: analytics?group_by=department (department_name)
     serializer_class = AttendanceRecordSerializer
+    fast_read_serializer_class = AttendanceRecordValuesSerializer
     permission_classes = [IsAuthenticated]
+    page_size = 100
+    conditional_actions = ('list', 'retrieve', 'analytics')
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        employee_id = self.request.query_params.get('employee_id', None)
-        date_str = self.request.query_params.get('date', None) 
+    def perform_create(self, serializer):
+        # Souběžný POST pro stejný den projde validací; rozhodne unikátní omezení v DB
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise ValidationError({'check_in_time': ['Zaměstnanec už má pro tento den záznam docházky.']})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = validated_query_params(AttendanceFilterSerializer, self.request)
+
+        if 'employee_id' in params:
+            queryset = queryset.filter(employee_id=params['employee_id'])
+        if 'department' in params:
+            queryset = queryset.filter(employee__department_id=params['department'])
+        if 'date' in params:
+            queryset = queryset.filter(date=params['date'])
+        if 'date_from' in params:
+            queryset = queryset.filter(date__gte=params['date_from'])
+        if 'date_to' in params:
+            queryset = queryset.filter(date__lte=params['date_to'])
+        if params['open'] is not None:
+            queryset = queryset.filter(check_out_time__isnull=params['open'])
+        if 'ordering' in params:
+            queryset = queryset.order_by(params['ordering'])
+        return queryset
 
-        if employee_id:
-            queryset = queryset.filter(employee__id=employee_id)
-        if date_str:
-            try:
-                queryset = queryset.filter(date=date_str)
-            except ValueError:
-                pass 
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        params = validated_query_params(AttendanceAnalyticsSerializer, request)
+        queryset = self.filter_queryset(self.get_queryset())
+        results = attendance_analytics(queryset, params['group_by'], float(params['workday_hours']), params['late_after'])
+        return Response({
+            'group_by': params['group_by'],
+            'date_from': params['date_from'],
+            'date_to': params['date_to'],
+            'results': results,
+        })
 
-        return queryset
-class EmployeeReportViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.filter_queryset(self.get_queryset()), ATTENDANCE_EXPORT_COLUMNS, 'dochazka')
+
+    @action(detail=False, methods=['post'], url_path='bulk-punch')
+    def bulk_punch(self, request):
+        events = request.data
+        if not isinstance(events, list):
+            return Response({'detail': 'Očekáván seznam událostí (employee_id, timestamp, direction).'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > MAX_PUNCH_BATCH:
+            return Response({'detail': f'Maximálně {MAX_PUNCH_BATCH} událostí v jedné dávce.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = ingest_punches(events, PunchEventSerializer())
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return Response({'counts': counts, 'results': results}, status=status.HTTP_200_OK)
+
+class EmployeeReportViewSet(ConditionalGetMixin, FastReadMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = EmployeeReport.objects.all()
+    conditional_models = (Employee,)
     serializer_class = EmployeeReportSerializer
+    fast_read_serializer_class = EmployeeReportValuesSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -87,6 +278,8 @@ class EmployeeReportViewSet(viewsets.ModelViewSet):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_view(Employee, Department)
+@cache_response(60, Employee, Department)
 def company_stats(request):
     employee_count = Employee.objects.count()
     department_count = Department.objects.count()
@@ -97,6 +290,18 @@ def company_stats(request):
     }
     return Response(data)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_response(DASHBOARD_CACHE_TIMEOUT, Employee, Department, AttendanceRecord, Leave, Document, Transaction, vary='roles')
+def dashboard(request):
+    data = dashboard_snapshot(
+        timezone.localdate(),
+        leaves=can_view_all_leaves(request),
+        documents=can_view_all_documents(request),
+        finance=can_view_all_transactions(request),
+    )
+    return Response(data)
+
 @api_view(['POST'])
 @permission_classes([AllowAny]) 
 def login_view(request):
@@ -112,77 +317,220 @@ def login_view(request):
     else:
         return Response({'error': 'Neplatné přihlašovací údaje.'}, status=status.HTTP_400_BAD_REQUEST)
 
-class LeaveViewSet(viewsets.ModelViewSet):
-    queryset = Leave.objects.all().select_related("employee", "approved_by")
+class LeaveViewSet(ConditionalGetMixin, BulkModelMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
+    queryset = Leave.objects.all()
+    conditional_models = (Employee, Department, User)
+    conditional_actions = ('list', 'retrieve', 'availability')
     serializer_class = LeaveSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions] 
 
     def get_queryset(self):
         user = self.request.user
-        if user.groups.filter(name='HR Specialist').exists() or user.groups.filter(name='CEO').exists() or user.has_perm('api.view_all_leaves'): 
-            return Leave.objects.all().order_by('-start_date')
+        if can_view_all_leaves(self.request): 
+            return super().get_queryset().order_by('-start_date')
         else:
             try:
                 employee = Employee.objects.get(user=user)
-                return Leave.objects.filter(employee=employee).order_by('-start_date')
+                return super().get_queryset().filter(employee=employee).order_by('-start_date')
             except Employee.DoesNotExist:
                 return Leave.objects.none() 
 
+    def validate_bulk(self, serializer):
+        ranges = []
+        for index, (item, attrs) in enumerate(zip(serializer.initial_data, serializer.validated_data)):
+            instance = serializer.instance[item['id']] if serializer.instance is not None else None
+            if instance is not None and instance.status not in Leave.BLOCKING_STATUSES:
+                continue
+            employee_id = attrs['employee'].pk if 'employee' in attrs else instance.employee_id
+            start_date = attrs.get('start_date', getattr(instance, 'start_date', None))
+            end_date = attrs.get('end_date', getattr(instance, 'end_date', None))
+            ranges.append((index, employee_id, start_date, end_date))
+        return batch_overlaps(ranges, batch_ids=list(serializer.instance or ()))
+
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        params = validated_query_params(LeaveAvailabilitySerializer, request)
+        queryset = self.get_queryset()
+        if 'department' in params:
+            queryset = queryset.filter(employee__department_id=params['department'])
+        statuses = Leave.BLOCKING_STATUSES if params['include_pending'] else ('APPROVED',)
+        return Response({
+            'date_from': params['date_from'],
+            'date_to': params['date_to'],
+            'days': leave_availability(queryset, params['date_from'], params['date_to'], statuses),
+        })
+
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None): 
         leave = self.get_object()
-        if not request.user.has_perm('api.can_approve_leave'):
+        if not user_roles(request).has_perm('api.can_approve_leave'):
             return Response({'detail': 'Nemáte oprávnění schvalovat žádosti o dovolenou.'}, status=status.HTTP_403_FORBIDDEN)
         
-        if leave.status == 'PENDING':
-            leave.status = 'APPROVED'
-            leave.approved_by = request.user
-            leave.save()
+        result, = decide_leaves(self.get_queryset(), [leave.pk], LEAVE_DECISIONS['approve'], request.user)
+        if result['status'] == 'approved':
             return Response({'status': 'Dovolená schválena'}, status=status.HTTP_200_OK)
-        return Response({'status': 'Dovolená nemůže být schválena (aktuální stav: ' + leave.status + ')'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'status': 'Dovolená nemůže být schválena (aktuální stav: ' + result.get('current_status', leave.status) + ')'}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
         leave = self.get_object()
-        if not request.user.has_perm('api.can_approve_leave'):
+        if not user_roles(request).has_perm('api.can_approve_leave'):
             return Response({'detail': 'Nemáte oprávnění zamítat žádosti o dovolenou.'}, status=status.HTTP_403_FORBIDDEN)
         
-        if leave.status == 'PENDING':
-            leave.status = 'REJECTED'
-            leave.approved_by = request.user
-            leave.save()
+        result, = decide_leaves(self.get_queryset(), [leave.pk], LEAVE_DECISIONS['reject'], request.user)
+        if result['status'] == 'rejected':
             return Response({'status': 'Dovolená zamítnuta'}, status=status.HTTP_200_OK)
-        return Response({'status': 'Dovolená nemůže být zamítnuta (aktuální stav: ' + leave.status + ')'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'status': 'Dovolená nemůže být zamítnuta (aktuální stav: ' + result.get('current_status', leave.status) + ')'}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='bulk-approve')
+    def bulk_approve(self, request):
+        return self.bulk_decide(request, 'approve')
 
-class TransactionCategoryViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'], url_path='bulk-reject')
+    def bulk_reject(self, request):
+        return self.bulk_decide(request, 'reject')
+
+    def bulk_decide(self, request, decision):
+        if not user_roles(request).has_perm('api.can_approve_leave'):
+            return Response({'detail': 'Nemáte oprávnění schvalovat žádosti o dovolenou.'}, status=status.HTTP_403_FORBIDDEN)
+        ids = request.data
+        if not isinstance(ids, list) or not ids:
+            return Response({'detail': 'Očekáván neprázdný seznam id žádostí.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_BULK_ITEMS:
+            return Response({'detail': f'Maximálně {MAX_BULK_ITEMS} žádostí v jedné dávce.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = decide_leaves(self.get_queryset(), ids, LEAVE_DECISIONS[decision], request.user)
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return Response({'counts': counts, 'results': results}, status=status.HTTP_200_OK)
+
+def income_expense_sums(amount='amount'):
+    return {
+        'income': Sum(amount, filter=Q(type='INCOME')),
+        'expense': Sum(amount, filter=Q(type='EXPENSE')),
+    }
+
+
+PERIOD_TRUNCS = {'month': TruncMonth, 'quarter': TruncQuarter, 'year': TruncYear}
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+MAX_SUMMARY_PERIODS = 240
+
+
+def month_bounds(year, month):
+    start = date(year, month, 1)
+    return start, next_period_start(start, 'month')
+
+
+def parse_month(value):
+    year, month = value.split('-')
+    return date(int(year), int(month), 1)
+
+
+def period_start(day, period):
+    month = (day.month - 1) // PERIOD_MONTHS[period] * PERIOD_MONTHS[period] + 1
+    return date(day.year, month, 1)
+
+
+def next_period_start(day, period):
+    months = day.year * 12 + day.month - 1 + PERIOD_MONTHS[period]
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def period_starts(start, last, period):
+    periods = []
+    while start <= last and len(periods) <= MAX_SUMMARY_PERIODS:
+        periods.append(start)
+        start = next_period_start(start, period)
+    return periods
+
+
+class TransactionCategoryViewSet(ConditionalGetMixin, CachedListMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = TransactionCategory.objects.all().order_by('name')
+    list_cache_timeout = 300
     serializer_class = TransactionCategorySerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions]
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(ConditionalGetMixin, FastReadMixin, BulkModelMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all()
+    conditional_models = (TransactionCategory, User)
     serializer_class = TransactionSerializer
+    fast_read_serializer_class = TransactionValuesSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions] 
+    page_size = 100
+
+    def can_view_all(self):
+        return can_view_all_transactions(self.request)
 
     def get_queryset(self):
         user = self.request.user
-        if user.is_staff or user.groups.filter(name='Finance Manager').exists() or \
-           user.has_perm('api.can_view_all_transactions'):
-            return Transaction.objects.all().order_by('-transaction_date', '-created_at')
+        if self.can_view_all():
+            return super().get_queryset().order_by('-transaction_date', '-created_at')
         
-        return Transaction.objects.filter(recorded_by=user).order_by('-transaction_date', '-created_at')
+        return super().get_queryset().filter(recorded_by=user).order_by('-transaction_date', '-created_at')
+
+    def perform_bulk_create(self, serializer):
+        serializer.save(recorded_by=self.request.user)
+        # bulk_create neposílá signály - souhrny se upraví hromadně
+        record_transactions(serializer.instance, 1)
+        bump_table_version(Transaction)
+
+    def perform_bulk_update(self, serializer):
+        previous = [copy.copy(txn) for txn in serializer.instance.values()]
+        serializer.save()
+        record_transactions(previous, -1)
+        record_transactions(serializer.instance, 1)
+        bump_table_version(Transaction)
+
+    def get_summary_source(self):
+        """
+        (queryset, amount field, date field) pro souhrny. Kdo vidí všechny transakce,
+        čte z předpočítaného FinanceMonthlyRollup; ostatní agregují jen své transakce.
+        """
+        if self.can_view_all():
+            return FinanceMonthlyRollup.objects.order_by(), 'total_amount', 'month'
+        return self.get_queryset().order_by(), 'amount', 'transaction_date'
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.filter_queryset(self.get_queryset()), TRANSACTION_EXPORT_COLUMNS, 'transakce')
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, JSONParser])
+    def import_file(self, request):
+        # Soubor (multipart "file", formát podle přípony nebo "format") nebo JSON seznam v těle
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                file_format = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+                rows = read_rows(upload.read(), file_format)
+            elif isinstance(request.data, list):
+                rows = check_rows(request.data)
+            else:
+                return Response({'detail': 'Očekáván soubor "file" (CSV/JSON) nebo JSON seznam řádků.'}, status=status.HTTP_400_BAD_REQUEST)
+        except ImportFormatError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(rows) > MAX_IMPORT_ROWS:
+            return Response({'detail': f'Maximálně {MAX_IMPORT_ROWS} řádků v jednom importu.'}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.query_params.get('dry_run', '')).lower() in ('1', 'true')
+        report = import_transactions(rows, recorded_by=request.user, dry_run=dry_run)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'], url_path='summary')
     def summary(self, request):
-        user = request.user
-        queryset = self.get_queryset()
-
-        total_income = queryset.filter(type='INCOME').aggregate(Sum('amount'))['amount__sum'] or 0
-        total_expense = queryset.filter(type='EXPENSE').aggregate(Sum('amount'))['amount__sum'] or 0
+        queryset, amount, _ = self.get_summary_source()
+
+        # Jediný dotaz: rozpad podle kategorií, celkové součty se dopočítají z něj.
+        category_summary = list(
+            queryset
+            .values('category__name', 'type')
+            .annotate(total=Sum(amount))
+            .order_by('category__name')
+        )
+        total_income = sum(row['total'] for row in category_summary if row['type'] == 'INCOME')
+        total_expense = sum(row['total'] for row in category_summary if row['type'] == 'EXPENSE')
         net_balance = total_income - total_expense
 
-        category_summary = queryset.values('category__name', 'type').annotate(total=Sum('amount')).order_by('category__name')
-
         return Response({
             'total_income': total_income,
             'total_expense': total_expense,
@@ -201,16 +549,19 @@ class TransactionViewSet(viewsets.ModelViewSet):
         try:
             year = int(year)
             month = int(month)
+            start, end = month_bounds(year, month)
         except ValueError:
             return Response({'detail': 'Invalid year or month format.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        queryset = self.get_queryset().filter(
-            transaction_date__year=year,
-            transaction_date__month=month
-        )
+        # Polootevřený interval místo transaction_date__year/__month, aby šel použít index.
+        queryset, amount, date_field = self.get_summary_source()
+        totals = queryset.filter(**{
+            f'{date_field}__gte': start,
+            f'{date_field}__lt': end,
+        }).aggregate(**income_expense_sums(amount))
 
-        monthly_income = queryset.filter(type='INCOME').aggregate(Sum('amount'))['amount__sum'] or 0
-        monthly_expense = queryset.filter(type='EXPENSE').aggregate(Sum('amount'))['amount__sum'] or 0
+        monthly_income = totals['income'] or 0
+        monthly_expense = totals['expense'] or 0
         monthly_net_balance = monthly_income - monthly_expense
 
         return Response({
@@ -220,32 +571,127 @@ class TransactionViewSet(viewsets.ModelViewSet):
             'monthly_expense': monthly_expense,
             'monthly_net_balance': monthly_net_balance,
         })
-class DocumentViewSet(viewsets.ModelViewSet):
+
+    @action(detail=False, methods=['get'], url_path='range-summary')
+    def range_summary(self, request):
+        period = request.query_params.get('period', 'month')
+        if period not in PERIOD_TRUNCS:
+            return Response({'detail': f"Invalid period. Use one of: {', '.join(PERIOD_TRUNCS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start = parse_month(request.query_params['from'])
+            last = parse_month(request.query_params.get('to') or request.query_params['from'])
+        except KeyError:
+            return Response({'detail': "Parameter 'from' (YYYY-MM) is required."}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'detail': 'Invalid month format, expected YYYY-MM.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        start = period_start(start, period)
+        periods = period_starts(start, last, period)
+        if not periods:
+            return Response({'detail': "'from' must not be after 'to'."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(periods) > MAX_SUMMARY_PERIODS:
+            return Response({'detail': f'At most {MAX_SUMMARY_PERIODS} periods per request.'}, status=status.HTTP_400_BAD_REQUEST)
+        end = next_period_start(periods[-1], period)
+
+        queryset, amount, date_field = self.get_summary_source()
+        rows = (
+            queryset
+            .filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end})
+            .annotate(period_start=PERIOD_TRUNCS[period](date_field))
+            .values('period_start')
+            .annotate(**income_expense_sums(amount))
+        )
+        totals = {row['period_start']: row for row in rows}
+
+        results = []
+        for first_day in periods:
+            row = totals.get(first_day, {})
+            income = row.get('income') or 0
+            expense = row.get('expense') or 0
+            results.append({
+                'period_start': first_day,
+                'year': first_day.year,
+                'month': first_day.month,
+                'income': income,
+                'expense': expense,
+                'net_balance': income - expense,
+            })
+
+        return Response({'period': period, 'from': start, 'to': end - timedelta(days=1), 'results': results})
+
+class DocumentViewSet(ConditionalGetMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = Document.objects.all()
+    conditional_models = (User,)
+    conditional_daily = True  # days_to_expiry, is_expired a filtry expiring_within/expired
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions] 
 
     def get_queryset(self):
         user = self.request.user
-        if user.is_staff or user.groups.filter(name='Manager').exists() or \
-           user.has_perm('api.can_view_all_documents'):
-            return Document.objects.all().order_by('-uploaded_at')
+        queryset = super().get_queryset().with_expiry()
+        if can_view_all_documents(self.request):
+            return queryset.order_by('-uploaded_at')
         
-        return Document.objects.filter(employee=user).order_by('-uploaded_at')
+        return queryset.filter(employee=user).order_by('-uploaded_at')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = validated_query_params(DocumentFilterSerializer, self.request)
+
+        if 'document_type' in params:
+            queryset = queryset.filter(document_type=params['document_type'])
+        if 'expiring_within' in params:
+            queryset = queryset.expiring_within(params['expiring_within'])
+        if params['expired'] is True:
+            queryset = queryset.expired()
+        elif params['expired'] is False:
+            queryset = queryset.filter(expired=False)
+        return queryset
 
-class PerformanceReviewViewSet(viewsets.ModelViewSet):
+class PerformanceReviewViewSet(ConditionalGetMixin, QueryPlanMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = PerformanceReview.objects.all()
+    conditional_models = (Employee, Department, User)
+    conditional_actions = ('list', 'retrieve', 'analytics')
     serializer_class = PerformanceReviewSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions] 
 
     def get_queryset(self):
         user = self.request.user
+        roles = user_roles(self.request)
+        if roles.is_staff or roles.in_group('Manager') or roles.has_perm('api.can_view_all_documents'):
+            return super().get_queryset().order_by('-date')
         
-        if user.is_staff or user.groups.filter(name='Manager').exists() or \
-           user.has_perm('api.can_view_all_documents'):
-            return PerformanceReview.objects.all().order_by('-date')
-        
-        return PerformanceReview.objects.filter(employee=user).order_by('-date')
+        return super().get_queryset().filter(employee__user=user).order_by('-date')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = validated_query_params(ReviewFilterSerializer, self.request)
+
+        if 'employee_id' in params:
+            queryset = queryset.filter(employee_id=params['employee_id'])
+        if 'department' in params:
+            queryset = queryset.filter(employee__department_id=params['department'])
+        if 'period' in params:
+            queryset = queryset.filter(period=params['period'])
+        if 'date_from' in params:
+            queryset = queryset.filter(date__gte=params['date_from'])
+        if 'date_to' in params:
+            queryset = queryset.filter(date__lte=params['date_to'])
+        # score je uložený sloupec s indexem - top/bottom hodnocení je jeden indexovaný dotaz
+        if 'min_score' in params:
+            queryset = queryset.filter(score__gte=params['min_score'])
+        if 'max_score' in params:
+            queryset = queryset.filter(score__lte=params['max_score'])
+        if 'ordering' in params:
+            queryset = queryset.order_by(params['ordering'])
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        params = validated_query_params(ReviewAnalyticsSerializer, request)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({'group_by': params['group_by'], **review_analytics(queryset, params['group_by'])})
     
 
 @api_view(['POST'])
@@ -254,9 +700,17 @@ def logout_view(request):
     logout(request) 
     return Response({'message': 'Odhlášení úspěšné.'}, status=status.HTTP_200_OK)
 
+# Práva přihlášeného uživatele nesmí zaostávat za změnou skupin, kterou provedl někdo jiný
+@primary_db
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_info(request):
-    user_serializer = UserAuthSerializer(request.user)
+    user_serializer = UserAuthSerializer(request.user, context={'request': request})
 
-    return Response(user_serializer.data, status=status.HTTP_200_OK)  
\ No newline at end of file
+    return Response(user_serializer.data, status=status.HTTP_200_OK)  
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    # Latence a počty dotazů podle tras, jen za tento proces (app_system/metrics.py)
+    return Response(metrics_report())
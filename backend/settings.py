@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,12 +47,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app_system.metrics.RequestMetricsMiddleware',  # první - Server-Timing a /api/_metrics měří celý požadavek
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Přidat toto! Před CommonMiddleware
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app_system.db_router.ReplicaRoutingMiddleware',  # bezpečná čtení -> replika (pokud je nastavená)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -82,9 +86,24 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Testovací databáze v souboru, ne sdílená paměť: souběžné testy (ConcurrentPunchTests)
+        # potřebují vlastní spojení na vlákno s čekáním na zámek místo "database table is locked".
+        # Soubor leží v dočasném adresáři, ne v repozitáři.
+        'TEST': {'NAME': Path(tempfile.gettempdir()) / 'companysite_test_db.sqlite3'},
     }
 }
 
+# Repliku pro čtení zapne DJANGO_SQLITE_REPLICA=<cesta k souboru>. Lokálně ji
+# z primární databáze plní manage.py sync_replica (náhrada replikace).
+if os.environ.get('DJANGO_SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DJANGO_SQLITE_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['app_system.db_router.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -127,6 +146,15 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Snímky rolí a cache odpovědí (app_system/roles.py, app_system/response_cache.py).
+# Při více procesech bez Redisu lze použít sdílený 'django.core.cache.backends.filebased.FileBasedCache'.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'companysite',
+    }
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication', # Používáme Session Authentication
@@ -135,7 +163,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny', # Dočasně povolit vše, dokud nenastavíme přihlášení
         # 'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Keyset (cursor) stránkování podle Meta.ordering - viz app_system/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'app_system.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
 # Konfigurace pro CORS - Povolte origin vašeho Vite (React) dev serveru
@@ -0,0 +1,61 @@
+"""
+Production profile: DJANGO_SETTINGS_MODULE=backend.settings_production
+
+Everything comes from backend/settings.py; this file only overrides what
+differs in production, mainly SQLite tuning for concurrent workers.
+Contention benchmark: manage.py benchmark_sqlite_contention.
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DEBUG = False
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',') if host]
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)  # noqa: F405
+
+# PRAGMA pro každé nové spojení (Django je pouští z OPTIONS['init_command']):
+# - WAL: čtení neblokuje zápis a naopak, zapisovat může vždy jen jeden
+# - synchronous=NORMAL: ve WAL bezpečné proti poškození, fsync jen při checkpointu
+# - mmap_size / cache_size: čtení z mapované paměti, 64 MB page cache na spojení
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # záporné = v KiB
+    'temp_store': 'MEMORY',
+}
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # busy_timeout: při zamčené databázi čekat až 20 s místo okamžité chyby "database is locked"
+            'timeout': 20,
+            # BEGIN IMMEDIATE: transakce bere zámek pro zápis hned na začátku. S výchozím DEFERRED
+            # by čtení -> zápis uvnitř transakce při souběhu selhalo bez čekání na busy_timeout.
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Trvalá spojení: PRAGMA a page cache se nenastavují znovu při každém požadavku
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+if os.environ.get('DJANGO_SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DJANGO_SQLITE_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Verze tabulek a cache odpovědí musí být sdílené mezi worker procesy
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'cache'),
+    }
+}
@@ -19,7 +19,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from app_system.views import (
-    EmployeeViewSet, DepartmentViewSet, company_stats,
+    EmployeeViewSet, DepartmentViewSet, company_stats, dashboard, request_metrics,
     login_view, logout_view, user_info , EmployeeReportViewSet, AttendanceRecordViewSet, 
     LeaveViewSet, TransactionViewSet, TransactionCategoryViewSet, DocumentViewSet, PerformanceReviewViewSet
 )
@@ -39,6 +39,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)), 
     path('api/company-stats/', company_stats, name='company_stats'),
+    path('api/dashboard/', dashboard, name='dashboard'),
+    path('api/_metrics', request_metrics, name='metrics'),
      # --- Autentizační URL ---
     path('api/auth/login/', login_view, name='login'),
     path('api/auth/logout/', logout_view, name='logout'),
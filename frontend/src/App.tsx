@@ -115,7 +115,7 @@ function App() {
         </ul>
       </nav>
       <Routes>
-        <Route path="/" element={<Home />} /> 
+        <Route path="/" element={<Home isAuthenticated={isAuthenticated} />} /> 
         <Route path="/login" element={<LoginForm onLoginSuccess={handleLoginSuccess} />} />
         {isAuthenticated ? (
         <>
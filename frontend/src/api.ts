@@ -1,5 +1,5 @@
-import type { Employee, Leave, NewLeaveData, Department, CompanyStats, EmployeeReport, 
-AttendanceRecord, DepartmentDetailsType, Document, PerformanceReviewType, Transaction, TransactionCategory, TransactionSummary, MonthlyTransactionSummary  } from './types';
+import type { Paginated, Employee, EmployeeFilters, AttendanceFilters, AttendanceAnalytics, Leave, LeaveAvailability, NewLeaveData, Department, CompanyStats, DashboardSnapshot, EmployeeReport, 
+AttendanceRecord, DepartmentDetailsType, Document, DocumentFilters, PerformanceReviewType, ReviewFilters, ReviewAnalytics, Transaction, TransactionCategory, TransactionSummary, MonthlyTransactionSummary, RangeTransactionSummary  } from './types';
 
 
 const API_BASE_URL = '/api';
@@ -57,8 +57,40 @@ async function authenticatedFetch<T>(url: string, method: string = 'GET', body?:
     return await response.json() as T; 
 }
 
+// Odkazy next/previous z backendu jsou absolutní; přes Vite proxy je potřeba jen cesta.
+function toRelativeUrl(link: string): string {
+    const url = new URL(link, window.location.origin);
+    return url.pathname + url.search;
+}
+
+// Seznamové endpointy jsou stránkované kurzorem; obrazovky načítají po stránkách přes odkaz `next`.
+export function getNextPage<T>(link: string): Promise<Paginated<T>> {
+    return authenticatedFetch<Paginated<T>>(toRelativeUrl(link));
+}
+
+// Číselníky do výběrů (oddělení, kategorie...) - jedna stránka s maximální velikostí, kterou server povolí.
+const LOOKUP_PAGE_SIZE = 1000;
+
+async function fetchLookup<T>(path: string, params?: URLSearchParams): Promise<T[]> {
+    const query = new URLSearchParams(params);
+    query.set('page_size', String(LOOKUP_PAGE_SIZE));
+    const page = await authenticatedFetch<Paginated<T>>(`${path}?${query.toString()}`);
+    return page.results;
+}
+
+// Filtry pro query string; prázdné hodnoty se vynechají (backend je jinak odmítne jako neplatné).
+function toSearchParams(filters?: object): URLSearchParams {
+    const params = new URLSearchParams();
+    Object.entries(filters ?? {}).forEach(([key, value]) => {
+        if (value !== undefined && value !== null && value !== '') params.append(key, String(value));
+    });
+    return params;
+}
+
 const api = {
     get: <T>(path: string, params?: URLSearchParams): Promise<T> => authenticatedFetch(path + (params ? `?${params.toString()}` : '')),
+    page: <T>(path: string, params?: URLSearchParams): Promise<Paginated<T>> => authenticatedFetch(path + (params ? `?${params.toString()}` : '')),
+    lookup: <T>(path: string, params?: URLSearchParams): Promise<T[]> => fetchLookup<T>(path, params),
     post: <T>(path: string, data: any): Promise<T> => authenticatedFetch(path, 'POST', data),
     put: <T>(path: string, data: any): Promise<T> => authenticatedFetch(path, 'PUT', data),
     delete: <T>(path: string): Promise<T> => authenticatedFetch(path, 'DELETE'),
@@ -67,7 +99,8 @@ const api = {
 
 
 export const employeesApi = {
-    getAll: () => api.get<Employee[]>(`${API_BASE_URL}/employees/`), 
+    getAll: (filters?: EmployeeFilters) => api.page<Employee>(`${API_BASE_URL}/employees/`, toSearchParams(filters)), 
+    getOptions: () => api.lookup<Employee>(`${API_BASE_URL}/employees/`, toSearchParams({ ordering: 'last_name' })), 
     create: (employee: Omit<Employee, 'id' | 'department_name'>) => api.post<Employee>(`${API_BASE_URL}/employees/`, employee),
     update: (id: number, employee: Partial<Omit<Employee, 'id' | 'department_name'>>) => api.put<Employee>(`${API_BASE_URL}/employees/${id}/`, employee),
     remove: (id: number) => api.delete<void>(`${API_BASE_URL}/employees/${id}/`),
@@ -77,25 +110,36 @@ export const employeesApi = {
 };
 
 export const departmentsApi = {
-    getAll: () => api.get<Department[]>(`${API_BASE_URL}/departments/`), 
-    getByDepartmentName: (name: string) => api.get<DepartmentDetailsType>(`${API_BASE_URL}/departments/${name}/`)
+    getAll: () => api.lookup<Department>(`${API_BASE_URL}/departments/`), 
+    getByDepartmentName: (name: string) => api.get<DepartmentDetailsType>(`${API_BASE_URL}/departments/${name}/`),
+    getEmployeesPage: (link: string) => api.get<DepartmentDetailsType>(toRelativeUrl(link))
 };
 
 export const reportsApi = {
-    getByEmployeeId: (employeeId: number) => api.get<EmployeeReport[]>(`${API_BASE_URL}/reports/?employee_id=${employeeId}`), 
+    getByEmployeeId: (employeeId: number) => api.page<EmployeeReport>(`${API_BASE_URL}/reports/?employee_id=${employeeId}`), 
     create: (employeeId: number, content: string) => api.post<EmployeeReport>(`${API_BASE_URL}/reports/`, { content, employee: employeeId }), 
     update: (reportId: number, content: string) => api.put<EmployeeReport>(`${API_BASE_URL}/reports/${reportId}/`, { content }),
     remove: (reportId: number) => api.delete<void>(`${API_BASE_URL}/reports/${reportId}/`), 
 };
 
 export const attendanceApi = {
-    getHistory: (employeeId?: number, date?: string) => { 
-        const params = new URLSearchParams();
+    getHistory: (employeeId?: number, date?: string, filters?: AttendanceFilters) => { 
+        const params = toSearchParams(filters);
         if (employeeId) params.append('employee_id', employeeId.toString());
         if (date) params.append('date', date);
-        return api.get<AttendanceRecord[]>(`${API_BASE_URL}/attendance-history/`, params);
+        return api.page<AttendanceRecord>(`${API_BASE_URL}/attendance-history/`, params);
+    },
+    exportHistoryUrl: (filters?: AttendanceFilters & { employee_id?: number }, format: 'csv' | 'ndjson' = 'csv') =>
+        `${API_BASE_URL}/attendance-history/export/?${toSearchParams({ ...filters, export_format: format }).toString()}`,
+    getAnalytics: (dateFrom: string, dateTo: string, groupBy: AttendanceAnalytics['group_by'] = 'employee', filters?: AttendanceFilters) => {
+        const params = toSearchParams({ ...filters, date_from: dateFrom, date_to: dateTo, group_by: groupBy });
+        return api.get<AttendanceAnalytics>(`${API_BASE_URL}/attendance-history/analytics/`, params);
+    },
+    getLeaves: () => api.page<Leave>(`${API_BASE_URL}/leaves/`), 
+    getLeaveAvailability: (dateFrom: string, dateTo: string, filters?: { department?: number; include_pending?: boolean }) => {
+        const params = toSearchParams({ ...filters, date_from: dateFrom, date_to: dateTo });
+        return api.get<LeaveAvailability>(`${API_BASE_URL}/leaves/availability/`, params);
     },
-    getLeaves: () => api.get<Leave[]>(`${API_BASE_URL}/leaves/`), 
     createLeave: (leaveData: NewLeaveData) => api.post<Leave>(`${API_BASE_URL}/leaves/`, leaveData), 
     approveLeave: (leaveId: number) => api.post<string>(`${API_BASE_URL}/leaves/${leaveId}/approve/`, null), 
     rejectLeave: (leaveId: number) => api.post<string>(`${API_BASE_URL}/leaves/${leaveId}/reject/`, null), 
@@ -107,20 +151,21 @@ export const authApi = {
     getUserInfo: () => api.get<any>(`${API_BASE_URL}/auth/user/`), 
 };
 export const companyStats = {
-  getCompanyStats:  () => api.get<CompanyStats>(`${API_BASE_URL}/company-stats/`)
+  getCompanyStats:  () => api.get<CompanyStats>(`${API_BASE_URL}/company-stats/`),
+  getDashboard: () => api.get<DashboardSnapshot>(`${API_BASE_URL}/dashboard/`),
 }
 
 export const documentApi = {
-  getAll: () => api.get<Document[]>('/api/documents/'),
+  getAll: (filters?: DocumentFilters) => api.page<Document>('/api/documents/', toSearchParams(filters)),
   getDocument: (id: number) => api.get<Document>(`/api/documents/${id}`),
 }
 
 export const financeApi = {
-    getAllCategories: () => api.get<TransactionCategory[]>('/api/transaction-categories/'),
+    getAllCategories: () => api.lookup<TransactionCategory>('/api/transaction-categories/'),
     createCategory: (data: Omit<TransactionCategory, 'id'>) => api.post<TransactionCategory>('/api/transaction-categories/', data),
 
     // Transactions
-    getAllTransactions: () => api.get<Transaction[]>('/api/transactions/'),
+    getAllTransactions: () => api.page<Transaction>('/api/transactions/'),
     getTransaction: (id: number) => api.get<Transaction>(`/api/transactions/${id}/`),
     createTransaction: (data: Omit<Transaction, 'id' | 'category_name' | 'recorded_by' | 'recorded_by_details' | 'created_at' | 'updated_at'>) => api.post<Transaction>('/api/transactions/', data),
     updateTransaction: (id: number, data: Partial<Transaction>) => api.patch<Transaction>(`/api/transactions/${id}/`, data),
@@ -128,10 +173,16 @@ export const financeApi = {
 
     getTransactionsSummary: () => api.get<TransactionSummary>('/api/transactions/summary/'),
     getMonthlyTransactionsSummary: (year: number, month: number) => api.get<MonthlyTransactionSummary>(`/api/transactions/monthly-summary/?year=${year}&month=${month}`),
+    // Stahuje se přímo prohlížečem (odkaz), odpověď se na serveru streamuje
+    exportTransactionsUrl: (format: 'csv' | 'ndjson' = 'csv') => `/api/transactions/export/?export_format=${format}`,
+    // from/to ve formátu YYYY-MM, všechna období jedním požadavkem
+    getRangeTransactionsSummary: (from: string, to: string, period: 'month' | 'quarter' | 'year' = 'month') => api.get<RangeTransactionSummary>('/api/transactions/range-summary/', new URLSearchParams({ from, to, period })),
 };
 
 export const performanceReviewApi = {
-    getAll: () => api.get<PerformanceReviewType[]>('/api/performance-reviews/'),
+    getAll: (filters?: ReviewFilters) => api.page<PerformanceReviewType>('/api/performance-reviews/', toSearchParams(filters)),
+    getAnalytics: (groupBy: ReviewAnalytics['group_by'] = 'employee', filters?: ReviewFilters) =>
+        api.get<ReviewAnalytics>('/api/performance-reviews/analytics/', toSearchParams({ ...filters, group_by: groupBy })),
 }
 
 export const getCsrfToken = async (): Promise<string | null> => {
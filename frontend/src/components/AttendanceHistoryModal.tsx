@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import { attendanceApi  } from '../api';
+import { attendanceApi, getNextPage } from '../api';
 import type { AttendanceRecord } from '../types';
 
 interface AttendanceHistoryModalProps {
@@ -9,6 +9,7 @@ interface AttendanceHistoryModalProps {
 
 const AttendanceHistoryModal: React.FC<AttendanceHistoryModalProps> = ({ employeeId, onClose }) => {
     const [attendanceRecords, setAttendanceRecords] = useState<AttendanceRecord[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [filterDate, setFilterDate] = useState('');
@@ -20,7 +21,8 @@ const AttendanceHistoryModal: React.FC<AttendanceHistoryModalProps> = ({ employe
             setLoading(true);
             setError(null);
             const data = await attendanceApi .getHistory(employeeId, filterDate || undefined);
-            setAttendanceRecords(data);
+            setAttendanceRecords(data.results);
+            setNextPage(data.next);
         } catch (err: any) {
             setError("Nepodařilo se načíst historii docházky.");
             console.error(err);
@@ -29,6 +31,18 @@ const AttendanceHistoryModal: React.FC<AttendanceHistoryModalProps> = ({ employe
         }
     };
 
+    const loadMoreAttendance = async () => {
+        if (!nextPage) return;
+        try {
+            const data = await getNextPage<AttendanceRecord>(nextPage);
+            setAttendanceRecords(prev => [...prev, ...data.results]);
+            setNextPage(data.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další záznamy docházky.");
+            console.error(err);
+        }
+    };
+
     useEffect(() => {
         loadAttendance();
     }, [employeeId, filterDate]);
@@ -48,6 +62,7 @@ const AttendanceHistoryModal: React.FC<AttendanceHistoryModalProps> = ({ employe
             <div className="modal-content"  ref={modalContentRef}>
                 <button onClick={onClose} className="modal-close-button">Zavřít</button>
                 <h3>Historie docházky</h3>
+                <a href={attendanceApi.exportHistoryUrl({ employee_id: employeeId })} className="btn-export" download>Export CSV</a>
                 {error && <p className="error-message">{error}</p>}
 
                 <div className="filter-section">
@@ -84,6 +99,9 @@ const AttendanceHistoryModal: React.FC<AttendanceHistoryModalProps> = ({ employe
                 ))}
             </ul>
             )}
+            {!loading && nextPage && (
+                <button onClick={loadMoreAttendance}>Načíst další</button>
+            )}
         </div>
         </div>
     );
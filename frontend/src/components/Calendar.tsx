@@ -1,11 +1,14 @@
-import { useState, useEffect, useMemo, useCallback  } from 'react';
-import type { CalendarDay, Leave, LeaveDateCalendar } from '../types';
+import { useState, useEffect, useMemo } from 'react';
+import type { CalendarDay, LeaveAvailabilityDay } from '../types';
 import { attendanceApi } from '../api';
 
+const toIsoDate = (date: Date): string =>
+    `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
 const Calendar: React.FC = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
-    const [leaves, setLeaves] = useState<Leave[]>();
+    const [availability, setAvailability] = useState<LeaveAvailabilityDay[]>([]);
 
     const [currentDate, setCurrentDate] = useState(new Date());
     const year = currentDate.getFullYear();
@@ -16,11 +19,15 @@ const Calendar: React.FC = () => {
     const today = new Date();
 
     useEffect(() => {
-        const fetchLeavesAndEmployees = async () => {
+        // Server vrací nepřítomnosti po dnech jen pro zobrazený měsíc
+        const fetchAvailability = async () => {
             try {
-                const fetchedLeaves = await attendanceApi.getLeaves();
-                setLeaves(fetchedLeaves);
-
+                const result = await attendanceApi.getLeaveAvailability(
+                    toIsoDate(new Date(year, month, 1)),
+                    toIsoDate(new Date(year, month + 1, 0)),
+                );
+                setAvailability(result.days);
+                setError(null);
             } catch (err) {
                 console.error("Chyba při načítání dat:", err);
                 setError("Nepodařilo se načíst data o dovolených nebo zaměstnancích.");
@@ -28,46 +35,20 @@ const Calendar: React.FC = () => {
                 setLoading(false);
             }
         };
-        fetchLeavesAndEmployees();
-    }, []);
-
-    const getLeavesFormatted = useMemo((): LeaveDateCalendar[] => {
-        const getDates: LeaveDateCalendar[] = [];
-        if (leaves && leaves.length > 0) {
-            for (const element of leaves) {
-                if (element.status === "APPROVED") {
-                    getDates.push({
-                        start: new Date(element.start_date),
-                        end: new Date(element.end_date),
-                        type: element.leave_type,
-                    });
-                }
-            }
-        }
-        return getDates;
-    }, [leaves]);
-
-    const getDatesBetween = useCallback((startDate: Date, endDate: Date): string[] => {
-        const dates: string[] = [];
-        const current = new Date(startDate);
-        while (current <= endDate) {
-            dates.push(current.toDateString());
-            current.setDate(current.getDate() + 1);
-        }
-        return dates;
-    }, []);
-
-    const getAllEvenetDates = useMemo((): string[][] => {
-        const newData: string[][] = [];
-        if (getLeavesFormatted && getLeavesFormatted.length > 0) {
-            for (const element of getLeavesFormatted) {
-                const getAllLeavesDates = getDatesBetween(element.start, element.end);
-                newData.push(getAllLeavesDates);
+        fetchAvailability();
+    }, [year, month]);
+
+    const absencesByDate = useMemo((): Map<string, string> => {
+        const absences = new Map<string, string>();
+        for (const day of availability) {
+            if (day.absent_count > 0) {
+                const names = day.departments.flatMap(department =>
+                    department.absences.map(absence => `${absence.employee_name} (${absence.leave_type})`));
+                absences.set(day.date, names.join(', '));
             }
         }
-        return newData;
-    }, [getLeavesFormatted, getDatesBetween]); 
-
+        return absences;
+    }, [availability]);
 
     const generateCalendar = useMemo((): CalendarDay[] => {
         const days: CalendarDay[] = [];
@@ -78,19 +59,8 @@ const Calendar: React.FC = () => {
             days.push({ day: 0, isToday: false, isCurrentMonth: false, eventToday: false, eventName: "" });
         }
         for (let day = 1; day <= daysInMonth; day++) {
-            const currentDateLoop = new Date(year, month, day);
-
-            let eventToday = false;
-            let eventName = "";
-
-            const specificLeaveForDay = getLeavesFormatted.find(leave => {
-                return currentDateLoop >= leave.start && currentDateLoop <= leave.end;
-            });
-
-            if (specificLeaveForDay) {
-                eventToday = true;
-                eventName = specificLeaveForDay.type;
-            }
+            const eventName = absencesByDate.get(toIsoDate(new Date(year, month, day))) ?? "";
+            const eventToday = eventName !== "";
 
             const isToday =
                 day === today.getDate() &&
@@ -100,7 +70,7 @@ const Calendar: React.FC = () => {
             days.push({ day, isToday, isCurrentMonth: true, eventToday, eventName });
         }
         return days;
-    }, [year, month, getLeavesFormatted, getAllEvenetDates]);
+    }, [year, month, absencesByDate]);
 
     const goToPreviousMonth = () => {
         const prev = new Date(currentDate.getFullYear(), currentDate.getMonth() - 1, 1);
@@ -33,6 +33,19 @@ const DepartmentDetails: React.FC = () => {
     fetchDepartment();
   }, [departmentName]);
 
+  const loadMoreEmployees = async () => {
+    if (!department?.employees.next) return;
+    try {
+        const data = await departmentsApi.getEmployeesPage(department.employees.next);
+        setDepartment({
+            ...data,
+            employees: { ...data.employees, results: [...department.employees.results, ...data.employees.results] },
+        });
+    } catch (err: any) {
+        setError("Nepodařilo se načíst další zaměstnance: " + err.message);
+    }
+  };
+
   if (loading) return <p>Načítání oddělení...</p>;
   if (error) return <p className="error-message">{error}</p>;
   if (!department) return <p>Oddělení nebylo nalezeno.</p>;
@@ -41,16 +54,19 @@ const DepartmentDetails: React.FC = () => {
     <div className="department-details-container">
       <h2>Detaily oddělení: {department.name}</h2>
       <p>ID oddělení: {department.description}</p>
-      {department && department.employees && department.employees.length > 0 ? (
+      {department && department.employees && department.employees.results.length > 0 ? (
           <div className="employees-list-container"> 
-              <h3 className="employees-list-title">Zaměstnanci tohoto oddělení:</h3>
-              {department.employees.map((employee) => (
+              <h3 className="employees-list-title">Zaměstnanci tohoto oddělení ({department.employee_count}):</h3>
+              {department.employees.results.map((employee) => (
                   <div key={employee.id} className="employee-card"> 
                       <h4 className="employee-name">{employee.first_name} {employee.last_name}</h4>
                       <p className="employee-position">Pozice: {employee.position}</p>
                       <p className="employee-email">Email: {employee.email}</p>
                   </div>
               ))}
+              {department.employees.next && (
+                  <button onClick={loadMoreEmployees}>Načíst další</button>
+              )}
           </div>
       ) : (
           <p className="no-employees-message">Žádní zaměstnanci k zobrazení, nebo se data načítají.</p>
@@ -48,6 +48,7 @@ const DepartmentList: React.FC = () => {
                 <div key={department.id} className="list-item" onClick={() => getMoreDetail(department.name)}>
                 <h3>{department.name}</h3>
                 <p>{department.description || 'Popis není k dispozici.'}</p>
+                <small>Počet zaměstnanců: {department.employee_count ?? 0}</small>
                 </div>
             ))
             )}
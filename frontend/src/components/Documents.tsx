@@ -1,11 +1,12 @@
 import { useState, useEffect, useRef  } from 'react';
 import type { Document } from '../types';
-import { documentApi } from '../api';
+import { documentApi, getNextPage } from '../api';
 
 const Documents: React.FC = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [documents, setDocuments] = useState<Document[]>();
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [documentDetails, setDocumentDetails] = useState<Document>();
     const modalContentRef = useRef<HTMLDivElement>(null);
 
@@ -14,8 +15,9 @@ const Documents: React.FC = () => {
     useEffect(() => {
         const fetchDocuments = async () => {
             try {
-                const fetchedDocuments = await documentApi.getAll();
-                setDocuments(fetchedDocuments);
+                const documentsPage = await documentApi.getAll();
+                setDocuments(documentsPage.results);
+                setNextPage(documentsPage.next);
 
             } catch (err) {
                 console.error("Chyba při načítání dat:", err);
@@ -27,6 +29,17 @@ const Documents: React.FC = () => {
         fetchDocuments();
     }, []);
 
+    const loadMoreDocuments = async () => {
+        if (!nextPage) return;
+        try {
+            const page = await getNextPage<Document>(nextPage);
+            setDocuments(prev => [...(prev ?? []), ...page.results]);
+            setNextPage(page.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další dokumenty: " + err.message);
+        }
+    };
+
     const handleDetailsDocument = async (id: number) => {
         setLoading(true);
         setShowDocumentDetails(true);
@@ -79,6 +92,9 @@ const Documents: React.FC = () => {
                 </div>
                 </div>
                 ))}
+                {nextPage && (
+                    <button onClick={loadMoreDocuments}>Načíst další</button>
+                )}
                 {showDocumentDetails && (
                     <div className='modal-backdrop'>
                         <div className='modal-content' ref={modalContentRef}>
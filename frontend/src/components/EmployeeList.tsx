@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { employeesApi, departmentsApi } from '../api';
-import type { Employee, Department } from '../types';
+import { employeesApi, departmentsApi, getNextPage } from '../api';
+import type { Employee, Department, EmployeeFilters } from '../types';
 import EmployeeReportsModal from './EmployeeReportsModal';
 import AttendanceHistoryModal from './AttendanceHistoryModal';
 import EmployeeForm from './EmployeeForm';
@@ -13,9 +13,12 @@ interface EmployeeListProps {
 }
 const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeUpdated, isInGroup }) => {
     const [employees, setEmployees] = useState<Employee[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [departments, setDepartments] = useState<Department[]>([]);
     const [loading, setLoading] = useState<boolean>(true);
     const [error, setError] = useState<string | null>(null);
+    const [search, setSearch] = useState<string>('');
+    const [departmentFilter, setDepartmentFilter] = useState<string>('');
 
     const [showAttendanceModal, setShowAttendanceModal] = useState(false);
     const [selectedEmployeeIdForAttendance, setSelectedEmployeeIdForAttendance] = useState<number | null>(null);
@@ -30,8 +33,15 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
         try {
             setLoading(true);
             setError(null);
-            const employeesData = await employeesApi.getAll(); 
-            setEmployees(employeesData);
+            // Filtruje server, načtou se jen odpovídající zaměstnanci
+            const filters: EmployeeFilters = {
+                search: search.trim() || undefined,
+                department: departmentFilter ? Number(departmentFilter) : undefined,
+                ordering: 'last_name',
+            };
+            const employeesPage = await employeesApi.getAll(filters); 
+            setEmployees(employeesPage.results);
+            setNextPage(employeesPage.next);
 
             const departmentsData = await departmentsApi.getAll(); 
             setDepartments(departmentsData);
@@ -43,9 +53,20 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
             setLoading(false);
         }
     };
+    const loadMoreEmployees = async () => {
+        if (!nextPage) return;
+        try {
+            const page = await getNextPage<Employee>(nextPage);
+            setEmployees((current) => [...current, ...page.results]);
+            setNextPage(page.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další zaměstnance: " + err.message);
+        }
+    };
     useEffect(() => {
-        loadEmployeesAndDepartments();
-    }, [refreshTrigger]);
+        const timeout = setTimeout(loadEmployeesAndDepartments, search ? 300 : 0);
+        return () => clearTimeout(timeout);
+    }, [refreshTrigger, search, departmentFilter]);
 
     const handleDelete = async (id: number) => {
         if (window.confirm('Opravdu chcete smazat tohoto zaměstnance?')) {
@@ -111,10 +132,6 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
         setSelectedEmployeeIdForAttendance(null);
     };
 
-    if (loading) {
-        return <p>Načítání zaměstnanců...</p>;
-    }
-
     if (error) {
         return <p className="error-message">{error}</p>;
     }
@@ -122,6 +139,22 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
     <div className="employee-list-container">
         <h2>Seznam zaměstnanců</h2>
 
+        <div className="employee-filters">
+            <input
+                type="search"
+                placeholder="Hledat podle jména nebo e-mailu"
+                value={search}
+                onChange={(e) => setSearch(e.target.value)}
+            />
+            <select value={departmentFilter} onChange={(e) => setDepartmentFilter(e.target.value)}>
+                <option value="">Všechna oddělení</option>
+                {departments.map((department) => (
+                    <option key={department.id} value={department.id}>{department.name}</option>
+                ))}
+            </select>
+        </div>
+        {loading && <p>Načítání zaměstnanců...</p>}
+
         {editingEmployee && (
             <EmployeeForm
             employeeToEdit={editingEmployee}
@@ -136,8 +169,8 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
             />
         )}
 
-        {!editingEmployee && employees.length === 0 ? (
-            <p>Žádní zaměstnanci k zobrazení. Přidejte nějaké!</p>
+        {!editingEmployee && !loading && employees.length === 0 ? (
+            <p>{search || departmentFilter ? 'Žádný zaměstnanec neodpovídá filtru.' : 'Žádní zaměstnanci k zobrazení. Přidejte nějaké!'}</p>
         ) : (
             <ul className="employee-list">
             {employees.map((employee) => (
@@ -161,6 +194,9 @@ const EmployeeList: React.FC<EmployeeListProps> = ({ refreshTrigger, onEmployeeU
             ))}
             </ul>
         )}
+        {!editingEmployee && nextPage && (
+            <button onClick={loadMoreEmployees}>Načíst další</button>
+        )}
 
         {showReportsModal && selectedEmployeeIdForReports && (
             <EmployeeReportsModal
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import { reportsApi  } from '../api';
+import { reportsApi, getNextPage } from '../api';
 import type { EmployeeReport } from '../types';
 
 interface EmployeeReportsModalProps {
@@ -9,6 +9,7 @@ interface EmployeeReportsModalProps {
 
 const EmployeeReportsModal: React.FC<EmployeeReportsModalProps> = ({ employeeId, onClose }) => {
     const [reports, setReports] = useState<EmployeeReport[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [newReportContent, setNewReportContent] = useState('');
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
@@ -20,7 +21,8 @@ const EmployeeReportsModal: React.FC<EmployeeReportsModalProps> = ({ employeeId,
         try {
             setLoading(true);
             const data = await reportsApi.getByEmployeeId(employeeId);
-            setReports(data);
+            setReports(data.results);
+            setNextPage(data.next);
         } catch (err: any) {
             setError("Nepodařilo se načíst reporty.");
             console.error(err);
@@ -28,6 +30,17 @@ const EmployeeReportsModal: React.FC<EmployeeReportsModalProps> = ({ employeeId,
             setLoading(false);
         }
     };
+    const loadMoreReports = async () => {
+        if (!nextPage) return;
+        try {
+            const data = await getNextPage<EmployeeReport>(nextPage);
+            setReports(prev => [...prev, ...data.results]);
+            setNextPage(data.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další reporty.");
+            console.error(err);
+        }
+    };
     useEffect(() => {
         loadReports();
     }, [employeeId]);
@@ -121,6 +134,9 @@ const EmployeeReportsModal: React.FC<EmployeeReportsModalProps> = ({ employeeId,
                     ))}
                 </ul>
                 )}
+                {nextPage && (
+                    <button onClick={loadMoreReports}>Načíst další</button>
+                )}
 
                 <button onClick={onClose} className="btn-secondary">Zavřít</button>
             </div>
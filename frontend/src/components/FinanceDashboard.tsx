@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from 'react';
 import type {  Transaction, TransactionCategory, TransactionSummary, MonthlyTransactionSummary, UserDetails } from "../types";
-import { financeApi } from '../api';
+import { financeApi, getNextPage } from '../api';
 
 interface FinanceDashboardInterface {
     isInGroup: (groupName: string) => boolean;
@@ -10,6 +10,7 @@ interface FinanceDashboardInterface {
 const FinanceDashboard: React.FC<FinanceDashboardInterface> = ({isInGroup, currentUser}) => {
 
     const [transactions, setTransactions] = useState<Transaction[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [categories, setCategories] = useState<TransactionCategory[]>([]);
     const [summary, setSummary] = useState<TransactionSummary | null>(null);
     const [monthlySummary, setMonthlySummary] = useState<MonthlyTransactionSummary | null>(null);
@@ -71,7 +72,8 @@ const FinanceDashboard: React.FC<FinanceDashboardInterface> = ({isInGroup, curre
         try {
             const response = await financeApi.getAllTransactions();
             
-            setTransactions(response);
+            setTransactions(response.results);
+            setNextPage(response.next);
             setError(null);
         } catch (err: any) {
             console.error("Failed to fetch transactions:", err);
@@ -80,6 +82,17 @@ const FinanceDashboard: React.FC<FinanceDashboardInterface> = ({isInGroup, curre
             setLoading(false);
         }
     };
+    const fetchMoreTransactions = async () => {
+        if (!nextPage) return;
+        try {
+            const response = await getNextPage<Transaction>(nextPage);
+            setTransactions(prev => [...prev, ...response.results]);
+            setNextPage(response.next);
+        } catch (err: any) {
+            console.error("Failed to fetch more transactions:", err);
+            setError("Failed to load more transactions. Please try again.");
+        }
+    };
     const fetchCategories = async () => {
         try {
             const response = await financeApi.getAllCategories();
@@ -301,6 +314,7 @@ const FinanceDashboard: React.FC<FinanceDashboardInterface> = ({isInGroup, curre
             )}
             <div className="transaction-list-section">
                 <h3>Všechny Transakce</h3>
+                <a href={financeApi.exportTransactionsUrl('csv')} className="btn-export" download>Export CSV</a>
                 {transactions.length === 0 ? (
                     <p className="no-transactions-message">Žádné transakce k zobrazení.</p>
                 ) : (
@@ -337,6 +351,9 @@ const FinanceDashboard: React.FC<FinanceDashboardInterface> = ({isInGroup, curre
                         </tbody>
                     </table>
                 )}
+                {nextPage && (
+                    <button onClick={fetchMoreTransactions}>Načíst další</button>
+                )}
             </div>
             {showAddDetails &&(
                 <div className='modal-backdrop'>
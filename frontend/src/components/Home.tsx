@@ -1,16 +1,21 @@
 import React, { useState, useEffect } from 'react';
-import type { CompanyStats } from '../types'; 
+import type { CompanyStats, DashboardSnapshot } from '../types'; 
 import { companyStats } from '../api'; 
 
-const Home: React.FC = () => {
-    const [stats, setStats] = useState<CompanyStats | null>(null);
+interface HomeProps {
+    isAuthenticated: boolean;
+}
+
+const Home: React.FC<HomeProps> = ({ isAuthenticated }) => {
+    const [stats, setStats] = useState<CompanyStats | DashboardSnapshot | null>(null);
     const [loading, setLoading] = useState<boolean>(true);
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
         const getCompanyStats = async () => {
         try {
-            const data = await companyStats.getCompanyStats();
+            // Přihlášený uživatel dostane celý přehled jedním požadavkem
+            const data = isAuthenticated ? await companyStats.getDashboard() : await companyStats.getCompanyStats();
             setStats(data);
         } catch (err) {
             setError("Nepodařilo se načíst firemní statistiky. Zkontrolujte, zda běží backend.");
@@ -20,7 +25,9 @@ const Home: React.FC = () => {
         }
     };
     getCompanyStats();
-     }, []);
+     }, [isAuthenticated]);
+
+    const dashboard = stats && 'departments' in stats ? stats : null;
 
     return (
         <div className="section home-section">
@@ -44,7 +51,47 @@ const Home: React.FC = () => {
                 </div>
             </>
             )}
+            {dashboard && (
+            <>
+                <div className="stat-card">
+                <h3>Dnes v práci</h3>
+                <p className="stat-value">{dashboard.attendance.open_check_ins}</p>
+                <small>Příchodů dnes: {dashboard.attendance.checked_in}</small>
+                </div>
+                {dashboard.leaves && (
+                <div className="stat-card">
+                <h3>Žádosti o volno ke schválení</h3>
+                <p className="stat-value">{dashboard.leaves.pending}</p>
+                <small>Začínají do týdne: {dashboard.leaves.starting_within_week}</small>
+                </div>
+                )}
+                {dashboard.expiring_contracts !== null && (
+                <div className="stat-card">
+                <h3>Smlouvy končící do 30 dní</h3>
+                <p className="stat-value">{dashboard.expiring_contracts}</p>
+                </div>
+                )}
+                {dashboard.finance && (
+                <div className="stat-card">
+                <h3>Bilance od začátku měsíce</h3>
+                <p className="stat-value">{dashboard.finance.net_balance.toLocaleString('cs-CZ')} Kč</p>
+                <small>Příjmy: {dashboard.finance.income.toLocaleString('cs-CZ')} Kč, výdaje: {dashboard.finance.expense.toLocaleString('cs-CZ')} Kč</small>
+                </div>
+                )}
+            </>
+            )}
+        </div>
+
+        {dashboard && dashboard.departments.length > 0 && (
+        <div className="list-container">
+            {dashboard.departments.map((department) => (
+                <div key={department.id} className="list-item">
+                <h3>{department.name}</h3>
+                <small>Počet zaměstnanců: {department.headcount}</small>
+                </div>
+            ))}
         </div>
+        )}
 
         <div className="info-box">
             <p>Tyto statistiky se načítají z API vašeho Django backendu.</p>
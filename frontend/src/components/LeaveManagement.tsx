@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { attendanceApi, employeesApi } from '../api';
+import { attendanceApi, employeesApi, getNextPage } from '../api';
 import type { Employee, Leave, NewLeaveData   } from '../types';
 
 interface LeaveManagementProp {
@@ -8,6 +8,7 @@ interface LeaveManagementProp {
 
 const LeaveManagement: React.FC<LeaveManagementProp> = ({isInGroup}) => {
     const [leaves, setLeaves] = useState<Leave[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const [employees, setEmployees] = useState<Employee[]>([]); 
     const [newLeave, setNewLeave] = useState<NewLeaveData>({ 
         employee: '', 
@@ -22,10 +23,11 @@ const LeaveManagement: React.FC<LeaveManagementProp> = ({isInGroup}) => {
     useEffect(() => {
         const fetchLeavesAndEmployees = async () => {
             try {
-                const fetchedLeaves = await attendanceApi.getLeaves();
-                setLeaves(fetchedLeaves);
+                const leavesPage = await attendanceApi.getLeaves();
+                setLeaves(leavesPage.results);
+                setNextPage(leavesPage.next);
 
-                const fetchedEmployees = await employeesApi.getAll();
+                const fetchedEmployees = await employeesApi.getOptions();
                 setEmployees(fetchedEmployees);
             } catch (err) {
                 console.error("Chyba při načítání dat:", err);
@@ -37,6 +39,17 @@ const LeaveManagement: React.FC<LeaveManagementProp> = ({isInGroup}) => {
         fetchLeavesAndEmployees();
     }, []);
 
+    const loadMoreLeaves = async () => {
+        if (!nextPage) return;
+        try {
+            const page = await getNextPage<Leave>(nextPage);
+            setLeaves(prev => [...prev, ...page.results]);
+            setNextPage(page.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další žádosti: " + err.message);
+        }
+    };
+
     const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement | HTMLTextAreaElement>) => {
         const { name, value } = e.target;
         setNewLeave(prev => ({ ...prev, [name]: value }));
@@ -87,8 +100,9 @@ const LeaveManagement: React.FC<LeaveManagementProp> = ({isInGroup}) => {
             } else {
                 await attendanceApi.rejectLeave(leaveId);
             }
-            const updatedLeaves = await attendanceApi.getLeaves();
-            setLeaves(updatedLeaves);
+            const leavesPage = await attendanceApi.getLeaves();
+            setLeaves(leavesPage.results);
+            setNextPage(leavesPage.next);
         } catch (err: any) {
             console.error(`Chyba při ${action === 'approve' ? 'schvalování' : 'zamítání'} žádosti:`, err.response?.data || err);
             setError(`Nepodařilo se ${action === 'approve' ? 'schválit' : 'zamítnout'} žádost. ` + (err.response?.data?.detail || err.message));
@@ -171,6 +185,9 @@ const LeaveManagement: React.FC<LeaveManagementProp> = ({isInGroup}) => {
                         ))}
                     </ul>
                 )}
+                {nextPage && (
+                    <button onClick={loadMoreLeaves}>Načíst další</button>
+                )}
             </div>
         </div>
     );
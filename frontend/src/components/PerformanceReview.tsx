@@ -1,18 +1,20 @@
 import { useState, useEffect  } from 'react';
 import type { PerformanceReviewType } from '../types';
-import { performanceReviewApi } from '../api';
+import { performanceReviewApi, getNextPage } from '../api';
 
 const PerformanceReview: React.FC = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [reviews, setReviews] = useState<PerformanceReviewType[]>();
+    const [nextPage, setNextPage] = useState<string | null>(null);
 
 
     useEffect(() => {
         const fetchReviews = async () => {
             try {
-                const fetchedReviews = await performanceReviewApi.getAll();
-                setReviews(fetchedReviews);
+                const reviewsPage = await performanceReviewApi.getAll();
+                setReviews(reviewsPage.results);
+                setNextPage(reviewsPage.next);
 
             } catch (err) {
                 console.error("Chyba při načítání dat:", err);
@@ -24,6 +26,17 @@ const PerformanceReview: React.FC = () => {
         fetchReviews();
     }, []);
 
+    const loadMoreReviews = async () => {
+        if (!nextPage) return;
+        try {
+            const page = await getNextPage<PerformanceReviewType>(nextPage);
+            setReviews(prev => [...(prev ?? []), ...page.results]);
+            setNextPage(page.next);
+        } catch (err: any) {
+            setError("Nepodařilo se načíst další hodnocení: " + err.message);
+        }
+    };
+
     if (loading) return <p>Načítání dokumentů...</p>;
     if (error)  return <p className="error-message">{error}</p>;
     return (
@@ -47,6 +60,9 @@ const PerformanceReview: React.FC = () => {
                     </div>
                 </div>
                 ))}
+                {nextPage && (
+                    <button onClick={loadMoreReviews}>Načíst další</button>
+                )}
         </div>
     );
 };
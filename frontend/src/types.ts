@@ -2,12 +2,14 @@ export interface Department {
     id: number;
     name: string;
     description: string;
+    employee_count?: number;
 }
 export interface DepartmentDetailsType {
     id: number;
     name: string;
     description: string;
-    employees: Employee[];
+    employee_count: number;
+    employees: Paginated<Employee>;
 }
 export interface Employee {
     id: number;
@@ -21,10 +23,26 @@ export interface Employee {
     location?: string | null;
     date_of_birth: string;
 }
+export interface EmployeeFilters {
+    search?: string;
+    department?: number;
+    position?: string;
+    location?: string;
+    ordering?: 'id' | '-id' | 'last_name' | '-last_name' | 'position' | '-position';
+}
 export interface CompanyStats {
     total_employees: number;
     total_departments: number;
 }
+export interface DashboardSnapshot extends CompanyStats {
+    date: string;
+    unassigned_employees: number;
+    departments: { id: number; name: string; headcount: number }[];
+    attendance: { checked_in: number; open_check_ins: number };
+    leaves: { pending: number; starting_within_week: number } | null;
+    expiring_contracts: number | null;
+    finance: { month: string; income: number; expense: number; net_balance: number; transaction_count: number } | null;
+}
 export interface EmployeeReport {
     id: number;
     employee: number;
@@ -40,6 +58,34 @@ export interface AttendanceRecord {
     check_out_time?: string | null; 
     date: string; 
     }
+export interface AttendanceFilters {
+    department?: number;
+    date_from?: string;
+    date_to?: string;
+    open?: boolean;
+    ordering?: 'check_in_time' | '-check_in_time' | 'date' | '-date';
+}
+export interface AttendanceAnalyticsRow {
+    employee_id?: number;
+    first_name?: string;
+    last_name?: string;
+    department_id?: number | null;
+    department_name?: string | null;
+    week?: string;
+    month?: string;
+    records: number;
+    closed_records: number;
+    late_arrivals: number;
+    total_hours: number;
+    average_hours: number;
+    overtime_hours: number;
+}
+export interface AttendanceAnalytics {
+    group_by: 'employee' | 'department' | 'week' | 'month';
+    date_from: string;
+    date_to: string;
+    results: AttendanceAnalyticsRow[];
+}
 export interface Leave {
     id: number;
     employee: number; 
@@ -51,6 +97,23 @@ export interface Leave {
     reason?: string;
     approved_by_username: string;
 }
+export interface LeaveAbsence {
+    leave_id: number;
+    employee_id: number;
+    employee_name: string;
+    leave_type: string;
+    status: 'PENDING' | 'APPROVED';
+}
+export interface LeaveAvailabilityDay {
+    date: string;
+    absent_count: number;
+    departments: { department_id: number | null; department_name: string | null; absences: LeaveAbsence[] }[];
+}
+export interface LeaveAvailability {
+    date_from: string;
+    date_to: string;
+    days: LeaveAvailabilityDay[];
+}
 export interface NewLeaveData {
     employee: number | string;
     leave_type: string;
@@ -73,11 +136,6 @@ export interface CalendarDay {
     eventToday: boolean;
     eventName: string;
 }
-export interface LeaveDateCalendar  {
-    start: Date;
-    end: Date;
-    type: string;
-};
 
 export interface TransactionCategory {
     id: number;
@@ -113,6 +171,20 @@ export interface MonthlyTransactionSummary {
     monthly_expense: number;
     monthly_net_balance: number;
 }
+export interface PeriodTransactionSummary {
+    period_start: string;
+    year: number;
+    month: number;
+    income: number;
+    expense: number;
+    net_balance: number;
+}
+export interface RangeTransactionSummary {
+    period: 'month' | 'quarter' | 'year';
+    from: string;
+    to: string;
+    results: PeriodTransactionSummary[];
+}
 export interface Document {
     id: number;
     title: string;
@@ -124,6 +196,13 @@ export interface Document {
     is_public: boolean;
     effective_date?: string;
     contract_end_date?: string;
+    is_expiring_soon: boolean;
+    has_expired: boolean;
+}
+export interface DocumentFilters {
+    document_type?: 'contract' | 'policy' | 'training';
+    expiring_within?: number;
+    expired?: boolean;
 }
 export interface PerformanceReviewType {
     employee: string;
@@ -138,4 +217,34 @@ export interface PerformanceReviewType {
     comments?: string;
     recommended_training?: string;
     average_score: number;
-}
\ No newline at end of file
+    score: number;
+}
+export interface ReviewFilters {
+    employee_id?: number;
+    department?: number;
+    period?: string;
+    date_from?: string;
+    date_to?: string;
+    min_score?: number;
+    max_score?: number;
+    ordering?: 'date' | '-date' | 'score' | '-score';
+}
+export interface ReviewAnalytics {
+    group_by: 'employee' | 'department' | 'period' | 'month';
+    reviews: number;
+    average_score: number | null;
+    results: (Record<string, string | number | null> & {
+        reviews: number;
+        average_score: number;
+        min_score: number;
+        max_score: number;
+    })[];
+    distribution: { points: number; reviews: number }[];
+    trend: { month: string; reviews: number; average_score: number }[];
+}
+
+export interface Paginated<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+}